@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+from array import array
+
+from app.ports.embeddings_port import EmbeddingsPort
+from app.ports.storage_port import StoragePort
+
+
+class CachedEmbeddingsAdapter(EmbeddingsPort):
+    """Wrap an embeddings adapter with a persistent cache keyed by text hash."""
+
+    def __init__(self, inner: EmbeddingsPort, storage: StoragePort, model: str) -> None:
+        self._inner = inner
+        self._storage = storage
+        self._model = model
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        try:
+            cached = self._storage.get_cached_embeddings(self._model, hashes)
+        except RuntimeError:
+            cached = {}
+        missing: dict[str, str] = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+        if missing:
+            computed = list(self._inner.embed_texts(list(missing.values())))
+            if len(computed) != len(missing):
+                raise RuntimeError(
+                    f"Embeddings provider returned {len(computed)} embeddings "
+                    f"for {len(missing)} inputs."
+                )
+            # Round misses to the float32 the cache stores, so a text scores the
+            # same on its first run as on later cache hits.
+            fresh = {
+                text_hash: array("f", embedding).tolist()
+                for text_hash, embedding in zip(missing, computed)
+            }
+            try:
+                self._storage.save_cached_embeddings(
+                    self._model,
+                    {text_hash: embedding for text_hash, embedding in fresh.items() if embedding},
+                )
+            except RuntimeError:
+                pass
+            cached.update(fresh)
+        return [cached[text_hash] for text_hash in hashes]
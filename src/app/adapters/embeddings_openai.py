@@ -12,12 +12,17 @@ class OpenAIEmbeddingsAdapter(EmbeddingsPort):
         self._base_url = base_url.rstrip("/")
 
     def embed_text(self, text: str) -> list[float]:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
         if not self._api_key:
             raise RuntimeError("OpenAI embeddings not configured")
+        if not texts:
+            return []
         limits = [12000, 8000, 4000, 2000]
         last_error: Exception | None = None
         for limit in limits:
-            chunk = text if len(text) <= limit else text[:limit]
+            chunks = [text if len(text) <= limit else text[:limit] for text in texts]
             try:
                 response = requests.post(
                     f"{self._base_url}/embeddings",
@@ -27,19 +32,25 @@ class OpenAIEmbeddingsAdapter(EmbeddingsPort):
                     },
                     json={
                         "model": self._model,
-                        "input": chunk,
+                        "input": chunks,
                     },
                     timeout=30,
                 )
                 response.raise_for_status()
                 payload = response.json()
                 data = payload.get("data", [])
-                if not data:
-                    raise RuntimeError("OpenAI embeddings returned no data")
-                embedding = data[0].get("embedding")
-                if not isinstance(embedding, list):
+                if len(data) != len(chunks):
+                    raise RuntimeError(
+                        f"OpenAI embeddings returned {len(data)} embeddings "
+                        f"for {len(chunks)} inputs"
+                    )
+                embeddings = [
+                    item.get("embedding")
+                    for item in sorted(data, key=lambda item: item.get("index", 0))
+                ]
+                if not all(isinstance(embedding, list) for embedding in embeddings):
                     raise RuntimeError("OpenAI embeddings response missing embedding list")
-                return embedding
+                return embeddings
             except Exception as exc:
                 last_error = exc
                 continue
@@ -16,3 +16,9 @@ class SentenceTransformersEmbeddingsAdapter(EmbeddingsPort):
     def embed_text(self, text: str) -> list[float]:
         embedding = self._model.encode(text, normalize_embeddings=True)
         return embedding.tolist()
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        embeddings = self._model.encode(texts, batch_size=32, normalize_embeddings=True)
+        return embeddings.tolist()
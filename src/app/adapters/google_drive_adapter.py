@@ -7,10 +7,6 @@ import io
 import json
 
 import requests
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
 
 from app.domain.models import FileRef, FolderRef
 from app.ports.drive_port import DrivePort
@@ -19,6 +15,7 @@ from app.ports.drive_port import DrivePort
 class GoogleDriveAdapter(DrivePort):
     _BASE_URL = "https://www.googleapis.com/drive/v3"
     _UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3"
+    _DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
     def __init__(self, access_token: str) -> None:
         self._access_token = access_token
@@ -30,7 +27,7 @@ class GoogleDriveAdapter(DrivePort):
         while True:
             params = {
                 "q": query,
-                "fields": "nextPageToken, files(id, name, mimeType)",
+                "fields": "nextPageToken, files(id, name, mimeType, size)",
                 "pageSize": 1000,
                 "supportsAllDrives": True,
                 "includeItemsFromAllDrives": True,
@@ -59,6 +56,7 @@ class GoogleDriveAdapter(DrivePort):
                         file_id=item.get("id", ""),
                         name=item.get("name", ""),
                         mime_type=mime_type,
+                        size_bytes=self._parse_size(item.get("size")),
                     )
                 )
             page_token = payload.get("nextPageToken")
@@ -118,24 +116,20 @@ class GoogleDriveAdapter(DrivePort):
 
     def download_file_bytes(self, file_id: str) -> bytes:
         try:
-            credentials = Credentials(token=self._access_token)
-            service = build("drive", "v3", credentials=credentials, cache_discovery=False)
-            request = service.files().get_media(fileId=file_id, supportsAllDrives=True)
-            buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(buffer, request)
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
-            return buffer.getvalue()
-        except HttpError as exc:
-            status = exc.resp.status
-            if status in (401, 403):
-                raise RuntimeError("Auth failed while attempting to download file bytes.") from exc
-            if status == 404:
-                raise RuntimeError("Resource not found or no access while attempting to download file bytes.") from exc
-            raise RuntimeError(
-                f"Drive API error {status} while attempting to download file bytes."
-            ) from exc
+            with requests.get(
+                f"{self._BASE_URL}/files/{file_id}",
+                headers=self._auth_header(),
+                params={"alt": "media", "supportsAllDrives": True},
+                stream=True,
+                timeout=60,
+            ) as response:
+                self._raise_for_status(response, context="download file bytes")
+                buffer = io.BytesIO()
+                for chunk in response.iter_content(chunk_size=self._DOWNLOAD_CHUNK_SIZE):
+                    buffer.write(chunk)
+                return buffer.getvalue()
+        except RuntimeError:
+            raise
         except Exception as exc:
             raise RuntimeError("Failed to download file bytes.") from exc
 
@@ -170,6 +164,14 @@ class GoogleDriveAdapter(DrivePort):
             raise RuntimeError("Drive API response missing file id after upload.")
         return file_id
 
+    @staticmethod
+    def _parse_size(value: object) -> int | None:
+        # Drive reports size as a decimal string, and omits it for some files.
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
     def _auth_header(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self._access_token}"}
 
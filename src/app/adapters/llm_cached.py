@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+from app.domain.label_fallback import LabelFallbackCandidate, LabelFallbackClassification
+from app.ports.llm_port import LLMPort
+from app.ports.storage_port import StoragePort
+
+# Transient failures reported as abstentions; retry them instead of caching.
+_UNCACHED_SIGNALS = frozenset(
+    {"LLM_NOT_CONFIGURED", "LLM_REQUEST_FAILED", "LLM_OUTPUT_PARSE_FAILED"}
+)
+
+
+class CachedLLMAdapter(LLMPort):
+    """Wrap an LLM adapter with a persistent label-classification cache keyed by prompt hash."""
+
+    def __init__(self, inner: LLMPort, storage: StoragePort, model: str) -> None:
+        self._inner = inner
+        self._storage = storage
+        self._model = model
+
+    def classify_label(
+        self, ocr_text: str, candidates: list[LabelFallbackCandidate]
+    ) -> LabelFallbackClassification:
+        cache_key = self._cache_key(ocr_text, candidates)
+        try:
+            cached = self._storage.get_cached_label_classification(cache_key)
+        except RuntimeError:
+            cached = None
+        if cached is not None:
+            return cached
+        classification = self._inner.classify_label(ocr_text, candidates)
+        if _UNCACHED_SIGNALS.intersection(classification.signals):
+            return classification
+        try:
+            self._storage.save_cached_label_classification(cache_key, classification)
+        except RuntimeError:
+            pass
+        return classification
+
+    def extract_fields(
+        self, schema: dict, ocr_text: str, instructions: str | None = None
+    ) -> dict:
+        return self._inner.extract_fields(schema, ocr_text, instructions)
+
+    def extract_fields_from_image(
+        self,
+        schema: dict,
+        file_bytes: bytes,
+        mime_type: str,
+        instructions: str | None = None,
+    ) -> dict:
+        return self._inner.extract_fields_from_image(
+            schema, file_bytes, mime_type, instructions
+        )
+
+    def _cache_key(self, ocr_text: str, candidates: list[LabelFallbackCandidate]) -> str:
+        # Label edits change the candidate list, so they naturally miss the cache.
+        prompt = json.dumps(
+            [
+                self._model,
+                [[candidate.name, candidate.instructions] for candidate in candidates],
+                ocr_text,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
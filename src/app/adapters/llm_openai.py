@@ -6,6 +6,7 @@ import json
 
 import requests
 
+from app.domain import json_codec
 from app.domain.label_fallback import (
     LabelFallbackCandidate,
     LabelFallbackClassification,
@@ -325,6 +326,15 @@ class OpenAILLMAdapter(LLMPort):
         model: str,
     ) -> dict:
         input_items = self._to_response_input(messages)
+        # Image requests carry multi-MB base64 payloads; encode the body once.
+        body = json_codec.dumps_bytes(
+            {
+                "model": model,
+                "input": input_items,
+                "text": {"format": response_format},
+                "max_output_tokens": max_tokens,
+            }
+        )
         try:
             response = requests.post(
                 f"{self._base_url}/responses",
@@ -332,12 +342,7 @@ class OpenAILLMAdapter(LLMPort):
                     "Authorization": f"Bearer {self._api_key}",
                     "Content-Type": "application/json",
                 },
-                json={
-                    "model": model,
-                    "input": input_items,
-                    "text": {"format": response_format},
-                    "max_output_tokens": max_tokens,
-                },
+                data=body,
                 timeout=30,
             )
         except requests.Timeout as exc:
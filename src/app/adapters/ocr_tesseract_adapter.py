@@ -6,9 +6,11 @@ import re
 
 from app.domain.models import OCRResult
 from app.ports.ocr_port import OCRPort
-from app.services.ocr_merge import merge_ocr_text
+from app.services.ocr_merge import merge_ocr_text, normalize_ocr_text
 from app.settings import OCR_LANG
 
+_ROTATE_RE = re.compile(r"Rotate:\s*(\d+)")
+
 
 class TesseractOCRAdapter(OCRPort):
     def __init__(self, language: str | None = None) -> None:
@@ -26,7 +28,8 @@ class TesseractOCRAdapter(OCRPort):
 
         try:
             if self._is_pdf_bytes(image_bytes):
-                pdf_text = self._extract_pdf_text(image_bytes)
+                # Text-layer PDFs skip merge_ocr_text, so fold them the same way here.
+                pdf_text = normalize_ocr_text(self._extract_pdf_text(image_bytes))
                 if self._looks_like_text(pdf_text):
                     return OCRResult(text=pdf_text, confidence=None)
                 images = self._pdf_to_images(image_bytes)
@@ -174,7 +177,7 @@ class TesseractOCRAdapter(OCRPort):
             osd = pytesseract.image_to_osd(image, lang=self._language)
         except Exception:
             return image
-        match = re.search(r"Rotate:\s*(\d+)", osd)
+        match = _ROTATE_RE.search(osd)
         if not match:
             return image
         rotate = int(match.group(1))
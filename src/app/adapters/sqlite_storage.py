@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from array import array
 from datetime import datetime, timezone
 from uuid import uuid4
 
 from app.domain.doc_types import DocType, DocTypeClassification, signals_from_json, signals_to_json
+from app.domain.label_fallback import LabelFallbackClassification
 from app.domain.labels import Label, LabelExample
 from app.domain.models import (
     AppliedRename,
@@ -18,9 +20,11 @@ from app.domain.models import (
     LabelAssignment,
     LLMLabelClassification,
     OCRResult,
+    OCRTextMeta,
     RenameOp,
     UndoLog,
 )
+from app.domain.similarity import normalize_vector
 from app.ports.storage_port import StoragePort
 
 
@@ -101,8 +105,10 @@ class SQLiteStorage(StoragePort):
                 conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
                 conn.executemany(
                     """
-                    INSERT INTO job_files(job_id, file_id, name, mime_type, sort_index)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO job_files(
+                        job_id, file_id, name, mime_type, sort_index, size_bytes
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
                     """,
                     [
                         (
@@ -111,6 +117,7 @@ class SQLiteStorage(StoragePort):
                             file_ref.name,
                             file_ref.mime_type,
                             file_ref.sort_index if file_ref.sort_index is not None else index,
+                            file_ref.size_bytes,
                         )
                         for index, file_ref in enumerate(files)
                     ],
@@ -140,15 +147,21 @@ class SQLiteStorage(StoragePort):
             with self._connect() as conn:
                 rows = conn.execute(
                     """
-                    SELECT file_id, name, mime_type, sort_index
+                    SELECT file_id, name, mime_type, sort_index, size_bytes
                     FROM job_files
                     WHERE job_id = ?
-                    ORDER BY sort_index ASC
+                    ORDER BY sort_index ASC, name ASC, file_id ASC
                     """,
                     (job_id,),
                 ).fetchall()
             return [
-                FileRef(file_id=row[0], name=row[1], mime_type=row[2], sort_index=row[3])
+                FileRef(
+                    file_id=row[0],
+                    name=row[1],
+                    mime_type=row[2],
+                    sort_index=row[3],
+                    size_bytes=row[4],
+                )
                 for row in rows
             ]
         except sqlite3.Error as exc:
@@ -347,9 +360,25 @@ class SQLiteStorage(StoragePort):
         extract_ms: int | None,
         updated_at_iso: str,
     ) -> None:
+        self.bulk_upsert_file_timings(
+            [
+                FileTimingRecord(
+                    job_id=job_id,
+                    file_id=file_id,
+                    ocr_ms=ocr_ms,
+                    classify_ms=classify_ms,
+                    extract_ms=extract_ms,
+                    updated_at=updated_at_iso,
+                )
+            ]
+        )
+
+    def bulk_upsert_file_timings(self, records: list[FileTimingRecord]) -> None:
+        if not records:
+            return
         try:
             with self._connect() as conn:
-                conn.execute(
+                conn.executemany(
                     """
                     INSERT INTO file_timings(
                         job_id, file_id, ocr_ms, classify_ms, extract_ms, updated_at
@@ -362,7 +391,17 @@ class SQLiteStorage(StoragePort):
                         extract_ms = COALESCE(excluded.extract_ms, file_timings.extract_ms),
                         updated_at = excluded.updated_at
                     """,
-                    (job_id, file_id, ocr_ms, classify_ms, extract_ms, updated_at_iso),
+                    [
+                        (
+                            record.job_id,
+                            record.file_id,
+                            record.ocr_ms,
+                            record.classify_ms,
+                            record.extract_ms,
+                            record.updated_at,
+                        )
+                        for record in records
+                    ],
                 )
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to upsert file timings") from exc
@@ -391,6 +430,31 @@ class SQLiteStorage(StoragePort):
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to fetch file timings") from exc
 
+    def list_file_timings(self, job_id: str) -> dict[str, FileTimingRecord]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT job_id, file_id, ocr_ms, classify_ms, extract_ms, updated_at
+                    FROM file_timings
+                    WHERE job_id = ?
+                    """,
+                    (job_id,),
+                ).fetchall()
+            return {
+                row[1]: FileTimingRecord(
+                    job_id=row[0],
+                    file_id=row[1],
+                    ocr_ms=row[2],
+                    classify_ms=row[3],
+                    extract_ms=row[4],
+                    updated_at=row[5],
+                )
+                for row in rows
+            }
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to list file timings") from exc
+
     def save_undo_log(self, undo: UndoLog) -> None:
         try:
             with self._connect() as conn:
@@ -500,19 +564,63 @@ class SQLiteStorage(StoragePort):
             with self._connect() as conn:
                 conn.execute(
                     """
-                    INSERT INTO ocr_results(file_id, ocr_text, ocr_confidence, updated_at)
-                    VALUES (?, ?, ?, ?)
+                    INSERT INTO ocr_results(
+                        file_id, ocr_text, ocr_confidence, updated_at, text_length, has_text
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
                     ON CONFLICT(file_id)
                     DO UPDATE SET
                         ocr_text = excluded.ocr_text,
                         ocr_confidence = excluded.ocr_confidence,
-                        updated_at = excluded.updated_at
+                        updated_at = excluded.updated_at,
+                        text_length = excluded.text_length,
+                        has_text = excluded.has_text
                     """,
-                    (file_id, result.text, result.confidence, updated_at),
+                    (
+                        file_id,
+                        result.text,
+                        result.confidence,
+                        updated_at,
+                        *self._ocr_text_meta_values(result.text),
+                    ),
                 )
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to save OCR result") from exc
 
+    def bulk_save_ocr_results(self, job_id: str, results: dict[str, OCRResult]) -> None:
+        if not results:
+            return
+        try:
+            updated_at = datetime.now().isoformat()
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO ocr_results(
+                        file_id, ocr_text, ocr_confidence, updated_at, text_length, has_text
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(file_id)
+                    DO UPDATE SET
+                        ocr_text = excluded.ocr_text,
+                        ocr_confidence = excluded.ocr_confidence,
+                        updated_at = excluded.updated_at,
+                        text_length = excluded.text_length,
+                        has_text = excluded.has_text
+                    """,
+                    [
+                        (
+                            file_id,
+                            result.text,
+                            result.confidence,
+                            updated_at,
+                            *self._ocr_text_meta_values(result.text),
+                        )
+                        for file_id, result in results.items()
+                    ],
+                )
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to save OCR results") from exc
+
     def get_ocr_result(self, job_id: str, file_id: str) -> OCRResult | None:
         try:
             with self._connect() as conn:
@@ -530,6 +638,61 @@ class SQLiteStorage(StoragePort):
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to fetch OCR result") from exc
 
+    def list_ocr_results(self, job_id: str) -> dict[str, OCRResult]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT file_id, ocr_text, ocr_confidence
+                    FROM ocr_results
+                    WHERE file_id IN (SELECT file_id FROM job_files WHERE job_id = ?)
+                    """,
+                    (job_id,),
+                ).fetchall()
+            return {row[0]: OCRResult(text=row[1], confidence=row[2]) for row in rows}
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to list OCR results") from exc
+
+    def list_ocr_text_meta(self, job_id: str) -> dict[str, OCRTextMeta]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT file_id, has_text, text_length
+                    FROM ocr_results
+                    WHERE file_id IN (SELECT file_id FROM job_files WHERE job_id = ?)
+                    """,
+                    (job_id,),
+                ).fetchall()
+            return {
+                row[0]: OCRTextMeta(has_text=bool(row[1]), text_length=row[2] or 0)
+                for row in rows
+            }
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to list OCR text meta") from exc
+
+    @staticmethod
+    def _ocr_text_meta_values(text: str | None) -> tuple[int, int]:
+        text = text or ""
+        return len(text), int(bool(text.strip()))
+
+    def get_ocr_text_meta(self, job_id: str, file_id: str) -> OCRTextMeta | None:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT has_text, text_length
+                    FROM ocr_results
+                    WHERE file_id = ?
+                    """,
+                    (file_id,),
+                ).fetchone()
+            if row is None:
+                return None
+            return OCRTextMeta(has_text=bool(row[0]), text_length=row[1] or 0)
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to fetch OCR text meta") from exc
+
     def create_label(
         self, name: str, extraction_schema_json: str, naming_template: str
     ) -> Label:
@@ -643,6 +806,42 @@ class SQLiteStorage(StoragePort):
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to fetch label") from exc
 
+    def list_labels_by_ids(self, label_ids: list[str]) -> list[Label]:
+        unique_ids = sorted({label_id for label_id in label_ids if label_id})
+        if not unique_ids:
+            return []
+        try:
+            rows = []
+            with self._connect() as conn:
+                for chunk in self._chunked(unique_ids, 200):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows.extend(
+                        conn.execute(
+                            f"""
+                            SELECT label_id, name, is_active, created_at, extraction_schema_json, naming_template, llm, extraction_instructions
+                            FROM labels
+                            WHERE label_id IN ({placeholders})
+                            ORDER BY created_at ASC, label_id ASC
+                            """,
+                            chunk,
+                        ).fetchall()
+                    )
+            return [
+                Label(
+                    label_id=row[0],
+                    name=row[1],
+                    is_active=bool(row[2]),
+                    created_at=datetime.fromisoformat(row[3]),
+                    extraction_schema_json=row[4],
+                    naming_template=row[5],
+                    llm=row[6] if row[6] is not None else "",
+                    extraction_instructions=row[7] if row[7] is not None else "",
+                )
+                for row in rows
+            ]
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to list labels by id") from exc
+
     def count_labels(self) -> int:
         try:
             with self._connect() as conn:
@@ -722,7 +921,12 @@ class SQLiteStorage(StoragePort):
     ) -> None:
         try:
             updated_at = datetime.now(timezone.utc).isoformat()
-            embedding_json = json.dumps(embedding) if embedding is not None else None
+            # Stored unit-length as packed float32 so scoring is a plain dot product.
+            embedding_blob = (
+                array("f", normalize_vector(embedding)).tobytes()
+                if embedding is not None
+                else None
+            )
             token_json = (
                 json.dumps(sorted(token_fingerprint))
                 if token_fingerprint is not None
@@ -732,17 +936,23 @@ class SQLiteStorage(StoragePort):
                 conn.execute(
                     """
                     INSERT INTO label_example_features(
-                        example_id, ocr_text, embedding_json, token_fingerprint, updated_at
+                        example_id,
+                        ocr_text,
+                        embedding_json,
+                        embedding_blob,
+                        token_fingerprint,
+                        updated_at
                     )
-                    VALUES (?, ?, ?, ?, ?)
+                    VALUES (?, ?, NULL, ?, ?, ?)
                     ON CONFLICT(example_id)
                     DO UPDATE SET
                         ocr_text = excluded.ocr_text,
-                        embedding_json = excluded.embedding_json,
+                        embedding_json = NULL,
+                        embedding_blob = excluded.embedding_blob,
                         token_fingerprint = excluded.token_fingerprint,
                         updated_at = excluded.updated_at
                     """,
-                    (example_id, ocr_text, embedding_json, token_json, updated_at),
+                    (example_id, ocr_text, embedding_blob, token_json, updated_at),
                 )
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to save label example features") from exc
@@ -752,7 +962,7 @@ class SQLiteStorage(StoragePort):
             with self._connect() as conn:
                 row = conn.execute(
                     """
-                    SELECT ocr_text, embedding_json, token_fingerprint
+                    SELECT ocr_text, embedding_json, embedding_blob, token_fingerprint
                     FROM label_example_features
                     WHERE example_id = ?
                     """,
@@ -760,12 +970,194 @@ class SQLiteStorage(StoragePort):
                 ).fetchone()
             if row is None:
                 return None
-            embedding = json.loads(row[1]) if row[1] else None
-            tokens = set(json.loads(row[2])) if row[2] else None
+            embedding = self._decode_embedding(row[1], row[2])
+            tokens = set(json.loads(row[3])) if row[3] else None
             return {"ocr_text": row[0], "embedding": embedding, "token_fingerprint": tokens}
         except (sqlite3.Error, json.JSONDecodeError) as exc:
             raise RuntimeError("Failed to fetch label example features") from exc
 
+    def bulk_get_label_example_features(self, example_ids: list[str]) -> dict[str, dict]:
+        if not example_ids:
+            return {}
+        try:
+            features: dict[str, dict] = {}
+            with self._connect() as conn:
+                for chunk in self._chunked(sorted(set(example_ids)), 200):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows = conn.execute(
+                        f"""
+                        SELECT
+                            example_id,
+                            ocr_text,
+                            embedding_json,
+                            embedding_blob,
+                            token_fingerprint
+                        FROM label_example_features
+                        WHERE example_id IN ({placeholders})
+                        """,
+                        chunk,
+                    ).fetchall()
+                    for row in rows:
+                        features[row[0]] = {
+                            "ocr_text": row[1],
+                            "embedding": self._decode_embedding(row[2], row[3]),
+                            "token_fingerprint": set(json.loads(row[4])) if row[4] else None,
+                        }
+            return features
+        except (sqlite3.Error, json.JSONDecodeError) as exc:
+            raise RuntimeError("Failed to fetch label example features") from exc
+
+    @staticmethod
+    def _decode_embedding(embedding_json: str | None, embedding_blob: bytes | None):
+        if embedding_blob:
+            embedding = array("f")
+            embedding.frombytes(embedding_blob)
+            return embedding
+        if embedding_json:
+            # Rows written before embeddings were packed; normalize on read.
+            return array("f", normalize_vector(json.loads(embedding_json)))
+        return None
+
+    def get_cached_embeddings(
+        self, model: str, text_hashes: list[str]
+    ) -> dict[str, list[float]]:
+        if not text_hashes:
+            return {}
+        try:
+            cached: dict[str, list[float]] = {}
+            with self._connect() as conn:
+                for chunk in self._chunked(sorted(set(text_hashes)), 200):
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows = conn.execute(
+                        f"""
+                        SELECT text_hash, embedding_blob
+                        FROM embedding_cache
+                        WHERE model = ? AND text_hash IN ({placeholders})
+                        """,
+                        (model, *chunk),
+                    ).fetchall()
+                    for text_hash, embedding_blob in rows:
+                        embedding = array("f")
+                        embedding.frombytes(embedding_blob)
+                        cached[text_hash] = embedding.tolist()
+            return cached
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to fetch cached embeddings") from exc
+
+    def save_cached_embeddings(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        if not embeddings:
+            return
+        try:
+            updated_at = datetime.now(timezone.utc).isoformat()
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO embedding_cache(model, text_hash, embedding_blob, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(model, text_hash)
+                    DO UPDATE SET
+                        embedding_blob = excluded.embedding_blob,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (model, text_hash, array("f", embedding).tobytes(), updated_at)
+                        for text_hash, embedding in embeddings.items()
+                    ],
+                )
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to save cached embeddings") from exc
+
+    def get_cached_label_classification(
+        self, cache_key: str
+    ) -> LabelFallbackClassification | None:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT label_name, confidence, signals_json
+                    FROM llm_label_cache
+                    WHERE cache_key = ?
+                    """,
+                    (cache_key,),
+                ).fetchone()
+            if row is None:
+                return None
+            return LabelFallbackClassification(
+                label_name=row[0],
+                confidence=float(row[1] if row[1] is not None else 0.0),
+                signals=signals_from_json(row[2]),
+            )
+        except (sqlite3.Error, ValueError, json.JSONDecodeError) as exc:
+            raise RuntimeError("Failed to fetch cached label classification") from exc
+
+    def save_cached_label_classification(
+        self, cache_key: str, classification: LabelFallbackClassification
+    ) -> None:
+        try:
+            updated_at = datetime.now(timezone.utc).isoformat()
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO llm_label_cache(
+                        cache_key, label_name, confidence, signals_json, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key)
+                    DO UPDATE SET
+                        label_name = excluded.label_name,
+                        confidence = excluded.confidence,
+                        signals_json = excluded.signals_json,
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        cache_key,
+                        classification.label_name,
+                        classification.confidence,
+                        json.dumps(signals_to_json(classification.signals)),
+                        updated_at,
+                    ),
+                )
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to save cached label classification") from exc
+
+    def get_cached_llm_response(self, cache_key: str) -> dict | None:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT response_json
+                    FROM llm_response_cache
+                    WHERE cache_key = ?
+                    """,
+                    (cache_key,),
+                ).fetchone()
+            if row is None:
+                return None
+            response = json.loads(row[0])
+            return response if isinstance(response, dict) else None
+        except (sqlite3.Error, json.JSONDecodeError) as exc:
+            raise RuntimeError("Failed to fetch cached LLM response") from exc
+
+    def save_cached_llm_response(self, cache_key: str, response: dict) -> None:
+        try:
+            updated_at = datetime.now(timezone.utc).isoformat()
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO llm_response_cache(cache_key, response_json, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(cache_key)
+                    DO UPDATE SET
+                        response_json = excluded.response_json,
+                        updated_at = excluded.updated_at
+                    """,
+                    (cache_key, json.dumps(response), updated_at),
+                )
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to save cached LLM response") from exc
+
     def delete_label_example(self, example_id: str) -> None:
         try:
             with self._connect() as conn:
@@ -867,6 +1259,40 @@ class SQLiteStorage(StoragePort):
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to upsert label assignment") from exc
 
+    def bulk_upsert_file_label_assignments(self, records: list[LabelAssignment]) -> None:
+        if not records:
+            return
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO file_label_assignments(
+                        job_id, file_id, label_id, score, status, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_id, file_id)
+                    DO UPDATE SET
+                        label_id = excluded.label_id,
+                        score = excluded.score,
+                        status = excluded.status,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (
+                            record.job_id,
+                            record.file_id,
+                            record.label_id,
+                            record.score,
+                            record.status,
+                            record.updated_at or now,
+                        )
+                        for record in records
+                    ],
+                )
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to upsert label assignments") from exc
+
     def get_file_label_assignment(self, job_id: str, file_id: str) -> LabelAssignment | None:
         try:
             with self._connect() as conn:
@@ -1346,6 +1772,39 @@ class SQLiteStorage(StoragePort):
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to save extraction") from exc
 
+    def bulk_save_extractions(self, records: list[ExtractionRecord]) -> None:
+        if not records:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO extractions(
+                        job_id, file_id, schema_json, fields_json, confidences_json, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_id, file_id)
+                    DO UPDATE SET
+                        schema_json = excluded.schema_json,
+                        fields_json = excluded.fields_json,
+                        confidences_json = excluded.confidences_json,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (
+                            record.job_id,
+                            record.file_id,
+                            record.schema_json,
+                            record.fields_json,
+                            record.confidences_json,
+                            record.updated_at,
+                        )
+                        for record in records
+                    ],
+                )
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to save extractions") from exc
+
     def get_extraction(self, job_id: str, file_id: str) -> ExtractionRecord | None:
         try:
             with self._connect() as conn:
@@ -1370,6 +1829,31 @@ class SQLiteStorage(StoragePort):
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to fetch extraction") from exc
 
+    def list_extractions(self, job_id: str) -> dict[str, ExtractionRecord]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT file_id, schema_json, fields_json, confidences_json, updated_at
+                    FROM extractions
+                    WHERE job_id = ?
+                    """,
+                    (job_id,),
+                ).fetchall()
+            return {
+                row[0]: ExtractionRecord(
+                    job_id=job_id,
+                    file_id=row[0],
+                    schema_json=row[1],
+                    fields_json=row[2],
+                    confidences_json=row[3],
+                    updated_at=row[4],
+                )
+                for row in rows
+            }
+        except sqlite3.Error as exc:
+            raise RuntimeError("Failed to list extractions") from exc
+
     def update_label_extraction_schema(
         self, label_id: str, extraction_schema_json: str
     ) -> None:
@@ -1437,7 +1921,8 @@ class SQLiteStorage(StoragePort):
                         file_id TEXT,
                         name TEXT,
                         mime_type TEXT,
-                        sort_index INTEGER
+                        sort_index INTEGER,
+                        size_bytes INTEGER
                     )
                     """
                 )
@@ -1494,6 +1979,21 @@ class SQLiteStorage(StoragePort):
                     )
                     conn.execute("DROP TABLE ocr_results")
                     conn.execute("ALTER TABLE ocr_results_v2 RENAME TO ocr_results")
+                    column_names = {"file_id", "ocr_text", "ocr_confidence", "updated_at"}
+                if "has_text" not in column_names:
+                    conn.execute("ALTER TABLE ocr_results ADD COLUMN text_length INTEGER")
+                    conn.execute("ALTER TABLE ocr_results ADD COLUMN has_text INTEGER")
+                    rows = conn.execute(
+                        "SELECT file_id, ocr_text FROM ocr_results"
+                    ).fetchall()
+                    conn.executemany(
+                        """
+                        UPDATE ocr_results
+                        SET text_length = ?, has_text = ?
+                        WHERE file_id = ?
+                        """,
+                        [(*self._ocr_text_meta_values(text), file_id) for file_id, text in rows],
+                    )
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS labels(
@@ -1547,11 +2047,23 @@ class SQLiteStorage(StoragePort):
                         example_id TEXT PRIMARY KEY,
                         ocr_text TEXT,
                         embedding_json TEXT,
+                        embedding_blob BLOB,
                         token_fingerprint TEXT,
                         updated_at TEXT
                     )
                     """
                 )
+                columns = conn.execute(
+                    "PRAGMA table_info(label_example_features)"
+                ).fetchall()
+                column_names = {row[1] for row in columns}
+                if "embedding_blob" not in column_names:
+                    conn.execute(
+                        """
+                        ALTER TABLE label_example_features
+                        ADD COLUMN embedding_blob BLOB
+                        """
+                    )
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS file_label_assignments(
@@ -1649,6 +2161,37 @@ class SQLiteStorage(StoragePort):
                     )
                     """
                 )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embedding_cache(
+                        model TEXT,
+                        text_hash TEXT,
+                        embedding_blob BLOB,
+                        updated_at TEXT,
+                        PRIMARY KEY(model, text_hash)
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS llm_label_cache(
+                        cache_key TEXT PRIMARY KEY,
+                        label_name TEXT,
+                        confidence REAL,
+                        signals_json TEXT,
+                        updated_at TEXT
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS llm_response_cache(
+                        cache_key TEXT PRIMARY KEY,
+                        response_json TEXT,
+                        updated_at TEXT
+                    )
+                    """
+                )
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS file_timings(
@@ -1708,6 +2251,11 @@ class SQLiteStorage(StoragePort):
                 }
                 if "llm" not in label_columns:
                     conn.execute("ALTER TABLE labels ADD COLUMN llm TEXT")
+                job_file_columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(job_files)").fetchall()
+                }
+                if "size_bytes" not in job_file_columns:
+                    conn.execute("ALTER TABLE job_files ADD COLUMN size_bytes INTEGER")
         except sqlite3.Error as exc:
             raise RuntimeError("Failed to initialize storage schema") from exc
 
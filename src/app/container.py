@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import Any
 
+from app.adapters.embeddings_cached import CachedEmbeddingsAdapter
 from app.adapters.embeddings_dummy import DummyEmbeddingsAdapter
 from app.adapters.embeddings_openai import OpenAIEmbeddingsAdapter
 from app.adapters.embeddings_sentence_transformers import SentenceTransformersEmbeddingsAdapter
 from app.adapters.google_drive_adapter import GoogleDriveAdapter
+from app.adapters.llm_cached import CachedLLMAdapter
 from app.adapters.llm_mock import MockLLMAdapter
 from app.adapters.llm_openai import OpenAILLMAdapter
 from app.adapters.ocr_tesseract_adapter import TesseractOCRAdapter
@@ -39,33 +41,47 @@ from app.services.schema_builder_service import SchemaBuilderService
 def build_services(access_token: str, sqlite_path: str) -> dict[str, Any]:
     drive = GoogleDriveAdapter(access_token)
     ocr = TesseractOCRAdapter()
+    storage = SQLiteStorage(sqlite_path)
     embeddings = DummyEmbeddingsAdapter()
     if EMBEDDINGS_PROVIDER == "openai":
-        embeddings = OpenAIEmbeddingsAdapter(
-            api_key=OPENAI_API_KEY,
-            model=EMBEDDINGS_MODEL,
-            base_url=OPENAI_BASE_URL,
+        embeddings = CachedEmbeddingsAdapter(
+            OpenAIEmbeddingsAdapter(
+                api_key=OPENAI_API_KEY,
+                model=EMBEDDINGS_MODEL,
+                base_url=OPENAI_BASE_URL,
+            ),
+            storage,
+            model=f"openai:{EMBEDDINGS_MODEL}",
         )
     elif EMBEDDINGS_PROVIDER in {"local", "sentence-transformers", "bge-m3"}:
-        embeddings = SentenceTransformersEmbeddingsAdapter(
-            model_name=EMBEDDINGS_LOCAL_MODEL,
-            device=EMBEDDINGS_DEVICE,
+        embeddings = CachedEmbeddingsAdapter(
+            SentenceTransformersEmbeddingsAdapter(
+                model_name=EMBEDDINGS_LOCAL_MODEL,
+                device=EMBEDDINGS_DEVICE,
+            ),
+            storage,
+            model=f"local:{EMBEDDINGS_LOCAL_MODEL}",
         )
     elif EMBEDDINGS_PROVIDER in {"dummy", "none"}:
         embeddings = DummyEmbeddingsAdapter()
     elif EMBEDDINGS_ENABLED:
         embeddings = DummyEmbeddingsAdapter()
     llm = MockLLMAdapter()
+    schema_cache_namespace: str | None = None
     if LLM_PROVIDER.lower() == "openai" and OPENAI_API_KEY:
-        llm = OpenAILLMAdapter(
-            api_key=OPENAI_API_KEY,
-            model=OPENAI_MODEL,
-            vision_model=OPENAI_VISION_MODEL,
-            base_url=OPENAI_BASE_URL,
-            min_confidence=LLM_LABEL_MIN_CONFIDENCE,
-            max_image_pages=LLM_EXTRACT_MAX_IMAGE_PAGES,
+        schema_cache_namespace = f"openai:{OPENAI_MODEL}"
+        llm = CachedLLMAdapter(
+            OpenAILLMAdapter(
+                api_key=OPENAI_API_KEY,
+                model=OPENAI_MODEL,
+                vision_model=OPENAI_VISION_MODEL,
+                base_url=OPENAI_BASE_URL,
+                min_confidence=LLM_LABEL_MIN_CONFIDENCE,
+                max_image_pages=LLM_EXTRACT_MAX_IMAGE_PAGES,
+            ),
+            storage,
+            model=f"openai:{OPENAI_MODEL}:{LLM_LABEL_MIN_CONFIDENCE}",
         )
-    storage = SQLiteStorage(sqlite_path)
     presets_service = PresetsService(storage)
     presets_service.seed_if_empty()
     llm_fallback_label_service = LLMFallbackLabelService(storage, llm)
@@ -77,7 +93,9 @@ def build_services(access_token: str, sqlite_path: str) -> dict[str, Any]:
         "label_service": LabelService(drive, ocr, embeddings, storage),
         "llm_fallback_label_service": llm_fallback_label_service,
         "extraction_service": ExtractionService(llm, storage, drive),
-        "schema_builder_service": SchemaBuilderService(storage, llm),
+        "schema_builder_service": SchemaBuilderService(
+            storage, llm, cache_namespace=schema_cache_namespace
+        ),
         "ocr_service": OCRService(drive, ocr, storage),
         "presets_service": presets_service,
         "rename_service": RenameService(drive, storage),
@@ -15,12 +15,21 @@ from .label_fallback import (
     list_fallback_candidates,
     normalize_labels_llm,
 )
+from .file_order import order_job_files
 from .models import FileRef, FolderRef, Job, RenameOp, UndoLog
 from .rename_logic import build_manual_plan, resolve_collisions, sanitize_filename
 from .report_rendering import render_increment2_report, render_increment7_report
 from .report_v2 import FinalReportFileBlock, FinalReportModel, pretty_print_fields, render_report_v2
 from .schema_validation import validate_schema_config
-from .similarity import cosine_similarity, jaccard_similarity, normalize_text_to_tokens
+from .similarity import (
+    cosine_similarity,
+    dot_product,
+    jaccard_batch,
+    jaccard_similarity,
+    jaccard_upper_bound,
+    normalize_text_to_tokens,
+    normalize_vector,
+)
 
 __all__ = [
     "AMBIGUOUS",
@@ -42,12 +51,16 @@ __all__ = [
     "cosine_similarity",
     "clamp_label_fallback_confidence",
     "decide_match",
+    "dot_product",
+    "jaccard_batch",
     "jaccard_similarity",
+    "jaccard_upper_bound",
     "list_fallback_candidates",
     "resolve_collisions",
     "sanitize_filename",
     "validate_schema_config",
     "normalize_text_to_tokens",
+    "normalize_vector",
     "render_increment2_report",
     "render_increment7_report",
     "FinalReportFileBlock",
@@ -55,4 +68,5 @@ __all__ = [
     "pretty_print_fields",
     "render_report_v2",
     "normalize_labels_llm",
+    "order_job_files",
 ]
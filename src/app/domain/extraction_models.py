@@ -17,3 +17,23 @@ class ExtractedFields:
     confidences: dict[str, float | None]
     needs_review: bool
     warnings: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedSchema:
+    schema: dict
+    schema_json: str
+    instructions: str
+    is_empty: bool
+    warnings: tuple[str, ...] = ()
+
+
+@dataclass
+class ExtractionOutcome:
+    file_id: str
+    schema: dict
+    schema_json: str
+    fields: dict[str, object]
+    needs_review: bool
+    warnings: list[str]
+    duration_ms: int
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from app.domain.models import FileRef
+
+
+def order_job_files(files: list[FileRef]) -> list[FileRef]:
+    """Order by sort_index (falling back to list position), then name, then file_id."""
+    keys = [
+        (
+            file_ref.sort_index if file_ref.sort_index is not None else position,
+            file_ref.name,
+            file_ref.file_id,
+        )
+        for position, file_ref in enumerate(files)
+    ]
+    # Storage already returns this order; a linear check skips the sort.
+    if all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1)):
+        return list(files)
+    order = sorted(range(len(files)), key=keys.__getitem__)
+    return [files[i] for i in order]
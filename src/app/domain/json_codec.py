@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+
+def dumps(value: object) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+
+def dumps_bytes(value: object) -> bytes:
+    """Serialize to UTF-8 JSON bytes, e.g. a request body, without a str round trip."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def loads(value: str | bytes) -> object:
+    """Parse JSON text; raises json.JSONDecodeError on invalid input either way."""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
@@ -8,6 +8,7 @@ class FileRef:
     name: str
     mime_type: str
     sort_index: int | None = None
+    size_bytes: int | None = None
 
 
 @dataclass
@@ -45,6 +46,12 @@ class OCRResult:
     confidence: float | None
 
 
+@dataclass
+class OCRTextMeta:
+    has_text: bool
+    text_length: int
+
+
 @dataclass
 class JobFileRecord:
     job_id: str
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any, Protocol
 
 import json
@@ -21,6 +22,16 @@ def _get_value(item: Any, key: str, default: Any = "") -> Any:
     return getattr(item, key, default)
 
 
+def _value_getter(items: list[dict] | list[FileRefLike]) -> Callable[[Any, str, Any], Any]:
+    """Pick dict or attribute access once per list; mixed lists check each row."""
+    dict_count = sum(1 for item in items if isinstance(item, dict))
+    if dict_count == len(items):
+        return dict.get
+    if dict_count == 0:
+        return getattr
+    return _get_value
+
+
 def render_increment2_report(
     *,
     job_id: str,
@@ -28,12 +39,13 @@ def render_increment2_report(
     generated_at_local_iso: str,
     files: list[dict] | list[FileRefLike],
 ) -> str:
+    get_value = _value_getter(files)
     ordered_files = sorted(
         files,
         key=lambda item: (
-            _get_value(item, "sort_index", 0),
-            _get_value(item, "name", ""),
-            _get_value(item, "file_id", ""),
+            get_value(item, "sort_index", 0),
+            get_value(item, "name", ""),
+            get_value(item, "file_id", ""),
         ),
     )
     lines: list[str] = [
@@ -43,21 +55,21 @@ def render_increment2_report(
         f"GENERATED_AT: {generated_at_local_iso}",
     ]
     for index, item in enumerate(ordered_files, start=1):
-        extracted_text = _get_value(item, "extracted_text", "")
+        extracted_text = get_value(item, "extracted_text", "")
         extracted_text_value = (
             str(extracted_text)
             if extracted_text is not None and str(extracted_text).strip()
             else _PENDING_TOKEN
         )
-        extracted_fields = _get_value(item, "extracted_fields", None)
+        extracted_fields = get_value(item, "extracted_fields", None)
         extracted_fields_value = _render_fields_json(extracted_fields)
         lines.extend(
             [
                 "--- FILE START ---",
                 f"INDEX: {index}",
-                f"FILE_NAME: {_get_value(item, 'name', '')}",
-                f"FILE_ID: {_get_value(item, 'file_id', '')}",
-                f"MIME_TYPE: {_get_value(item, 'mime_type', '')}",
+                f"FILE_NAME: {get_value(item, 'name', '')}",
+                f"FILE_ID: {get_value(item, 'file_id', '')}",
+                f"MIME_TYPE: {get_value(item, 'mime_type', '')}",
                 "",
                 "EXTRACTED_TEXT:",
                 extracted_text_value,
@@ -87,12 +99,13 @@ def render_increment7_report(
     generated_at_local_iso: str,
     files: list[dict] | list[FileRefLike],
 ) -> str:
+    get_value = _value_getter(files)
     ordered_files = sorted(
         files,
         key=lambda item: (
-            _get_value(item, "sort_index", 0),
-            _get_value(item, "final_name", ""),
-            _get_value(item, "file_id", ""),
+            get_value(item, "sort_index", 0),
+            get_value(item, "final_name", ""),
+            get_value(item, "file_id", ""),
         ),
     )
     lines: list[str] = [
@@ -102,16 +115,16 @@ def render_increment7_report(
         f"GENERATED_AT: {generated_at_local_iso}",
     ]
     for index, item in enumerate(ordered_files, start=1):
-        extracted_fields = _get_value(item, "extracted_fields", None)
-        field_order = _get_value(item, "field_order", None)
+        extracted_fields = get_value(item, "extracted_fields", None)
+        field_order = get_value(item, "field_order", None)
         rendered_fields = _render_pretty_fields(extracted_fields, field_order)
         lines.extend(
             [
                 "--- FILE START ---",
                 f"INDEX: {index}",
-                f"FINAL_NAME: {_get_value(item, 'final_name', '')}",
-                f"FILE_ID: {_get_value(item, 'file_id', '')}",
-                f"FINAL_LABEL: {_get_value(item, 'final_label', _UNKNOWN_TOKEN)}",
+                f"FINAL_NAME: {get_value(item, 'final_name', '')}",
+                f"FILE_ID: {get_value(item, 'file_id', '')}",
+                f"FINAL_LABEL: {get_value(item, 'final_label', _UNKNOWN_TOKEN)}",
                 "",
                 "EXTRACTED_FIELDS:",
                 rendered_fields,
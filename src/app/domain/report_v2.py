@@ -7,7 +7,7 @@ UNKNOWN_TOKEN = "UNKNOWN"
 UNLABELED_TOKEN = "UNLABELED"
 
 
-@dataclass
+@dataclass(slots=True)
 class FinalReportFileBlock:
     index: int
     final_name: str
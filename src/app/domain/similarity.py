@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
+from operator import mul
 
 
 def normalize_text_to_tokens(text: str) -> set[str]:
+    return set(_cached_tokens(text))
+
+
+@lru_cache(maxsize=512)
+def _cached_tokens(text: str) -> frozenset[str]:
     normalized_chars: list[str] = []
     for char in text.lower():
         if char.isalnum():
@@ -11,18 +18,37 @@ def normalize_text_to_tokens(text: str) -> set[str]:
         else:
             normalized_chars.append(" ")
     cleaned = "".join(normalized_chars)
-    tokens = {token for token in cleaned.split() if len(token) >= 2}
-    return tokens
+    return frozenset(token for token in cleaned.split() if len(token) >= 2)
 
 
 def jaccard_similarity(a: set[str], b: set[str]) -> float:
     if not a or not b:
         return 0.0
-    intersection = a.intersection(b)
-    union = a.union(b)
-    if not union:
+    # |A ∪ B| = |A| + |B| - |A ∩ B|; avoids materializing the union set.
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def jaccard_batch(query: set[str], candidates: list[set[str]]) -> list[float]:
+    """Score one query token set against many candidates in a single pass."""
+    if not query:
+        return [0.0] * len(candidates)
+    query_size = len(query)
+    scores: list[float] = []
+    for candidate in candidates:
+        if not candidate:
+            scores.append(0.0)
+            continue
+        intersection = len(query & candidate)
+        scores.append(intersection / (query_size + len(candidate) - intersection))
+    return scores
+
+
+def jaccard_upper_bound(a_size: int, b_size: int) -> float:
+    """Best Jaccard score two sets of these sizes could reach (full overlap of the smaller)."""
+    if not a_size or not b_size:
         return 0.0
-    return len(intersection) / len(union)
+    return min(a_size, b_size) / max(a_size, b_size)
 
 
 def cosine_similarity(vec_a: list[float], vec_b: list[float]) -> float:
@@ -36,3 +62,17 @@ def cosine_similarity(vec_a: list[float], vec_b: list[float]) -> float:
     if norm_a == 0.0 or norm_b == 0.0:
         return 0.0
     return dot / (norm_a * norm_b)
+
+
+def normalize_vector(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm == 0.0:
+        return [float(v) for v in vec]
+    return [v / norm for v in vec]
+
+
+def dot_product(vec_a, vec_b) -> float:
+    """Cosine similarity for vectors already normalized to unit length."""
+    if len(vec_a) != len(vec_b) or not vec_a:
+        return 0.0
+    return sum(map(mul, vec_a, vec_b))
@@ -7,3 +7,7 @@ from typing import Protocol, runtime_checkable
 class EmbeddingsPort(Protocol):
     def embed_text(self, text: str) -> list[float]:
         """Return a vector embedding for the given text."""
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Return embeddings for many texts in input order; adapters may batch."""
+        return [self.embed_text(text) for text in texts]
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Protocol
 
 from app.domain.doc_types import DocType, DocTypeClassification
+from app.domain.label_fallback import LabelFallbackClassification
 from app.domain.labels import Label, LabelExample
 from app.domain.models import (
     AppliedRename,
@@ -15,6 +16,7 @@ from app.domain.models import (
     LabelAssignment,
     LLMLabelClassification,
     OCRResult,
+    OCRTextMeta,
     RenameOp,
     UndoLog,
 )
@@ -64,9 +66,15 @@ class StoragePort(Protocol):
     ) -> None:
         """Persist per-file timing metrics (ms)."""
 
+    def bulk_upsert_file_timings(self, records: list[FileTimingRecord]) -> None:
+        """Persist many per-file timing rows in one transaction; None keeps prior values."""
+
     def get_file_timings(self, job_id: str, file_id: str) -> FileTimingRecord | None:
         """Return per-file timing metrics if present."""
 
+    def list_file_timings(self, job_id: str) -> dict[str, FileTimingRecord]:
+        """Return per-file timing metrics for a job keyed by file_id."""
+
     def save_undo_log(self, undo: UndoLog) -> None:
         """Persist an undo log entry."""
 
@@ -85,9 +93,21 @@ class StoragePort(Protocol):
     def save_ocr_result(self, job_id: str, file_id: str, result: OCRResult) -> None:
         """Persist OCR output for a file."""
 
+    def bulk_save_ocr_results(self, job_id: str, results: dict[str, OCRResult]) -> None:
+        """Persist OCR output for many files in one transaction."""
+
     def get_ocr_result(self, job_id: str, file_id: str) -> OCRResult | None:
         """Return OCR output for a file, if any."""
 
+    def list_ocr_results(self, job_id: str) -> dict[str, OCRResult]:
+        """Return OCR output for a job's files keyed by file_id."""
+
+    def get_ocr_text_meta(self, job_id: str, file_id: str) -> OCRTextMeta | None:
+        """Return whether stored OCR text is non-blank and its length, without the text."""
+
+    def list_ocr_text_meta(self, job_id: str) -> dict[str, OCRTextMeta]:
+        """Return OCR text meta for a job's files keyed by file_id."""
+
     def create_label(
         self, name: str, extraction_schema_json: str, naming_template: str
     ) -> Label:
@@ -105,6 +125,9 @@ class StoragePort(Protocol):
     def get_label(self, label_id: str) -> Label | None:
         """Return a label by id, or None if missing."""
 
+    def list_labels_by_ids(self, label_ids: list[str]) -> list[Label]:
+        """Return labels matching the given ids; missing ids are skipped."""
+
     def count_labels(self) -> int:
         """Return count of labels."""
 
@@ -129,10 +152,39 @@ class StoragePort(Protocol):
         embedding: list[float] | None,
         token_fingerprint: set[str] | None,
     ) -> None:
-        """Persist OCR text and similarity features for a label example."""
+        """Persist OCR text and similarity features; embeddings are stored unit-length."""
 
     def get_label_example_features(self, example_id: str) -> dict | None:
-        """Return OCR text and features for a label example."""
+        """Return OCR text and features; the embedding is a unit-length float32 array."""
+
+    def bulk_get_label_example_features(self, example_ids: list[str]) -> dict[str, dict]:
+        """Return features for many label examples keyed by example_id."""
+
+    def get_cached_embeddings(
+        self, model: str, text_hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """Return cached embeddings for a model keyed by text hash; misses are skipped."""
+
+    def save_cached_embeddings(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        """Persist embeddings for a model keyed by text hash."""
+
+    def get_cached_label_classification(
+        self, cache_key: str
+    ) -> LabelFallbackClassification | None:
+        """Return a cached LLM label classification for a prompt key, if any."""
+
+    def save_cached_label_classification(
+        self, cache_key: str, classification: LabelFallbackClassification
+    ) -> None:
+        """Persist an LLM label classification under a prompt key."""
+
+    def get_cached_llm_response(self, cache_key: str) -> dict | None:
+        """Return a cached structured LLM response for a prompt key, if any."""
+
+    def save_cached_llm_response(self, cache_key: str, response: dict) -> None:
+        """Persist a structured LLM response under a prompt key."""
 
     def delete_label_example(self, example_id: str) -> None:
         """Delete a label example and its stored features."""
@@ -150,6 +202,9 @@ class StoragePort(Protocol):
     ) -> None:
         """Persist a classification assignment for a job file."""
 
+    def bulk_upsert_file_label_assignments(self, records: list[LabelAssignment]) -> None:
+        """Persist many classification assignments in one transaction."""
+
     def get_file_label_assignment(
         self, job_id: str, file_id: str
     ) -> LabelAssignment | None:
@@ -251,9 +306,15 @@ class StoragePort(Protocol):
     ) -> None:
         """Persist extraction output for a job file."""
 
+    def bulk_save_extractions(self, records: list[ExtractionRecord]) -> None:
+        """Persist many extraction outputs in one transaction."""
+
     def get_extraction(self, job_id: str, file_id: str) -> ExtractionRecord | None:
         """Return extraction output for a job file."""
 
+    def list_extractions(self, job_id: str) -> dict[str, ExtractionRecord]:
+        """Return extraction outputs for a job keyed by file_id."""
+
     def update_label_extraction_schema(
         self, label_id: str, extraction_schema_json: str
     ) -> None:
@@ -1,14 +1,43 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from time import perf_counter
 
-from app.domain.extraction_models import GENERIC_MIN_SCHEMA
+from app.domain import json_codec
+from app.domain.extraction_models import (
+    GENERIC_MIN_SCHEMA,
+    ExtractionOutcome,
+    ResolvedSchema,
+)
+from app.domain.file_order import order_job_files
+from app.domain.labels import Label
+from app.domain.models import ExtractionRecord, FileRef, FileTimingRecord
 from app.domain.schema_utils import apply_missing_field_policy
 from app.ports.drive_port import DrivePort
 from app.ports.llm_port import LLMPort
 from app.ports.storage_port import StoragePort
+from app.settings import LLM_WORKERS, MAX_EXTRACT_BYTES
+
+EMPTY_SCHEMA = "EMPTY_SCHEMA"
+INVALID_SCHEMA = "INVALID_SCHEMA"
+FILE_MIME_UNKNOWN = "FILE_MIME_UNKNOWN"
+FILE_DOWNLOAD_FAILED = "FILE_DOWNLOAD_FAILED"
+FILE_BYTES_EMPTY = "FILE_BYTES_EMPTY"
+FILE_TOO_LARGE = "FILE_TOO_LARGE"
+UNSUPPORTED_MIME = "UNSUPPORTED_MIME"
+LLM_IMAGE_EXTRACTION_FAILED = "LLM_IMAGE_EXTRACTION_FAILED"
+LLM_EXTRACTION_EMPTY = "LLM_EXTRACTION_EMPTY"
+
+# Extraction results are written in batches of this many files
+_SAVE_BATCH_SIZE = 25
+_EMPTY_CONFIDENCES_JSON = json_codec.dumps({})
+
+_DEFAULT_INSTRUCTIONS = (
+    'Extract fields according to this schema. If a field is missing, return "UNKNOWN".'
+)
 
 
 class ExtractionService:
@@ -16,95 +45,187 @@ class ExtractionService:
         self._llm = llm
         self._storage = storage
         self._drive = drive
+        self._generic = self._build_resolved(GENERIC_MIN_SCHEMA, self._default_instructions())
+        # label_id -> (schema JSON, instructions, resolved); reused until the label changes.
+        self._schema_cache: dict[str, tuple[str, str, ResolvedSchema]] = {}
 
     def extract_fields_for_job(self, job_id: str) -> None:
         files = self._ordered_files(job_id)
-        for file_ref in files:
-            self.extract_fields_for_file(job_id, file_ref.file_id)
+        label_ids = self._job_label_ids(job_id)
+        resolved = self._resolve_label_schemas(list(label_ids.values()))
+        tasks = [
+            (file_ref, resolved.get(label_ids.get(file_ref.file_id), self._generic))
+            for file_ref in files
+        ]
+        # Submit files sharing a schema back to back so identical prompt prefixes
+        # reach the provider close together (prompt caching); order is stable otherwise.
+        tasks.sort(key=lambda task: task[1].schema_json)
+        updated_at = datetime.now(timezone.utc).isoformat()
+        pending: list[ExtractionOutcome] = []
+        for outcome in self._run_tasks(tasks):
+            pending.append(outcome)
+            if len(pending) >= _SAVE_BATCH_SIZE:
+                self._save_outcomes(job_id, pending, updated_at)
+                pending = []
+        self._save_outcomes(job_id, pending, updated_at)
+
+    def extract_fields_for_file(
+        self, job_id: str, file_id: str, file_ref: FileRef | None = None
+    ) -> None:
+        resolved = self._resolve_schema(job_id, file_id)
+        if file_ref is None:
+            file_ref = self._get_job_file_ref(job_id, file_id)
+        if file_ref is None:
+            file_ref = FileRef(file_id=file_id, name="", mime_type="")
+        self._save_outcomes(job_id, [self._do_extract(file_ref, resolved)])
 
-    def extract_fields_for_file(self, job_id: str, file_id: str) -> None:
+    def _run_tasks(
+        self, tasks: list[tuple[FileRef, ResolvedSchema]]
+    ) -> Iterator[ExtractionOutcome]:
+        if LLM_WORKERS <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield self._do_extract(*task)
+            return
+        with ThreadPoolExecutor(max_workers=LLM_WORKERS) as executor:
+            futures = [executor.submit(self._do_extract, *task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _do_extract(
+        self,
+        file_ref: FileRef,
+        resolved: ResolvedSchema,
+    ) -> ExtractionOutcome:
         started = perf_counter()
-        schema, schema_warnings, instructions = self._resolve_schema(job_id, file_id)
-        file_ref = self._get_job_file_ref(job_id, file_id)
-        warnings: list[str] = list(schema_warnings)
+        file_id = file_ref.file_id
+        schema = resolved.schema
+        warnings: list[str] = list(resolved.warnings)
         needs_review = False
-        if self._is_empty_schema(schema):
-            warnings.append("EMPTY_SCHEMA")
+        if resolved.is_empty:
+            warnings.append(EMPTY_SCHEMA)
             needs_review = True
             extracted = {}
         else:
-            mime_type = file_ref.mime_type if file_ref else ""
+            mime_type = file_ref.mime_type or ""
             if not mime_type:
-                warnings.append("FILE_MIME_UNKNOWN")
-            try:
-                file_bytes = self._drive.download_file_bytes(file_id)
-            except Exception:
-                warnings.append("FILE_DOWNLOAD_FAILED")
+                warnings.append(FILE_MIME_UNKNOWN)
+            if mime_type and not self._is_supported_mime(mime_type):
+                # Skip the download and the LLM call for files that cannot be rendered.
+                warnings.append(UNSUPPORTED_MIME)
+                needs_review = True
+                extracted = {}
+            elif file_ref.size_bytes is not None and file_ref.size_bytes > MAX_EXTRACT_BYTES:
+                warnings.append(FILE_TOO_LARGE)
                 needs_review = True
                 extracted = {}
             else:
-                if not file_bytes:
-                    warnings.append("FILE_BYTES_EMPTY")
+                try:
+                    file_bytes = self._drive.download_file_bytes(file_id)
+                except Exception:
+                    warnings.append(FILE_DOWNLOAD_FAILED)
                     needs_review = True
                     extracted = {}
                 else:
-                    try:
-                        extracted = (
-                            self._llm.extract_fields_from_image(
-                                schema,
-                                file_bytes,
-                                mime_type,
-                                instructions,
-                            )
-                            or {}
-                        )
-                    except Exception as exc:
-                        warnings.append("LLM_IMAGE_EXTRACTION_FAILED")
-                        detail = self._safe_warning_detail(exc)
-                        if detail:
-                            warnings.append(f"LLM_ERROR_DETAIL: {detail}")
-                        needs_review = True
-                        extracted = {}
-                    if (
-                        not extracted
-                        and schema.get("properties")
-                        and "LLM_IMAGE_EXTRACTION_FAILED" not in warnings
-                    ):
-                        warnings.append("LLM_EXTRACTION_EMPTY")
-                        needs_review = True
+                    extracted, needs_review = self._extract_from_bytes(
+                        file_bytes, mime_type, resolved, warnings
+                    )
         fields, missing_warnings, missing_review = apply_missing_field_policy(
             schema, extracted
         )
         warnings.extend(missing_warnings)
-        needs_review = needs_review or missing_review
-        payload = {
-            "fields": fields,
-            "needs_review": needs_review,
-            "warnings": warnings,
-        }
-        updated_at = datetime.now(timezone.utc).isoformat()
-        self._storage.save_extraction(
-            job_id=job_id,
+        return ExtractionOutcome(
             file_id=file_id,
-            schema_json=json.dumps(schema),
-            fields_json=json.dumps(payload),
-            confidences_json=json.dumps({}),
-            updated_at=updated_at,
-        )
-        duration_ms = int((perf_counter() - started) * 1000)
-        self._storage.upsert_file_timings(
-            job_id=job_id,
-            file_id=file_id,
-            ocr_ms=None,
-            classify_ms=None,
-            extract_ms=duration_ms,
-            updated_at_iso=updated_at,
+            schema=schema,
+            schema_json=resolved.schema_json,
+            fields=fields,
+            needs_review=needs_review or missing_review,
+            warnings=warnings,
+            duration_ms=int((perf_counter() - started) * 1000),
         )
 
-    def _resolve_schema(self, job_id: str, file_id: str) -> tuple[dict, list[str], str]:
+    def _extract_from_bytes(
+        self,
+        file_bytes: bytes,
+        mime_type: str,
+        resolved: ResolvedSchema,
+        warnings: list[str],
+    ) -> tuple[dict, bool]:
+        if not file_bytes:
+            warnings.append(FILE_BYTES_EMPTY)
+            return {}, True
+        if len(file_bytes) > MAX_EXTRACT_BYTES:
+            # Fallback for files listed without a size.
+            warnings.append(FILE_TOO_LARGE)
+            return {}, True
+        try:
+            extracted = (
+                self._llm.extract_fields_from_image(
+                    resolved.schema,
+                    file_bytes,
+                    mime_type,
+                    resolved.instructions,
+                )
+                or {}
+            )
+        except Exception as exc:
+            warnings.append(LLM_IMAGE_EXTRACTION_FAILED)
+            detail = self._safe_warning_detail(exc)
+            if detail:
+                warnings.append(f"LLM_ERROR_DETAIL: {detail}")
+            return {}, True
+        if not extracted and resolved.schema.get("properties"):
+            warnings.append(LLM_EXTRACTION_EMPTY)
+            return extracted, True
+        return extracted, False
+
+    @staticmethod
+    def _is_supported_mime(mime_type: str) -> bool:
+        lowered = mime_type.lower()
+        return lowered.startswith("image/") or lowered == "application/pdf"
+
+    def _save_outcomes(
+        self,
+        job_id: str,
+        outcomes: list[ExtractionOutcome],
+        updated_at: str | None = None,
+    ) -> None:
+        if not outcomes:
+            return
+        if updated_at is None:
+            updated_at = datetime.now(timezone.utc).isoformat()
+        extractions: list[ExtractionRecord] = []
+        timings: list[FileTimingRecord] = []
+        for outcome in outcomes:
+            payload = {
+                "fields": outcome.fields,
+                "needs_review": outcome.needs_review,
+                "warnings": outcome.warnings,
+            }
+            extractions.append(
+                ExtractionRecord(
+                    job_id=job_id,
+                    file_id=outcome.file_id,
+                    schema_json=outcome.schema_json,
+                    fields_json=json_codec.dumps(payload),
+                    confidences_json=_EMPTY_CONFIDENCES_JSON,
+                    updated_at=updated_at,
+                )
+            )
+            timings.append(
+                FileTimingRecord(
+                    job_id=job_id,
+                    file_id=outcome.file_id,
+                    ocr_ms=None,
+                    classify_ms=None,
+                    extract_ms=outcome.duration_ms,
+                    updated_at=updated_at,
+                )
+            )
+        self._storage.bulk_save_extractions(extractions)
+        self._storage.bulk_upsert_file_timings(timings)
+
+    def _resolve_schema(self, job_id: str, file_id: str) -> ResolvedSchema:
         label_id = None
-        warnings: list[str] = []
-        instructions = ""
         override = self._storage.get_file_label_override(job_id, file_id)
         if override:
             label_id = override
@@ -113,25 +234,70 @@ class ExtractionService:
             if assignment and assignment.label_id:
                 label_id = assignment.label_id
         if label_id:
-            label = self._storage.get_label(label_id)
-            if label and label.extraction_schema_json:
-                schema = self._parse_schema(label.extraction_schema_json)
-                if schema is not None:
-                    instructions = label.extraction_instructions or ""
-                    return schema, warnings, instructions
-                warnings.append("INVALID_SCHEMA")
-                return GENERIC_MIN_SCHEMA, warnings, self._default_instructions()
-        return GENERIC_MIN_SCHEMA, warnings, self._default_instructions()
+            return self._schema_for_label(self._storage.get_label(label_id))
+        return self._generic
+
+    def _job_label_ids(self, job_id: str) -> dict[str, str]:
+        label_ids = {
+            assignment.file_id: assignment.label_id
+            for assignment in self._storage.list_file_label_assignments(job_id)
+            if assignment.label_id
+        }
+        for override in self._storage.list_file_label_overrides(job_id):
+            if override.label_id:
+                label_ids[override.file_id] = override.label_id
+        return label_ids
+
+    def _resolve_label_schemas(
+        self, label_ids: list[str]
+    ) -> dict[str, ResolvedSchema]:
+        labels = {
+            label.label_id: label
+            for label in self._storage.list_labels_by_ids(sorted(set(label_ids)))
+        }
+        return {
+            label_id: self._schema_for_label(labels.get(label_id))
+            for label_id in set(label_ids)
+        }
+
+    def _schema_for_label(self, label: Label | None) -> ResolvedSchema:
+        if label and label.extraction_schema_json:
+            schema_json = label.extraction_schema_json
+            instructions = label.extraction_instructions or ""
+            cached = self._schema_cache.get(label.label_id)
+            if cached is not None and cached[0] == schema_json and cached[1] == instructions:
+                return cached[2]
+            schema = self._parse_schema(schema_json)
+            if schema is not None:
+                resolved = self._build_resolved(schema, instructions)
+            else:
+                resolved = self._build_resolved(
+                    GENERIC_MIN_SCHEMA, self._default_instructions(), (INVALID_SCHEMA,)
+                )
+            self._schema_cache[label.label_id] = (schema_json, instructions, resolved)
+            return resolved
+        return self._generic
+
+    def _build_resolved(
+        self, schema: dict, instructions: str, warnings: tuple[str, ...] = ()
+    ) -> ResolvedSchema:
+        return ResolvedSchema(
+            schema=schema,
+            schema_json=json_codec.dumps(schema),
+            instructions=instructions,
+            is_empty=self._is_empty_schema(schema),
+            warnings=warnings,
+        )
 
     @staticmethod
     def _parse_schema(value: str) -> dict | None:
         try:
-            data = json.loads(value)
+            data = json_codec.loads(value)
         except json.JSONDecodeError:
             return None
         return data if isinstance(data, dict) else None
 
-    def _get_job_file_ref(self, job_id: str, file_id: str):
+    def _get_job_file_ref(self, job_id: str, file_id: str) -> FileRef | None:
         files = self._storage.get_job_files(job_id)
         for file_ref in files:
             if file_ref.file_id == file_id:
@@ -151,7 +317,7 @@ class ExtractionService:
 
     @staticmethod
     def _default_instructions() -> str:
-        return 'Extract fields according to this schema. If a field is missing, return "UNKNOWN".'
+        return _DEFAULT_INSTRUCTIONS
 
     @staticmethod
     def _safe_warning_detail(exc: Exception, max_len: int = 320) -> str:
@@ -163,13 +329,5 @@ class ExtractionService:
             return compact
         return f"{compact[:max_len]}..."
 
-    def _ordered_files(self, job_id: str) -> list:
-        files = self._storage.get_job_files(job_id)
-        return sorted(
-            files,
-            key=lambda item: (
-                item.sort_index if item.sort_index is not None else 0,
-                item.name,
-                item.file_id,
-            ),
-        )
+    def _ordered_files(self, job_id: str) -> list[FileRef]:
+        return order_job_files(self._storage.get_job_files(job_id))
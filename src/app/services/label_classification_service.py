@@ -1,16 +1,72 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from time import perf_counter
 
+from app.domain.file_order import order_job_files
 from app.domain.labels import NO_MATCH, decide_match
-from app.domain.similarity import cosine_similarity, jaccard_similarity, normalize_text_to_tokens
-from app.settings import AMBIGUITY_MARGIN, LEXICAL_MATCH_THRESHOLD, MATCH_THRESHOLD
+from app.domain.models import FileRef, FileTimingRecord, LabelAssignment, OCRResult
+from app.domain.similarity import (
+    dot_product,
+    jaccard_batch,
+    jaccard_upper_bound,
+    normalize_text_to_tokens,
+    normalize_vector,
+)
+from app.settings import (
+    AMBIGUITY_MARGIN,
+    LEXICAL_MATCH_THRESHOLD,
+    LLM_WORKERS,
+    MATCH_THRESHOLD,
+)
 from app.services.llm_fallback_label_service import LLMFallbackLabelService
 from app.ports.embeddings_port import EmbeddingsPort
 from app.ports.storage_port import StoragePort
 
 
+@dataclass
+class _PreparedExamples:
+    """Label example features resolved once per classification run, grouped by label."""
+
+    rows: list[tuple[str, dict]]
+    embedding_groups: list[tuple[str, list[Sequence[float]]]]
+    _token_groups: list[tuple[str, list[frozenset[str]]]] | None = None
+
+    def token_groups(self) -> list[tuple[str, list[frozenset[str]]]]:
+        if self._token_groups is None:
+            groups: dict[str, list[frozenset[str]]] = {}
+            for label_id, feature in self.rows:
+                tokens = feature.get("token_fingerprint")
+                if not tokens:
+                    tokens = normalize_text_to_tokens(feature.get("ocr_text") or "")
+                if tokens:
+                    groups.setdefault(label_id, []).append(frozenset(tokens))
+            self._token_groups = list(groups.items())
+        return self._token_groups
+
+
+@dataclass(frozen=True)
+class _FileInputs:
+    """Override, OCR text and embedding loaded up front for one file of a job run."""
+
+    override: str | None
+    ocr_text: str | None
+    embedding: list[float] | None = None
+
+
+@dataclass
+class _PendingWrites:
+    """Per-job results buffered for bulk writes (list/dict updates are GIL-atomic)."""
+
+    updated_at: str
+    assignments: list[LabelAssignment] = field(default_factory=list)
+    timings: dict[str, FileTimingRecord] = field(default_factory=dict)
+    fallback_file_ids: list[str] = field(default_factory=list)
+
+
 class LabelClassificationService:
     def __init__(
         self,
@@ -24,40 +80,61 @@ class LabelClassificationService:
 
     def classify_job_files(self, job_id: str) -> None:
         job_files = self._ordered_job_files(job_id)
-        labels = self._storage.list_labels(include_inactive=False)
-        label_examples = {
-            label.label_id: self._storage.list_label_examples(label.label_id) for label in labels
-        }
+        examples = self._prepare_examples()
+        inputs = self._load_job_inputs(job_id, job_files)
+        if any(item.embedding is None for item in inputs.values()):
+            # Some files will score lexically; build token rows before fanning out.
+            examples.token_groups()
 
-        for file_ref in job_files:
-            self._classify_file(
+        pending = _PendingWrites(updated_at=datetime.now(timezone.utc).isoformat())
+
+        def classify(file_ref) -> dict:
+            return self._classify_file(
                 job_id,
                 file_ref.file_id,
-                labels,
-                label_examples,
+                examples,
+                inputs=inputs[file_ref.file_id],
+                include_candidates=False,
+                pending=pending,
             )
 
+        self._run_concurrently(classify, job_files)
+        # Assignments must be stored before the LLM fallback reads them back.
+        self._storage.bulk_upsert_file_label_assignments(pending.assignments)
+        if self._llm_fallback is not None and pending.fallback_file_ids:
+            # Assignments just changed; the fallback then loads its job context once.
+            self._llm_fallback.reset_cache(job_id)
+            self._run_concurrently(
+                lambda file_id: self._run_fallback(job_id, file_id, pending),
+                pending.fallback_file_ids,
+            )
+            self._llm_fallback.reset_cache(job_id)
+        self._storage.bulk_upsert_file_timings(list(pending.timings.values()))
+
     def classify_file(self, job_id: str, file_id: str) -> dict:
-        labels = self._storage.list_labels(include_inactive=False)
-        label_examples = {
-            label.label_id: self._storage.list_label_examples(label.label_id) for label in labels
-        }
-        return self._classify_file(job_id, file_id, labels, label_examples)
+        return self._classify_file(job_id, file_id, self._prepare_examples())
 
     def override_file_label(self, job_id: str, file_id: str, label_id: str | None) -> None:
         self._storage.upsert_file_label_override(job_id, file_id, label_id)
+        if self._llm_fallback is not None:
+            self._llm_fallback.reset_cache(job_id)
 
     def _classify_file(
         self,
         job_id: str,
         file_id: str,
-        labels: list,
-        label_examples: dict[str, list],
+        examples: _PreparedExamples,
+        inputs: _FileInputs | None = None,
+        include_candidates: bool = True,
+        pending: _PendingWrites | None = None,
     ) -> dict:
         started = perf_counter()
-        override = self._storage.get_file_label_override(job_id, file_id)
+        if inputs is None:
+            override = self._storage.get_file_label_override(job_id, file_id)
+        else:
+            override = inputs.override
         if override is not None:
-            self._save_timing(job_id, file_id, started)
+            self._save_timing(job_id, file_id, started, pending)
             return {
                 "label_id": override,
                 "score": 0.0,
@@ -67,16 +144,16 @@ class LabelClassificationService:
                 "llm_called": False,
                 "llm_result": None,
             }
-        ocr_result = self._storage.get_ocr_result(job_id, file_id)
-        if ocr_result is None or not ocr_result.text.strip():
-            self._storage.upsert_file_label_assignment(
-                job_id=job_id,
-                file_id=file_id,
-                label_id=None,
-                score=0.0,
-                status=NO_MATCH,
-            )
-            self._save_timing(job_id, file_id, started)
+        if inputs is None:
+            ocr_result = self._load_ocr_result(job_id, file_id)
+            ocr_text = ocr_result.text if ocr_result is not None else None
+            embedding = None
+        else:
+            ocr_text = inputs.ocr_text
+            embedding = inputs.embedding
+        if ocr_text is None:
+            self._save_assignment(job_id, file_id, None, 0.0, NO_MATCH, pending)
+            self._save_timing(job_id, file_id, started, pending)
             return {
                 "label_id": None,
                 "score": 0.0,
@@ -87,78 +164,72 @@ class LabelClassificationService:
                 "llm_result": None,
             }
 
-        ocr_text = ocr_result.text
-        embedding: list[float] | None = None
         tokens: set[str] | None = None
         method = "embeddings"
-        try:
-            embedding = self._embeddings.embed_text(ocr_text)
-        except Exception:
-            embedding = None
+        if embedding is None:
+            try:
+                embedding = self._embeddings.embed_text(ocr_text)
+            except Exception:
+                embedding = None
         if not embedding:
             method = "lexical"
             tokens = normalize_text_to_tokens(ocr_text)
+        else:
+            embedding = normalize_vector(embedding)
 
         label_scores: dict[str, float] = {}
-        for label in labels:
-            best_score = None
-            for example in label_examples.get(label.label_id, []):
-                features = self._storage.get_label_example_features(example.example_id)
-                if features is None:
-                    continue
-                if method == "embeddings":
-                    example_embedding = features.get("embedding")
-                    if not example_embedding:
-                        continue
-                    score = cosine_similarity(embedding or [], example_embedding)
-                else:
-                    example_tokens = features.get("token_fingerprint")
-                    if not example_tokens:
-                        example_text = features.get("ocr_text", "")
-                        example_tokens = normalize_text_to_tokens(example_text)
-                    if not example_tokens:
-                        continue
-                    score = jaccard_similarity(tokens or set(), example_tokens)
-                if best_score is None or score > best_score:
-                    best_score = score
-            if best_score is not None:
-                label_scores[label.label_id] = best_score
+        if method == "embeddings":
+            query = embedding or []
+            for label_id, vectors in examples.embedding_groups:
+                label_scores[label_id] = max(dot_product(query, vector) for vector in vectors)
+        else:
+            label_scores = self._lexical_label_scores(
+                tokens or set(), examples.token_groups(), prune=not include_candidates
+            )
 
         best_label_id = None
         best_score = 0.0
         second_score = None
+        for label_id, score in label_scores.items():
+            if best_label_id is None or score > best_score:
+                if best_label_id is not None:
+                    second_score = best_score
+                best_label_id, best_score = label_id, score
+            elif second_score is None or score > second_score:
+                second_score = score
         sorted_scores: list[tuple[str, float]] = []
-        if label_scores:
+        if include_candidates and label_scores:
             sorted_scores = sorted(
                 label_scores.items(), key=lambda item: item[1], reverse=True
             )
-            best_label_id, best_score = sorted_scores[0]
-            if len(sorted_scores) > 1:
-                second_score = sorted_scores[1][1]
 
         threshold = MATCH_THRESHOLD if method == "embeddings" else LEXICAL_MATCH_THRESHOLD
         status, rationale = decide_match(
             best_label_id, best_score, second_score, threshold, AMBIGUITY_MARGIN
         )
         rationale = f"{method} {rationale}"
-        self._storage.upsert_file_label_assignment(
-            job_id=job_id,
-            file_id=file_id,
-            label_id=best_label_id if status != NO_MATCH else None,
-            score=best_score,
-            status=status,
+        self._save_assignment(
+            job_id,
+            file_id,
+            best_label_id if status != NO_MATCH else None,
+            best_score,
+            status,
+            pending,
         )
         llm_called = False
         llm_result = None
-        if status == NO_MATCH and self._llm_fallback is not None:
+        if status == NO_MATCH and self._llm_fallback is not None and pending is not None:
+            pending.fallback_file_ids.append(file_id)
+        elif status == NO_MATCH and self._llm_fallback is not None:
             try:
+                self._llm_fallback.reset_cache(job_id)
                 self._llm_fallback.classify_file(job_id, file_id)
                 llm_called = True
                 llm_result = self._storage.get_llm_label_classification(job_id, file_id)
             except Exception:
                 llm_called = True
                 llm_result = None
-        self._save_timing(job_id, file_id, started)
+        self._save_timing(job_id, file_id, started, pending)
         return {
             "label_id": best_label_id if status != NO_MATCH else None,
             "score": best_score,
@@ -171,24 +242,171 @@ class LabelClassificationService:
             "candidates": sorted_scores,
         }
 
-    def _ordered_job_files(self, job_id: str):
-        job_files = self._storage.get_job_files(job_id)
-        file_rows = [
-            {
-                "file_ref": file_ref,
-                "sort_index": file_ref.sort_index if file_ref.sort_index is not None else index,
-                "name": file_ref.name,
-                "file_id": file_ref.file_id,
-            }
-            for index, file_ref in enumerate(job_files)
+    @staticmethod
+    def _lexical_label_scores(
+        query_tokens: set[str],
+        token_groups: list[tuple[str, list[frozenset[str]]]],
+        prune: bool,
+    ) -> dict[str, float]:
+        label_scores: dict[str, float] = {}
+        query_size = len(query_tokens)
+        best_score: float | None = None
+        second_score: float | None = None
+        for label_id, token_sets in token_groups:
+            if prune and second_score is not None:
+                bound = max(jaccard_upper_bound(query_size, len(item)) for item in token_sets)
+                if bound < second_score:
+                    # Cannot reach the runner-up, so the top two are unchanged.
+                    continue
+            score = max(jaccard_batch(query_tokens, token_sets))
+            label_scores[label_id] = score
+            if best_score is None or score > best_score:
+                second_score, best_score = best_score, score
+            elif second_score is None or score > second_score:
+                second_score = score
+        return label_scores
+
+    def _prepare_examples(self) -> _PreparedExamples:
+        labels = self._storage.list_labels(include_inactive=False)
+        label_examples = [
+            (label.label_id, example)
+            for label in labels
+            for example in self._storage.list_label_examples(label.label_id)
         ]
-        ordered_rows = sorted(
-            file_rows, key=lambda row: (row["sort_index"], row["name"], row["file_id"])
+        features = self._storage.bulk_get_label_example_features(
+            [example.example_id for _, example in label_examples]
         )
-        return [row["file_ref"] for row in ordered_rows]
+        rows = [
+            (label_id, features[example.example_id])
+            for label_id, example in label_examples
+            if example.example_id in features
+        ]
+        embedding_groups: dict[str, list[Sequence[float]]] = {}
+        for label_id, feature in rows:
+            if feature.get("embedding"):
+                # Stored unit-length, so scoring is one dot product per vector.
+                embedding_groups.setdefault(label_id, []).append(feature["embedding"])
+        return _PreparedExamples(rows=rows, embedding_groups=list(embedding_groups.items()))
+
+    def _load_job_inputs(self, job_id: str, job_files: list) -> dict[str, _FileInputs]:
+        overrides = {
+            item.file_id: item.label_id
+            for item in self._storage.list_file_label_overrides(job_id)
+            if item.label_id is not None
+        }
+        # The stored has_text flag avoids loading and stripping blank OCR text.
+        text_meta = self._storage.list_ocr_text_meta(job_id)
+        ocr_texts: dict[str, str] = {}
+        for file_ref in job_files:
+            file_id = file_ref.file_id
+            meta = text_meta.get(file_id)
+            if file_id in overrides or meta is None or not meta.has_text:
+                continue
+            ocr_result = self._storage.get_ocr_result(job_id, file_id)
+            if ocr_result is not None:
+                ocr_texts[file_id] = ocr_result.text
+        embeddings = self._embed_texts(ocr_texts)
+        return {
+            file_ref.file_id: _FileInputs(
+                override=overrides.get(file_ref.file_id),
+                ocr_text=ocr_texts.get(file_ref.file_id),
+                embedding=embeddings.get(file_ref.file_id),
+            )
+            for file_ref in job_files
+        }
+
+    def _embed_texts(self, ocr_texts: dict[str, str]) -> dict[str, list[float]]:
+        if not ocr_texts:
+            return {}
+        try:
+            embeddings = list(self._embeddings.embed_texts(list(ocr_texts.values())))
+        except Exception:
+            return {}
+        if len(embeddings) != len(ocr_texts):
+            return {}
+        return {
+            file_id: embedding
+            for file_id, embedding in zip(ocr_texts, embeddings)
+            if embedding
+        }
+
+    def _load_ocr_result(self, job_id: str, file_id: str) -> OCRResult | None:
+        # The stored has_text flag avoids loading and stripping blank OCR text.
+        meta = self._storage.get_ocr_text_meta(job_id, file_id)
+        if meta is None or not meta.has_text:
+            return None
+        return self._storage.get_ocr_result(job_id, file_id)
+
+    def _ordered_job_files(self, job_id: str) -> list[FileRef]:
+        return order_job_files(self._storage.get_job_files(job_id))
+
+    @staticmethod
+    def _run_concurrently(func, items: list) -> None:
+        if LLM_WORKERS <= 1 or len(items) <= 1:
+            for item in items:
+                func(item)
+            return
+        # Items are independent; overlap embedding and LLM round trips.
+        with ThreadPoolExecutor(max_workers=LLM_WORKERS) as executor:
+            list(executor.map(func, items))
+
+    def _run_fallback(self, job_id: str, file_id: str, pending: _PendingWrites) -> None:
+        started = perf_counter()
+        try:
+            self._llm_fallback.classify_file(job_id, file_id)
+        except Exception:
+            pass
+        timing = pending.timings.get(file_id)
+        if timing is not None and timing.classify_ms is not None:
+            timing.classify_ms += int((perf_counter() - started) * 1000)
 
-    def _save_timing(self, job_id: str, file_id: str, started: float) -> None:
+    def _save_assignment(
+        self,
+        job_id: str,
+        file_id: str,
+        label_id: str | None,
+        score: float,
+        status: str,
+        pending: _PendingWrites | None,
+    ) -> None:
+        if pending is not None:
+            pending.assignments.append(
+                LabelAssignment(
+                    job_id=job_id,
+                    file_id=file_id,
+                    label_id=label_id,
+                    status=status,
+                    score=score,
+                    updated_at=pending.updated_at,
+                )
+            )
+            return
+        self._storage.upsert_file_label_assignment(
+            job_id=job_id,
+            file_id=file_id,
+            label_id=label_id,
+            score=score,
+            status=status,
+        )
+
+    def _save_timing(
+        self,
+        job_id: str,
+        file_id: str,
+        started: float,
+        pending: _PendingWrites | None = None,
+    ) -> None:
         duration_ms = int((perf_counter() - started) * 1000)
+        if pending is not None:
+            pending.timings[file_id] = FileTimingRecord(
+                job_id=job_id,
+                file_id=file_id,
+                ocr_ms=None,
+                classify_ms=duration_ms,
+                extract_ms=None,
+                updated_at=pending.updated_at,
+            )
+            return
         self._storage.upsert_file_timings(
             job_id=job_id,
             file_id=file_id,
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 from app.domain.labels import Label, LabelExample
 from app.domain.schema_validation import validate_schema_config
 from app.domain.similarity import normalize_text_to_tokens
@@ -7,6 +9,7 @@ from app.ports.drive_port import DrivePort
 from app.ports.embeddings_port import EmbeddingsPort
 from app.ports.ocr_port import OCRPort
 from app.ports.storage_port import StoragePort
+from app.settings import OCR_WORKERS
 
 
 class LabelService:
@@ -48,22 +51,19 @@ class LabelService:
             labels = [label] if label is not None else []
         for label in labels:
             examples = self._storage.list_label_examples(label.label_id)
-            for example in examples:
-                ocr_text = ""
-                if job_id:
-                    job_ocr = self._storage.get_ocr_result(job_id, example.file_id)
-                    if job_ocr and job_ocr.text:
-                        ocr_text = job_ocr.text
-                if not ocr_text:
-                    image_bytes = self._drive.download_file_bytes(example.file_id)
-                    ocr_result = self._ocr.extract_text(image_bytes)
-                    ocr_text = ocr_result.text
-                embedding: list[float] | None = None
+            if OCR_WORKERS <= 1 or len(examples) <= 1:
+                ocr_texts = [self._example_ocr_text(example, job_id) for example in examples]
+            else:
+                with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+                    ocr_texts = list(
+                        executor.map(
+                            lambda example: self._example_ocr_text(example, job_id),
+                            examples,
+                        )
+                    )
+            embeddings = self._embed_texts(ocr_texts)
+            for example, ocr_text, embedding in zip(examples, ocr_texts, embeddings):
                 token_fingerprint: set[str] | None = None
-                try:
-                    embedding = self._embeddings.embed_text(ocr_text)
-                except Exception:
-                    embedding = None
                 if not embedding:
                     token_fingerprint = normalize_text_to_tokens(ocr_text)
                 self._storage.save_label_example_features(
@@ -72,3 +72,29 @@ class LabelService:
                     embedding if embedding else None,
                     token_fingerprint,
                 )
+
+    def _example_ocr_text(self, example: LabelExample, job_id: str | None) -> str:
+        if job_id:
+            job_ocr = self._storage.get_ocr_result(job_id, example.file_id)
+            if job_ocr and job_ocr.text:
+                return job_ocr.text
+        image_bytes = self._drive.download_file_bytes(example.file_id)
+        return self._ocr.extract_text(image_bytes).text
+
+    def _embed_texts(self, texts: list[str]) -> list[list[float] | None]:
+        if not texts:
+            return []
+        try:
+            embeddings = list(self._embeddings.embed_texts(texts))
+        except Exception:
+            embeddings = []
+        if len(embeddings) == len(texts):
+            return embeddings
+        # One bad input must not send the whole batch to token fingerprints.
+        return [self._embed_text(text) for text in texts]
+
+    def _embed_text(self, text: str) -> list[float] | None:
+        try:
+            return self._embeddings.embed_text(text)
+        except Exception:
+            return None
@@ -1,19 +1,49 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from threading import Lock
 
 from app.domain.label_fallback import (
     LabelFallbackCandidate,
     list_fallback_candidates,
-    normalize_labels_llm,
 )
 from app.domain.labels import NO_MATCH
-from app.domain.models import FileLabelOverride, LabelAssignment
+from app.domain.models import FileLabelOverride, LabelAssignment, OCRResult
 from app.ports.llm_port import LLMPort
 from app.ports.storage_port import StoragePort
-from app.settings import LLM_LABEL_MIN_CONFIDENCE, LLM_PROVIDER, OPENAI_API_KEY
+from app.settings import (
+    LLM_LABEL_MIN_CONFIDENCE,
+    LLM_MAX_OCR_CHARS,
+    LLM_PROVIDER,
+    LLM_WORKERS,
+    OPENAI_API_KEY,
+)
+
+
+_NUMERIC_TOKENS_HEADER = "NUMERIC_TOKENS\n"
+_WINDOW_GAP = "\n...\n"
+
+
+def _window_ocr_text(text: str, max_chars: int) -> str:
+    """Keep the head and tail of long OCR text plus the whole NUMERIC_TOKENS block."""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    numeric_block = ""
+    start = text.find(_NUMERIC_TOKENS_HEADER)
+    if start != -1:
+        end = text.find("\n\n", start)
+        end = len(text) if end == -1 else end
+        numeric_block = text[start:end]
+        text = text[:start] + text[end:]
+    budget = max_chars - len(_WINDOW_GAP) - (len(numeric_block) + 2 if numeric_block else 0)
+    if budget <= 0:
+        return (numeric_block or text)[:max_chars]
+    tail = budget // 3
+    windowed = text[: budget - tail] + _WINDOW_GAP + (text[-tail:] if tail else "")
+    return f"{windowed}\n\n{numeric_block}" if numeric_block else windowed
 
 
 @dataclass(frozen=True)
@@ -23,6 +53,14 @@ class LLMFallbackLabelResult:
     signals: list[str]
 
 
+@dataclass(frozen=True)
+class _FallbackJobContext:
+    candidates: list[LabelFallbackCandidate]
+    assignments: dict[str, LabelAssignment]
+    overrides: dict[str, FileLabelOverride]
+    llm_overrides: dict[str, str]
+
+
 class LLMFallbackLabelService:
     def __init__(
         self,
@@ -31,43 +69,69 @@ class LLMFallbackLabelService:
     ) -> None:
         self._storage = storage
         self._llm = llm
+        self._job_cache: dict[str, _FallbackJobContext] = {}
+        self._job_cache_lock = Lock()
+        self._candidates_key: tuple[tuple[str, str], ...] | None = None
+        self._candidates: list[LabelFallbackCandidate] = []
 
     def classify_unlabeled_files(self, job_id: str) -> None:
-        candidates = self._load_fallback_candidates()
-        if not candidates:
-            raise RuntimeError("No fallback labels configured (labels with non-empty llm).")
-        self._ensure_llm_configured()
-
-        assignments = {item.file_id: item for item in self._storage.list_file_label_assignments(job_id)}
-        overrides = {item.file_id: item for item in self._storage.list_file_label_overrides(job_id)}
-        llm_overrides = self._storage.list_llm_label_overrides(job_id)
-
+        self.reset_cache(job_id)
+        context = self._load_job_context(job_id)
+        ocr_results = self._storage.list_ocr_results(job_id)
+        payloads: list[tuple[str, str]] = []
         for file_ref in self._storage.get_job_files(job_id):
-            file_id = file_ref.file_id
-            self._classify_file_for_job(
-                job_id,
-                file_id,
-                candidates,
-                assignments,
-                overrides,
-                llm_overrides,
+            ocr_text = self._fallback_ocr_text(
+                job_id, file_ref.file_id, context, ocr_results
             )
+            if ocr_text:
+                payloads.append((file_ref.file_id, ocr_text))
+        results: dict[str, LLMFallbackLabelResult] = {}
+        if LLM_WORKERS <= 1 or len(payloads) <= 1:
+            for file_id, ocr_text in payloads:
+                results[file_id] = self._classify_file(ocr_text, context.candidates)
+        else:
+            # LLM round trips are independent and I/O-bound; storage writes stay serial.
+            with ThreadPoolExecutor(max_workers=LLM_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._classify_file, ocr_text, context.candidates): file_id
+                    for file_id, ocr_text in payloads
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        updated_at = datetime.now(timezone.utc).isoformat()
+        for file_id, _ in payloads:
+            self._save_result(job_id, file_id, results[file_id], updated_at)
 
     def classify_file(self, job_id: str, file_id: str) -> None:
+        self._classify_file_for_job(job_id, file_id, self._job_context(job_id))
+
+    def reset_cache(self, job_id: str) -> None:
+        """Drop the cached labels/assignments/overrides for a job after they change."""
+        with self._job_cache_lock:
+            self._job_cache.pop(job_id, None)
+
+    def _job_context(self, job_id: str) -> _FallbackJobContext:
+        with self._job_cache_lock:
+            context = self._job_cache.get(job_id)
+            if context is None:
+                context = self._load_job_context(job_id)
+                self._job_cache[job_id] = context
+            return context
+
+    def _load_job_context(self, job_id: str) -> _FallbackJobContext:
         candidates = self._load_fallback_candidates()
         if not candidates:
             raise RuntimeError("No fallback labels configured (labels with non-empty llm).")
         self._ensure_llm_configured()
-        assignments = {item.file_id: item for item in self._storage.list_file_label_assignments(job_id)}
-        overrides = {item.file_id: item for item in self._storage.list_file_label_overrides(job_id)}
-        llm_overrides = self._storage.list_llm_label_overrides(job_id)
-        self._classify_file_for_job(
-            job_id,
-            file_id,
-            candidates,
-            assignments,
-            overrides,
-            llm_overrides,
+        return _FallbackJobContext(
+            candidates=candidates,
+            assignments={
+                item.file_id: item for item in self._storage.list_file_label_assignments(job_id)
+            },
+            overrides={
+                item.file_id: item for item in self._storage.list_file_label_overrides(job_id)
+            },
+            llm_overrides=self._storage.list_llm_label_overrides(job_id),
         )
 
     def _ensure_llm_configured(self) -> None:
@@ -79,23 +143,39 @@ class LLMFallbackLabelService:
         self,
         job_id: str,
         file_id: str,
-        candidates: list[LabelFallbackCandidate],
-        assignments: dict[str, LabelAssignment],
-        overrides: dict[str, FileLabelOverride],
-        llm_overrides: dict[str, str],
+        context: _FallbackJobContext,
     ) -> None:
-        if file_id in overrides:
+        ocr_text = self._fallback_ocr_text(job_id, file_id, context)
+        if not ocr_text:
             return
-        if file_id in llm_overrides:
-            return
-        assignment = assignments.get(file_id)
+        result = self._classify_file(ocr_text, context.candidates)
+        self._save_result(job_id, file_id, result, datetime.now(timezone.utc).isoformat())
+
+    def _fallback_ocr_text(
+        self,
+        job_id: str,
+        file_id: str,
+        context: _FallbackJobContext,
+        ocr_results: dict[str, OCRResult] | None = None,
+    ) -> str | None:
+        if file_id in context.overrides:
+            return None
+        if file_id in context.llm_overrides:
+            return None
+        assignment = context.assignments.get(file_id)
         if assignment is not None and assignment.status != NO_MATCH:
-            return
-        ocr = self._storage.get_ocr_result(job_id, file_id)
+            return None
+        if ocr_results is not None:
+            ocr = ocr_results.get(file_id)
+        else:
+            ocr = self._storage.get_ocr_result(job_id, file_id)
         if ocr is None or not ocr.text:
-            return
-        result = self._classify_file(ocr.text, candidates)
-        updated_at = datetime.now(timezone.utc).isoformat()
+            return None
+        return ocr.text
+
+    def _save_result(
+        self, job_id: str, file_id: str, result: LLMFallbackLabelResult, updated_at: str
+    ) -> None:
         self._storage.upsert_llm_label_classification(
             job_id,
             file_id,
@@ -109,7 +189,9 @@ class LLMFallbackLabelService:
         self, ocr_text: str, candidates: list[LabelFallbackCandidate]
     ) -> LLMFallbackLabelResult:
         try:
-            classification = self._llm.classify_label(ocr_text, candidates)
+            classification = self._llm.classify_label(
+                _window_ocr_text(ocr_text, LLM_MAX_OCR_CHARS), candidates
+            )
             confidence = float(classification.confidence)
             label_name = classification.label_name
             signals = list(classification.signals or [])
@@ -137,10 +219,11 @@ class LLMFallbackLabelService:
 
     def _load_fallback_candidates(self) -> list[LabelFallbackCandidate]:
         labels = self._storage.list_labels(include_inactive=False)
-        label_dicts = [
-            {"name": label.name, "llm": label.llm}
-            for label in labels
-            if label.llm and label.name
-        ]
-        label_dicts = normalize_labels_llm(label_dicts)
-        return list_fallback_candidates(label_dicts)
+        key = tuple((label.name, label.llm) for label in labels if label.llm and label.name)
+        if key != self._candidates_key:
+            # list_fallback_candidates normalizes llm text itself; no separate pass.
+            self._candidates = list_fallback_candidates(
+                [{"name": name, "llm": llm} for name, llm in key]
+            )
+            self._candidates_key = key
+        return list(self._candidates)
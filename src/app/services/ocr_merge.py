@@ -1,11 +1,33 @@
 from __future__ import annotations
 
 import re
+import unicodedata
+
+_NUMERIC_RUN_RE = re.compile(r"(?:\d[\s\-]?){6,}")
+_SIX_DIGITS_RE = re.compile(r"(?:\D*\d){6}")
+# Blocks holding superscripts, fractions, circled numbers and similar forms
+# that NFKC would expand into decimal digits.
+_DIGIT_FORM_BLOCKS = (
+    (0x00A0, 0x00FF),
+    (0x2070, 0x218F),
+    (0x2460, 0x24FF),
+    (0x3200, 0x33FF),
+    (0x1F100, 0x1F1FF),
+)
+# Kept as-is so numeric extraction never reads "12345²" or "½" as new digits.
+_DIGIT_FORMS = "".join(
+    ch
+    for start, end in _DIGIT_FORM_BLOCKS
+    for ch in map(chr, range(start, end + 1))
+    if not ch.isdecimal()
+    and any(part.isdecimal() for part in unicodedata.normalize("NFKC", ch))
+)
+_DIGIT_FORMS_RE = re.compile(f"([{re.escape(_DIGIT_FORMS)}]+)")
 
 
 def merge_ocr_text(raw_text: str, preprocessed_text: str) -> str:
-    raw_text = raw_text or ""
-    preprocessed_text = preprocessed_text or ""
+    raw_text = normalize_ocr_text(raw_text)
+    preprocessed_text = normalize_ocr_text(preprocessed_text)
     parts: list[str] = []
 
     if preprocessed_text.strip():
@@ -13,37 +35,49 @@ def merge_ocr_text(raw_text: str, preprocessed_text: str) -> str:
     if raw_text.strip():
         parts.append("RAW_OCR\n" + raw_text.strip())
 
-    numeric_tokens = _extract_numeric_tokens(raw_text, preprocessed_text)
+    numeric_tokens, numeric_lines = _extract_numeric(raw_text, preprocessed_text)
     if numeric_tokens:
         parts.append("NUMERIC_TOKENS\n" + " ".join(numeric_tokens))
-
-    numeric_lines = _extract_numeric_lines(raw_text)
     if numeric_lines:
         parts.append("RAW_NUMERIC_LINES\n" + "\n".join(numeric_lines))
 
     return "\n\n".join(parts).strip()
 
 
-def _extract_numeric_tokens(*texts: str) -> list[str]:
+def normalize_ocr_text(text: str | None) -> str:
+    """NFKC-fold (except digit-like forms) and collapse spaces per line, keeping line breaks."""
+    if not text:
+        return ""
+    # re.split with a capture group puts the protected runs at odd indexes.
+    text = "".join(
+        part if index % 2 else unicodedata.normalize("NFKC", part)
+        for index, part in enumerate(_DIGIT_FORMS_RE.split(text))
+    )
+    return "\n".join(" ".join(line.split()) for line in text.splitlines())
+
+
+def _extract_numeric(raw_text: str, preprocessed_text: str) -> tuple[list[str], list[str]]:
+    """Return de-duplicated 6+ digit tokens and raw lines holding 6+ digits, in one raw scan."""
     seen: set[str] = set()
     tokens: list[str] = []
-    for text in texts:
-        for match in re.findall(r"(?:\\d[\\s\\-]?){6,}", text or ""):
-            compact = re.sub(r"\\D", "", match)
-            if len(compact) < 6 or compact in seen:
-                continue
-            seen.add(compact)
-            tokens.append(compact)
-    return tokens
-
-
-def _extract_numeric_lines(text: str) -> list[str]:
-    lines = []
-    for raw_line in (text or "").splitlines():
-        digits = re.sub(r"\\D", "", raw_line)
-        if len(digits) < 6:
-            continue
-        line = " ".join(raw_line.split())
-        if line:
+    lines: list[str] = []
+    # Lines arrive normalized by merge_ocr_text, so no per-line re-spacing.
+    for line in raw_text.splitlines():
+        _collect_numeric_tokens(line, seen, tokens)
+        # Stops at the sixth digit instead of building a digits-only copy.
+        if _SIX_DIGITS_RE.match(line) is not None:
             lines.append(line)
-    return lines
+    for line in preprocessed_text.splitlines():
+        _collect_numeric_tokens(line, seen, tokens)
+    return tokens, lines
+
+
+def _collect_numeric_tokens(line: str, seen: set[str], tokens: list[str]) -> None:
+    for match in _NUMERIC_RUN_RE.findall(line):
+        # Normalized lines only separate digits with single spaces or hyphens,
+        # and the run pattern already guarantees six digits.
+        compact = match.replace(" ", "").replace("-", "")
+        if compact in seen:
+            continue
+        seen.add(compact)
+        tokens.append(compact)
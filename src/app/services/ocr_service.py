@@ -2,15 +2,30 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from time import perf_counter
 
+from app.domain.file_order import order_job_files
+from app.domain.models import FileTimingRecord, OCRResult, OCRTextMeta
 from app.ports.drive_port import DrivePort
 from app.ports.ocr_port import OCRPort
 from app.ports.storage_port import StoragePort
 from app.settings import OCR_WORKERS
 
 
+@dataclass(slots=True)
+class _OCRRow:
+    file_id: str
+    name: str
+    mime_type: str
+    position: int = 0
+
+
+def _is_ocr_mime(mime_type: str | None) -> bool:
+    return mime_type == "application/pdf" or (mime_type or "").startswith("image/")
+
+
 class OCRService:
     def __init__(self, drive: DrivePort, ocr: OCRPort, storage: StoragePort) -> None:
         self._drive = drive
@@ -23,56 +38,43 @@ class OCRService:
         file_ids: list[str] | None = None,
         progress_callback: Callable[[dict], None] | None = None,
     ) -> None:
-        job_files = self._storage.get_job_files(job_id)
+        job_files = order_job_files(self._storage.get_job_files(job_id))
         file_rows = [
-            {
-                "file_id": file_ref.file_id,
-                "name": file_ref.name,
-                "mime_type": file_ref.mime_type,
-                "sort_index": file_ref.sort_index if file_ref.sort_index is not None else index,
-            }
-            for index, file_ref in enumerate(job_files)
+            _OCRRow(file_id=file_ref.file_id, name=file_ref.name, mime_type=file_ref.mime_type)
+            for file_ref in job_files
         ]
         if file_ids is None:
             target_rows = file_rows
         else:
-            target_ids = {file_id for file_id in file_ids}
-            target_rows = [row for row in file_rows if row["file_id"] in target_ids]
+            target_ids = set(file_ids)
+            target_rows = [row for row in file_rows if row.file_id in target_ids]
 
-        image_rows = [
-            row
-            for row in target_rows
-            if str(row.get("mime_type", "")).startswith("image/")
-            or str(row.get("mime_type", "")) == "application/pdf"
-        ]
-        ordered_rows = sorted(
-            image_rows,
-            key=lambda row: (row["sort_index"], row["name"], row["file_id"]),
-        )
+        # Rows keep the job order from order_job_files; filtering preserves it.
+        ordered_rows = [row for row in target_rows if _is_ocr_mime(row.mime_type)]
         skipped_cached = 0
         if file_ids is None:
             filtered_rows = []
-            get_ocr = getattr(self._storage, "get_ocr_result", None)
+            list_ocr_meta = getattr(self._storage, "list_ocr_text_meta", None)
+            # One query for the whole job instead of a lookup per file.
+            ocr_meta = list_ocr_meta(job_id) if callable(list_ocr_meta) else {}
+            if not isinstance(ocr_meta, dict):
+                ocr_meta = {}
             for row in ordered_rows:
-                if callable(get_ocr):
-                    existing = get_ocr(job_id, row["file_id"])
-                    text = getattr(existing, "text", None)
-                    if isinstance(text, str) and text.strip():
-                        skipped_cached += 1
-                        self._emit_progress(
-                            progress_callback,
-                            stage="skip_cached",
-                            job_id=job_id,
-                            file_id=row["file_id"],
-                            file_name=row["name"],
-                        )
-                        continue
+                existing = ocr_meta.get(row.file_id)
+                if isinstance(existing, OCRTextMeta) and existing.has_text:
+                    skipped_cached += 1
+                    self._emit_progress(
+                        progress_callback,
+                        stage="skip_cached",
+                        job_id=job_id,
+                        file_id=row.file_id,
+                        file_name=row.name,
+                    )
+                    continue
                 filtered_rows.append(row)
             ordered_rows = filtered_rows
-        ordered_rows = [
-            {**row, "position": position}
-            for position, row in enumerate(ordered_rows, start=1)
-        ]
+        for position, row in enumerate(ordered_rows, start=1):
+            row.position = position
         run_mode = "serial" if OCR_WORKERS <= 1 or len(ordered_rows) <= 1 else "parallel"
         total = len(ordered_rows)
         self._emit_progress(
@@ -94,11 +96,13 @@ class OCRService:
             )
             return
         processed_count = 0
+        # One timestamp per run; per-file durations come from perf_counter.
+        updated_at = datetime.now(timezone.utc).isoformat()
         if run_mode == "serial":
             for row in ordered_rows:
-                file_id = row["file_id"]
-                file_name = row["name"]
-                row_position = row["position"]
+                file_id = row.file_id
+                file_name = row.name
+                row_position = row.position
                 self._emit_progress(
                     progress_callback,
                     stage="download_started",
@@ -157,7 +161,7 @@ class OCRService:
                     ocr_ms=duration_ms,
                     classify_ms=None,
                     extract_ms=None,
-                    updated_at_iso=datetime.now(timezone.utc).isoformat(),
+                    updated_at_iso=updated_at,
                 )
                 processed_count += 1
                 self._emit_progress(
@@ -181,62 +185,50 @@ class OCRService:
             )
             return
 
-        payloads: list[tuple[str, str, bytes, int]] = []
-        for row in ordered_rows:
-            file_id = row["file_id"]
-            file_name = row["name"]
-            row_position = row["position"]
-            self._emit_progress(
-                progress_callback,
-                stage="download_started",
-                job_id=job_id,
-                file_id=file_id,
-                file_name=file_name,
-                index=row_position,
-                total=total,
-            )
-            image_bytes = self._drive.download_file_bytes(file_id)
-            self._emit_progress(
-                progress_callback,
-                stage="download_done",
-                job_id=job_id,
-                file_id=file_id,
-                file_name=file_name,
-                bytes_len=len(image_bytes),
-                index=row_position,
-                total=total,
-            )
-            payloads.append((file_id, file_name, image_bytes, row_position))
-
-        results: dict[str, object] = {}
-        timings_ms: dict[str, int] = {}
         errors: list[tuple[str, str, Exception]] = []
+        completed: list[tuple[_OCRRow, OCRResult, int]] = []
+        # Each worker downloads then OCRs one file, so at most OCR_WORKERS files are
+        # held in memory and downloads overlap OCR. Progress is emitted from this thread.
         with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
-            future_map = {
-                executor.submit(self._ocr.extract_text, image_bytes): (
-                    file_id,
-                    file_name,
-                    row_position,
-                    perf_counter(),
-                )
-                for file_id, file_name, image_bytes, row_position in payloads
-            }
-            for file_id, file_name, _, row_position in payloads:
+            future_map = {}
+            for row in ordered_rows:
                 self._emit_progress(
                     progress_callback,
-                    stage="ocr_started",
+                    stage="download_started",
                     job_id=job_id,
-                    file_id=file_id,
-                    file_name=file_name,
-                    index=row_position,
+                    file_id=row.file_id,
+                    file_name=row.name,
+                    index=row.position,
                     total=total,
                 )
+                future = executor.submit(self._download_and_extract, row.file_id)
+                future_map[future] = row
             for future in as_completed(future_map):
-                file_id, file_name, row_position, started = future_map[future]
+                row = future_map[future]
+                file_id, file_name, row_position = row.file_id, row.name, row.position
                 try:
-                    result = future.result()
-                    results[file_id] = result
-                    timings_ms[file_id] = int((perf_counter() - started) * 1000)
+                    result, bytes_len, duration_ms = future.result()
+                    self._emit_progress(
+                        progress_callback,
+                        stage="download_done",
+                        job_id=job_id,
+                        file_id=file_id,
+                        file_name=file_name,
+                        bytes_len=bytes_len,
+                        index=row_position,
+                        total=total,
+                    )
+                    # Workers cannot emit, so ocr_started is replayed here to keep the
+                    # per-file stage sequence identical to the serial branch.
+                    self._emit_progress(
+                        progress_callback,
+                        stage="ocr_started",
+                        job_id=job_id,
+                        file_id=file_id,
+                        file_name=file_name,
+                        index=row_position,
+                        total=total,
+                    )
                     self._emit_progress(
                         progress_callback,
                         stage="ocr_done",
@@ -259,6 +251,51 @@ class OCRService:
                         total=total,
                         message=str(exc),
                     )
+                    continue
+                completed.append((row, result, duration_ms))
+
+        # One transaction per table for the whole batch instead of two per file;
+        # successes are stored before the first failure is raised.
+        if completed:
+            for row, _, _ in completed:
+                self._emit_progress(
+                    progress_callback,
+                    stage="save_started",
+                    job_id=job_id,
+                    file_id=row.file_id,
+                    file_name=row.name,
+                    index=row.position,
+                    total=total,
+                )
+            self._storage.bulk_save_ocr_results(
+                job_id, {row.file_id: result for row, result, _ in completed}
+            )
+            self._storage.bulk_upsert_file_timings(
+                [
+                    FileTimingRecord(
+                        job_id=job_id,
+                        file_id=row.file_id,
+                        ocr_ms=duration_ms,
+                        classify_ms=None,
+                        extract_ms=None,
+                        updated_at=updated_at,
+                    )
+                    for row, _, duration_ms in completed
+                ]
+            )
+            for row, _, duration_ms in completed:
+                processed_count += 1
+                self._emit_progress(
+                    progress_callback,
+                    stage="save_done",
+                    job_id=job_id,
+                    file_id=row.file_id,
+                    file_name=row.name,
+                    duration_ms=duration_ms,
+                    processed=processed_count,
+                    total=total,
+                    index=row.position,
+                )
 
         if errors:
             file_id, file_name, exc = errors[0]
@@ -272,45 +309,6 @@ class OCRService:
             )
             raise RuntimeError(f"OCR failed for file {file_id}") from exc
 
-        for row in ordered_rows:
-            file_id = row["file_id"]
-            file_name = row["name"]
-            row_position = row["position"]
-            result = results.get(file_id)
-            if result is None:
-                continue
-            self._emit_progress(
-                progress_callback,
-                stage="save_started",
-                job_id=job_id,
-                file_id=file_id,
-                file_name=file_name,
-                index=row_position,
-                total=total,
-            )
-            self._storage.save_ocr_result(job_id, file_id, result)
-            duration_ms = timings_ms.get(file_id)
-            if duration_ms is not None:
-                self._storage.upsert_file_timings(
-                    job_id=job_id,
-                    file_id=file_id,
-                    ocr_ms=duration_ms,
-                    classify_ms=None,
-                    extract_ms=None,
-                    updated_at_iso=datetime.now(timezone.utc).isoformat(),
-                )
-            processed_count += 1
-            self._emit_progress(
-                progress_callback,
-                stage="save_done",
-                job_id=job_id,
-                file_id=file_id,
-                file_name=file_name,
-                duration_ms=duration_ms,
-                processed=processed_count,
-                total=total,
-                index=row_position,
-            )
         self._emit_progress(
             progress_callback,
             stage="complete",
@@ -320,6 +318,13 @@ class OCRService:
             skipped_cached=skipped_cached,
         )
 
+    def _download_and_extract(self, file_id: str) -> tuple[OCRResult, int, int]:
+        started = perf_counter()
+        image_bytes = self._drive.download_file_bytes(file_id)
+        bytes_len = len(image_bytes)
+        result = self._ocr.extract_text(image_bytes)
+        return result, bytes_len, int((perf_counter() - started) * 1000)
+
     @staticmethod
     def _emit_progress(
         callback: Callable[[dict], None] | None,
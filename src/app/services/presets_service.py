@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from app.domain import json_codec
 from app.ports.storage_port import StoragePort
 
 
@@ -17,7 +18,7 @@ class PresetsService:
         if not presets_path.exists():
             return False
         try:
-            data = json.loads(presets_path.read_text())
+            data = json_codec.loads(presets_path.read_bytes())
         except json.JSONDecodeError as exc:
             raise RuntimeError("Failed to load presets.json") from exc
         if not isinstance(data, list):
@@ -1,11 +1,73 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
 
+from app.domain import json_codec
+from app.domain.models import (
+    ExtractionRecord,
+    FileTimingRecord,
+    Job,
+    JobFileRecord,
+    LabelAssignment,
+    LLMLabelClassification,
+)
 from app.domain.report_v2 import FinalReportFileBlock, FinalReportModel, render_report_v2
 from app.ports.drive_port import DrivePort
 from app.ports.storage_port import StoragePort
 from app.services.time_utils import local_date_yyyy_mm_dd, now_local_iso
+from app.settings import REPORT_FETCH_WORKERS
+
+
+@lru_cache(maxsize=4096)
+def _parse_json_dict(value: str) -> dict | None:
+    """Parse a stored JSON object once per distinct string; callers must not mutate it."""
+    try:
+        parsed = json_codec.loads(value)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+@lru_cache(maxsize=1024)
+def _schema_keys(schema_json: str) -> tuple[str, ...]:
+    """Field keys for a stored schema; files sharing a label share the schema text."""
+    schema = _parse_json_dict(schema_json)
+    if not schema:
+        return ()
+    properties = schema.get("properties")
+    if isinstance(properties, dict) and properties:
+        return tuple(properties)
+    return tuple(schema)
+
+
+@dataclass(frozen=True)
+class _ReportLookups:
+    """Job-wide rows fetched once per report instead of per file."""
+
+    extractions: dict[str, ExtractionRecord]
+    timings: dict[str, FileTimingRecord]
+    label_overrides: dict[str, str]
+    assignments: dict[str, LabelAssignment]
+    llm_overrides: dict[str, str]
+    llm_classifications: dict[str, LLMLabelClassification]
+    # Parsed (fields, schema) per file, filled on first use.
+    payloads: dict[str, tuple[dict | None, dict | None]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _ReportContext:
+    """Everything a preview or summary needs for one job, loaded once."""
+
+    job: Job
+    job_files: list[JobFileRecord]
+    applied_renames: dict[str, str]
+    lookups: _ReportLookups
+    final_labels: dict[str, str]
 
 
 class ReportService:
@@ -14,85 +76,126 @@ class ReportService:
         self._storage = storage
 
     def preview_report(self, job_id: str | None = None) -> str:
+        return self._render_report(self._build_report_context(self._get_job_or_raise(job_id)))
+
+    def write_report(self, job_id: str | None = None) -> str:
         job = self._get_job_or_raise(job_id)
-        job_files = self._storage.get_job_files_full(job.job_id)
-        applied_renames = self._applied_renames_map(job.job_id)
-        file_rows: list[dict] = []
-        for index, file_ref in enumerate(job_files):
-            final_name = applied_renames.get(file_ref.file_id, file_ref.name)
-            fields, schema = self._get_extraction_payload(job.job_id, file_ref.file_id)
-            timings = self._get_file_timings(job.job_id, file_ref.file_id)
-            file_rows.append(
-                {
-                    "index": index,
-                    "sort_index": file_ref.sort_index if file_ref.sort_index is not None else index,
-                    "final_name": final_name,
-                    "file_id": file_ref.file_id,
-                    "final_label": self._get_final_label(job.job_id, file_ref.file_id),
-                    "fields": fields,
-                    "schema": schema,
-                    "timings_ms": timings,
-                }
-            )
-        ordered_files = sorted(
-            file_rows,
-            key=lambda item: (
-                item["sort_index"],
-                item["final_name"],
-                item["file_id"],
+        content = self._render_report(self._build_report_context(job))
+        filename = self._report_filename(job.created_at)
+        report_file_id = self._drive.upload_text_file(job.folder_id, filename, content)
+        return report_file_id
+
+    def get_final_report_summary(self, job_id: str | None = None) -> dict[str, int]:
+        return self._summarize(self._build_report_context(self._get_job_or_raise(job_id)))
+
+    def _build_report_context(self, job: Job) -> _ReportContext:
+        job_id = job.job_id
+        storage = self._storage
+        rows = self._fetch_rows(
+            {
+                "job_files": lambda: storage.get_job_files_full(job_id),
+                "applied_renames": lambda: storage.list_applied_renames(job_id),
+                "extractions": lambda: storage.list_extractions(job_id),
+                "timings": lambda: storage.list_file_timings(job_id),
+                "label_overrides": lambda: storage.list_file_label_overrides(job_id),
+                "assignments": lambda: storage.list_file_label_assignments(job_id),
+                "llm_overrides": lambda: storage.list_llm_label_overrides(job_id),
+                "llm_classifications": lambda: storage.list_llm_label_classifications(job_id),
+            }
+        )
+        job_files = rows["job_files"]
+        lookups = _ReportLookups(
+            extractions=rows["extractions"],
+            timings=rows["timings"],
+            label_overrides={
+                item.file_id: item.label_id for item in rows["label_overrides"] if item.label_id
+            },
+            assignments={item.file_id: item for item in rows["assignments"]},
+            llm_overrides=rows["llm_overrides"],
+            llm_classifications=rows["llm_classifications"],
+        )
+        return _ReportContext(
+            job=job,
+            job_files=job_files,
+            applied_renames={item.file_id: item.new_name for item in rows["applied_renames"]},
+            lookups=lookups,
+            final_labels=self._resolve_final_labels(
+                [file_ref.file_id for file_ref in job_files], lookups
             ),
         )
-        blocks = [
-            FinalReportFileBlock(
-                index=index + 1,
-                final_name=item["final_name"],
-                file_id=item["file_id"],
-                final_label=item["final_label"],
-                extracted_fields=item["fields"],
-                schema=item["schema"],
-                timings_ms=item["timings_ms"],
+
+    @staticmethod
+    def _fetch_rows(fetchers: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+        if REPORT_FETCH_WORKERS <= 1:
+            return {name: fetch() for name, fetch in fetchers.items()}
+        # The job-wide reads are independent; overlap them when storage has latency.
+        with ThreadPoolExecutor(max_workers=min(REPORT_FETCH_WORKERS, len(fetchers))) as executor:
+            futures = {name: executor.submit(fetch) for name, fetch in fetchers.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _render_report(self, context: _ReportContext) -> str:
+        lookups = context.lookups
+        applied_renames = context.applied_renames
+        # Sort once on plain tuples, then build each block directly in final order.
+        ordered = sorted(
+            (
+                (
+                    file_ref.sort_index if file_ref.sort_index is not None else index,
+                    applied_renames.get(file_ref.file_id, file_ref.name),
+                    file_ref.file_id,
+                )
+                for index, file_ref in enumerate(context.job_files)
+            )
+        )
+        blocks: list[FinalReportFileBlock] = []
+        for position, (_, final_name, file_id) in enumerate(ordered, start=1):
+            fields, schema = self._get_extraction_payload(file_id, lookups)
+            blocks.append(
+                FinalReportFileBlock(
+                    index=position,
+                    final_name=final_name,
+                    file_id=file_id,
+                    final_label=context.final_labels[file_id],
+                    extracted_fields=fields,
+                    schema=schema,
+                    timings_ms=self._get_file_timings(lookups.timings.get(file_id)),
+                )
             )
-            for index, item in enumerate(ordered_files)
-        ]
         generated_at_local_iso = now_local_iso()
         model = FinalReportModel(
-            job_id=job.job_id,
-            folder_id=job.folder_id,
+            job_id=context.job.job_id,
+            folder_id=context.job.folder_id,
             generated_at_local_iso=generated_at_local_iso,
             files=blocks,
         )
         return render_report_v2(model)
 
-    def write_report(self, job_id: str | None = None) -> str:
-        job = self._get_job_or_raise(job_id)
-        content = self.preview_report(job.job_id)
-        filename = self._report_filename(job.created_at)
-        report_file_id = self._drive.upload_text_file(job.folder_id, filename, content)
-        return report_file_id
-
-    def get_final_report_summary(self, job_id: str | None = None) -> dict[str, int]:
-        job = self._get_job_or_raise(job_id)
-        job_files = self._storage.get_job_files_full(job.job_id)
-        applied_renames = self._applied_renames_map(job.job_id)
-        renamed_count = sum(
-            1 for file_ref in job_files if file_ref.file_id in applied_renames
-        )
-        total_count = len(job_files)
-        skipped_count = max(total_count - renamed_count, 0)
+    def _summarize(self, context: _ReportContext) -> dict[str, int]:
+        applied_renames = context.applied_renames
+        final_labels = context.final_labels
+        lookups = context.lookups
+        assignments = lookups.assignments
+        renamed_count = 0
         needs_review_count = 0
-        for file_ref in job_files:
-            final_label = self._get_final_label(job.job_id, file_ref.file_id)
-            assignment = self._storage.get_file_label_assignment(job.job_id, file_ref.file_id)
+        # One pass over the files; every lookup is an in-memory dict get.
+        for file_ref in context.job_files:
+            file_id = file_ref.file_id
+            if file_id in applied_renames:
+                renamed_count += 1
+            assignment = assignments.get(file_id)
             status = assignment.status if assignment else None
-            fields, schema = self._get_extraction_payload(job.job_id, file_ref.file_id)
-            if final_label == "UNLABELED" or status == "AMBIGUOUS":
+            if final_labels[file_id] == "UNLABELED" or status == "AMBIGUOUS":
                 needs_review_count += 1
                 continue
-            if self._fields_have_unknown(fields, schema):
+            # Only files that could pass review need their extraction parsed.
+            fields, _ = self._get_extraction_payload(file_id, lookups)
+            # Payload fields are already projected onto the schema keys.
+            if self._fields_have_unknown(fields):
                 needs_review_count += 1
+        total_count = len(context.job_files)
         return {
             "renamed": renamed_count,
-            "skipped": skipped_count,
+            "skipped": max(total_count - renamed_count, 0),
             "needs_review": needs_review_count,
             "total": total_count,
         }
@@ -114,43 +217,67 @@ class ReportService:
         return self.get_final_report_summary(job_id)
 
     def _get_extraction_payload(
-        self, job_id: str, file_id: str
+        self, file_id: str, lookups: _ReportLookups
+    ) -> tuple[dict | None, dict | None]:
+        payload = lookups.payloads.get(file_id)
+        if payload is None:
+            payload = self._parse_extraction(lookups.extractions.get(file_id))
+            lookups.payloads[file_id] = payload
+        return payload
+
+    def _parse_extraction(
+        self, extraction: ExtractionRecord | None
     ) -> tuple[dict | None, dict | None]:
-        extraction = self._storage.get_extraction(job_id, file_id)
         if extraction is None:
-            return self._fallback_fields_schema(None, None)
+            return self._fallback_fields_schema(None, None, ())
         fields_json = extraction.fields_json
         schema_json = extraction.schema_json
         fields_payload = self._load_json_dict(fields_json)
         fields = self._extract_fields(fields_payload)
         schema = self._load_json_dict(schema_json)
-        return self._fallback_fields_schema(fields, schema)
-
-    def _get_final_label(self, job_id: str, file_id: str) -> str:
-        override_id = self._storage.get_file_label_override(job_id, file_id)
-        if override_id:
-            label = self._storage.get_label(override_id)
-            if label is not None:
-                return label.name
-        assignment = self._storage.get_file_label_assignment(job_id, file_id)
-        if assignment and assignment.label_id:
-            label = self._storage.get_label(assignment.label_id)
-            if label is not None:
-                return label.name
-        llm_override = self._storage.get_llm_label_override(job_id, file_id)
-        if llm_override:
-            return llm_override
-        llm_classification = self._storage.get_llm_label_classification(job_id, file_id)
-        label_name = llm_classification.label_name if llm_classification else None
-        if label_name:
-            return label_name
-        return "UNLABELED"
-
-    def _applied_renames_map(self, job_id: str) -> dict[str, str]:
-        return {item.file_id: item.new_name for item in self._storage.list_applied_renames(job_id)}
-
-    def _get_file_timings(self, job_id: str, file_id: str) -> dict[str, int | None]:
-        record = self._storage.get_file_timings(job_id, file_id)
+        keys = _schema_keys(schema_json) if schema else ()
+        return self._fallback_fields_schema(fields, schema, keys)
+
+    def _resolve_final_labels(
+        self, file_ids: list[str], lookups: _ReportLookups
+    ) -> dict[str, str]:
+        label_ids = {
+            label_id
+            for label_id in (
+                *lookups.label_overrides.values(),
+                *(item.label_id for item in lookups.assignments.values()),
+            )
+            if label_id
+        }
+        # One query for every label the job references, however many files share it.
+        names = {
+            label.label_id: label.name
+            for label in self._storage.list_labels_by_ids(sorted(label_ids))
+        }
+        # Layer each source from lowest to highest precedence, so later layers win:
+        # LLM classification < LLM override < assignment < manual override.
+        resolved: dict[str, str] = {
+            file_id: item.label_name
+            for file_id, item in lookups.llm_classifications.items()
+            if item.label_name
+        }
+        resolved.update(
+            (file_id, name) for file_id, name in lookups.llm_overrides.items() if name
+        )
+        resolved.update(
+            (file_id, names[item.label_id])
+            for file_id, item in lookups.assignments.items()
+            if item.label_id in names
+        )
+        resolved.update(
+            (file_id, names[label_id])
+            for file_id, label_id in lookups.label_overrides.items()
+            if label_id in names
+        )
+        return {file_id: resolved.get(file_id, "UNLABELED") for file_id in file_ids}
+
+    @staticmethod
+    def _get_file_timings(record: FileTimingRecord | None) -> dict[str, int | None]:
         if record is None:
             return {"ocr_ms": None, "classify_ms": None, "extract_ms": None}
         return {
@@ -163,20 +290,14 @@ class ReportService:
     def _load_json_dict(value: str | None) -> dict | None:
         if not value:
             return None
-        try:
-            parsed = json.loads(value)
-        except json.JSONDecodeError:
-            return None
-        return parsed if isinstance(parsed, dict) else None
+        # Extraction rows rarely change between report previews; reuse the parse.
+        return _parse_json_dict(value)
 
     @staticmethod
     def _fallback_fields_schema(
-        fields: dict | None, schema: dict | None
+        fields: dict | None, schema: dict | None, keys: tuple[str, ...]
     ) -> tuple[dict | None, dict | None]:
         if isinstance(schema, dict) and schema:
-            keys = ReportService._schema_field_keys(schema)
-            if not keys:
-                keys = list(schema.keys())
             if not isinstance(fields, dict) or not fields:
                 fields = {key: None for key in keys}
             else:
@@ -187,24 +308,21 @@ class ReportService:
         return fields, None
 
     @staticmethod
-    def _fields_have_unknown(fields: dict | None, schema: dict | None) -> bool:
+    def _fields_have_unknown(fields: dict | None) -> bool:
         if not isinstance(fields, dict) or not fields:
             return True
-        if isinstance(schema, dict) and schema:
-            keys = ReportService._schema_field_keys(schema)
-            if not keys:
-                keys = list(schema.keys())
-        else:
-            keys = list(fields.keys())
-        for key in keys:
-            value = fields.get(key)
+        for value in fields.values():
             if value is None:
                 return True
-            if isinstance(value, str) and not value.strip():
-                return True
-            if isinstance(value, list) and not any(str(item).strip() for item in value):
-                return True
-            if isinstance(value, dict) and not value:
+            # Values come from JSON, so exact type checks match what isinstance would.
+            value_type = type(value)
+            if value_type is str:
+                if not value.strip():
+                    return True
+            elif value_type is list:
+                if not any(str(item).strip() for item in value):
+                    return True
+            elif value_type is dict and not value:
                 return True
         return False
 
@@ -215,10 +333,3 @@ class ReportService:
         if isinstance(value.get("fields"), dict):
             return value["fields"]
         return value
-
-    @staticmethod
-    def _schema_field_keys(schema: dict) -> list[str]:
-        properties = schema.get("properties")
-        if isinstance(properties, dict):
-            return list(properties.keys())
-        return list(schema.keys())
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+from collections import defaultdict
+from functools import lru_cache
 
+from app.domain import json_codec
 from app.domain.schema_builder import (
     build_instruction_from_example,
     infer_schema_from_example,
@@ -11,10 +15,59 @@ from app.ports.llm_port import LLMPort
 from app.ports.storage_port import StoragePort
 
 
+# Request schema and guidance stay byte-identical across calls; per-call hints are appended
+# after them so the shared text forms a stable prompt prefix.
+_SCHEMA_REQUEST: dict = {
+    "type": "object",
+    "properties": {
+        "schema": {"type": "object"},
+        "instructions": {"type": "string"},
+    },
+    "required": ["schema", "instructions"],
+    "additionalProperties": False,
+}
+
+_OCR_SCHEMA_GUIDANCE = (
+    "Generate a document extraction JSON schema from OCR context. "
+    "Do not copy OCR noise or random tokens as field names. "
+    "Prefer fields that are relevant to official/business documents: "
+    "name, address, ID/number, date, status, amount, parties, and registry/license metadata. "
+    "Use concise English snake_case keys only. Limit the schema to at most 15 fields. "
+    "The schema must be a JSON schema object with type, properties, required, and "
+    "additionalProperties=false. Use boolean only for true/false flags; otherwise use string. "
+    "Use arrays only for clear repeated entities (people/items/activities). "
+    "If OCR is noisy, infer likely business-relevant fields instead of literal gibberish labels. "
+    "Include a brief 'description' for each field explaining what value to extract "
+    "and its expected format (e.g., 'DD/MM/YYYY date', '12-digit number')."
+)
+
+_REFINE_SCHEMA_GUIDANCE = (
+    "Review the proposed schema and refine it using OCR context. "
+    "Keep only document-relevant fields and remove noisy OCR artifacts. "
+    "Array fields must use plural names; singular fields must not be arrays. "
+    "Ensure no more than 15 fields. Output concise English snake_case keys. "
+    "Preserve field descriptions. If missing, add brief descriptions."
+)
+
+_GUIDANCE_ONLY_SCHEMA_PROMPT = (
+    "Generate a JSON schema and concise extraction instructions using ONLY user guidance. "
+    "Ignore OCR text entirely. "
+    "Use concise English snake_case keys only. "
+    "Limit schema to at most 15 document-relevant fields. "
+    "Return a JSON schema object with type, properties, required, and additionalProperties=false. "
+    "Include a brief 'description' for each field explaining what value to extract "
+    "and its expected format (e.g., 'DD/MM/YYYY date', '12-digit number')."
+)
+
+
 class SchemaBuilderService:
-    def __init__(self, storage: StoragePort, llm: LLMPort) -> None:
+    def __init__(
+        self, storage: StoragePort, llm: LLMPort, cache_namespace: str | None = None
+    ) -> None:
         self._storage = storage
         self._llm = llm
+        # Identifies the model behind llm; None disables the schema response cache.
+        self._cache_namespace = cache_namespace
 
     def build_from_example(
         self,
@@ -27,7 +80,7 @@ class SchemaBuilderService:
         if not instructions:
             instructions = build_instruction_from_example(schema)
         self._storage.update_label_extraction_schema(
-            label_id, json.dumps(schema)
+            label_id, json_codec.dumps(schema)
         )
         self._storage.update_label_extraction_instructions(
             label_id, instructions
@@ -40,20 +93,9 @@ class SchemaBuilderService:
         guidance_override: str | None = None,
     ) -> tuple[dict, str]:
         user_guidance = (guidance_override or "").strip()
-        schema_request = {
-            "type": "object",
-            "properties": {
-                "schema": {"type": "object"},
-                "instructions": {"type": "string"},
-            },
-            "required": ["schema", "instructions"],
-            "additionalProperties": False,
-        }
         if user_guidance:
-            schema, instructions = self._build_from_guidance_only(
-                user_guidance, schema_request
-            )
-            self._storage.update_label_extraction_schema(label_id, json.dumps(schema))
+            schema, instructions = self._build_from_guidance_only(user_guidance)
+            self._storage.update_label_extraction_schema(label_id, json_codec.dumps(schema))
             self._storage.update_label_extraction_instructions(label_id, instructions)
             return schema, instructions
         if not ocr_text.strip():
@@ -61,26 +103,6 @@ class SchemaBuilderService:
         ocr_context = _build_ocr_schema_context(ocr_text)
         if not ocr_context.strip():
             ocr_context = ocr_text
-        guidance = (
-            "Generate a document extraction JSON schema from OCR context. "
-            "Do not copy OCR noise or random tokens as field names. "
-            "Prefer fields that are relevant to official/business documents: "
-            "name, address, ID/number, date, status, amount, parties, and registry/license metadata. "
-            "Use concise English snake_case keys only. Limit the schema to at most 15 fields. "
-            "The schema must be a JSON schema object with type, properties, required, and "
-            "additionalProperties=false. Use boolean only for true/false flags; otherwise use string. "
-            "Use arrays only for clear repeated entities (people/items/activities). "
-            "If OCR is noisy, infer likely business-relevant fields instead of literal gibberish labels. "
-            "Include a brief 'description' for each field explaining what value to extract "
-            "and its expected format (e.g., 'DD/MM/YYYY date', '12-digit number')."
-        )
-        refine_guidance = (
-            "Review the proposed schema and refine it using OCR context. "
-            "Keep only document-relevant fields and remove noisy OCR artifacts. "
-            "Array fields must use plural names; singular fields must not be arrays. "
-            "Ensure no more than 15 fields. Output concise English snake_case keys. "
-            "Preserve field descriptions. If missing, add brief descriptions."
-        )
         example = self._ocr_text_to_example(ocr_context)
         detected_fields = sorted(example.keys())
         detected_hint = ""
@@ -91,31 +113,30 @@ class SchemaBuilderService:
                 + ". "
             )
         schema, instructions = self._attempt_llm_schema(
-            schema_request,
             ocr_context,
-            f"{guidance} {detected_hint}",
+            f"{_OCR_SCHEMA_GUIDANCE} {detected_hint}",
         )
         if schema is None:
             schema, instructions = self._fallback_schema(ocr_context)
         schema = _sanitize_schema(schema, max_fields=15)
-        refinement_payload = (
-            "OCR context:\n"
-            f"{ocr_context}\n\n"
-            "Proposed schema JSON:\n"
-            f"{json.dumps(schema)}"
-        )
-        schema, _ = self._attempt_llm_schema(
-            schema_request,
-            refinement_payload,
-            f"{refine_guidance} {detected_hint}",
-        )
-        schema = _sanitize_schema(schema or {}, max_fields=15)
+        if not _is_grounded_schema(schema, detected_fields):
+            refinement_payload = (
+                "OCR context:\n"
+                f"{ocr_context}\n\n"
+                "Proposed schema JSON:\n"
+                f"{json_codec.dumps(schema)}"
+            )
+            schema, _ = self._attempt_llm_schema(
+                refinement_payload,
+                f"{_REFINE_SCHEMA_GUIDANCE} {detected_hint}",
+            )
+            schema = _sanitize_schema(schema or {}, max_fields=15)
         if _count_array_fields(schema) > 3:
             retry_guidance = (
-                f"{guidance} Avoid arrays unless the OCR clearly lists multiple entries."
+                f"{_OCR_SCHEMA_GUIDANCE} "
+                "Avoid arrays unless the OCR clearly lists multiple entries."
             )
             schema, instructions = self._attempt_llm_schema(
-                schema_request,
                 ocr_context,
                 f"{retry_guidance} {detected_hint}",
             )
@@ -124,11 +145,10 @@ class SchemaBuilderService:
             schema = _sanitize_schema(schema or {}, max_fields=15)
         if not schema.get("properties"):
             retry_guidance = (
-                f"{guidance} Return only the 10-15 most important fields. "
+                f"{_OCR_SCHEMA_GUIDANCE} Return only the 10-15 most important fields. "
                 "Avoid noisy OCR artifacts and make reasonable assumptions about core fields."
             )
             schema, instructions = self._attempt_llm_schema(
-                schema_request,
                 ocr_context,
                 f"{retry_guidance} {detected_hint}",
             )
@@ -141,31 +161,19 @@ class SchemaBuilderService:
         instructions = _apply_instruction_guidance(
             instructions, user_guidance, schema
         )
-        self._storage.update_label_extraction_schema(label_id, json.dumps(schema))
+        self._storage.update_label_extraction_schema(label_id, json_codec.dumps(schema))
         self._storage.update_label_extraction_instructions(label_id, instructions)
         return schema, instructions
 
-    def _build_from_guidance_only(
-        self, user_guidance: str, schema_request: dict
-    ) -> tuple[dict, str]:
+    def _build_from_guidance_only(self, user_guidance: str) -> tuple[dict, str]:
         explicit_fields = _extract_guidance_fields(user_guidance)
         schema: dict | None
         if explicit_fields:
             schema = _schema_from_guidance_fields(explicit_fields, user_guidance)
         else:
-            guidance_prompt = (
-                "Generate a JSON schema and concise extraction instructions using ONLY user guidance. "
-                "Ignore OCR text entirely. "
-                "Use concise English snake_case keys only. "
-                "Limit schema to at most 15 document-relevant fields. "
-                "Return a JSON schema object with type, properties, required, and additionalProperties=false. "
-                "Include a brief 'description' for each field explaining what value to extract "
-                "and its expected format (e.g., 'DD/MM/YYYY date', '12-digit number')."
-            )
             schema, _ = self._attempt_llm_schema(
-                schema_request,
                 f"User guidance:\n{user_guidance}",
-                guidance_prompt,
+                _GUIDANCE_ONLY_SCHEMA_PROMPT,
             )
         schema = _sanitize_schema(schema or {}, max_fields=15)
         if explicit_fields:
@@ -186,10 +194,18 @@ class SchemaBuilderService:
         )
         return schema, instructions
 
-    def _attempt_llm_schema(
-        self, schema_request: dict, ocr_text: str, guidance: str
-    ) -> tuple[dict | None, str]:
-        result = self._llm.extract_fields(schema_request, ocr_text, guidance) or {}
+    def _attempt_llm_schema(self, ocr_text: str, guidance: str) -> tuple[dict | None, str]:
+        cache_key = self._cache_key(ocr_text, guidance)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        schema, instructions = self._request_llm_schema(ocr_text, guidance)
+        if schema is not None:
+            self._cache_put(cache_key, schema, instructions)
+        return schema, instructions
+
+    def _request_llm_schema(self, ocr_text: str, guidance: str) -> tuple[dict | None, str]:
+        result = self._llm.extract_fields(_SCHEMA_REQUEST, ocr_text, guidance) or {}
         schema = result.get("schema")
         instructions = result.get("instructions", "")
         if isinstance(schema, dict):
@@ -199,7 +215,7 @@ class SchemaBuilderService:
             "schema must be a JSON schema object. instructions must be a string."
         )
         result = self._llm.extract_fields(
-            schema_request, ocr_text, f"{guidance} {repair_guidance}"
+            _SCHEMA_REQUEST, ocr_text, f"{guidance} {repair_guidance}"
         ) or {}
         schema = result.get("schema")
         instructions = result.get("instructions", "")
@@ -207,6 +223,38 @@ class SchemaBuilderService:
             return schema, self._coerce_instructions(instructions)
         return None, ""
 
+    def _cache_key(self, ocr_text: str, guidance: str) -> str | None:
+        if self._cache_namespace is None:
+            return None
+        # Guidance text is part of the key, so prompt edits naturally miss the cache.
+        prompt = json.dumps(
+            [self._cache_namespace, _SCHEMA_REQUEST, ocr_text, guidance],
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, cache_key: str | None) -> tuple[dict, str] | None:
+        if cache_key is None:
+            return None
+        try:
+            cached = self._storage.get_cached_llm_response(cache_key)
+        except RuntimeError:
+            return None
+        if not cached or not isinstance(cached.get("schema"), dict):
+            return None
+        return cached["schema"], self._coerce_instructions(cached.get("instructions"))
+
+    def _cache_put(self, cache_key: str | None, schema: dict, instructions: str) -> None:
+        if cache_key is None:
+            return
+        try:
+            self._storage.save_cached_llm_response(
+                cache_key, {"schema": schema, "instructions": instructions}
+            )
+        except RuntimeError:
+            pass
+
     def _fallback_schema(self, ocr_text: str) -> tuple[dict, str]:
         example = self._ocr_text_to_example(ocr_text)
         schema = infer_schema_from_example(example)
@@ -215,29 +263,29 @@ class SchemaBuilderService:
 
     @staticmethod
     def _ocr_text_to_example(ocr_text: str) -> dict:
-        example: dict[str, object] = {}
-        lines = [line.strip() for line in ocr_text.splitlines()]
+        values: defaultdict[str, list[str]] = defaultdict(list)
         last_value_line = ""
-        for raw_line in lines:
-            if not raw_line:
+        for raw_line in ocr_text.splitlines():
+            line = raw_line.strip()
+            if not line:
                 continue
-            if ":" in raw_line and not raw_line.lstrip().startswith(":"):
-                key, value = raw_line.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-                normalized = _normalize_label_key(key)
-                if normalized and _is_reasonable_key(normalized):
-                    _append_example_value(example, normalized, value)
-                last_value_line = value or last_value_line
+            # The line is already stripped, so each half only needs its inner edge trimmed.
+            key, sep, value = line.partition(":")
+            if not sep:
+                last_value_line = line
                 continue
-            if raw_line.lstrip().startswith(":"):
-                label = raw_line.lstrip()[1:].strip()
-                normalized = _normalize_label_key(label)
+            value = value.lstrip()
+            if not key:
+                normalized = _normalize_label_key(value)
                 if normalized and _is_reasonable_key(normalized) and last_value_line:
-                    _append_example_value(example, normalized, last_value_line)
+                    values[normalized].append(last_value_line)
                 continue
-            last_value_line = raw_line
-        return example
+            normalized = _normalize_label_key(key.rstrip())
+            if normalized and _is_reasonable_key(normalized):
+                values[normalized].append(value)
+            last_value_line = value or last_value_line
+        # Labels seen once keep a scalar example value; repeated labels become lists.
+        return {key: found[0] if len(found) == 1 else found for key, found in values.items()}
 
     @staticmethod
     def _coerce_instructions(instructions: object) -> str:
@@ -248,70 +296,60 @@ class SchemaBuilderService:
         return str(instructions)
 
 
-def _append_example_value(example: dict[str, object], key: str, value: str) -> None:
-    if not key:
-        return
-    if key in example:
-        existing = example[key]
-        if isinstance(existing, list):
-            existing.append(value)
-        else:
-            example[key] = [existing, value]
-    else:
-        example[key] = value
+_ARABIC_LABEL_KEYS: dict[str, str] = {
+    "الرقم المركزي": "central_number",
+    "الرقم المركزى": "central_number",
+    "شهادة مستخرج السجل التجاري": "document_title",
+    "في الكويت": "issue_location",
+    "العنوان التجاري": "company_address",
+    "الكيان القانوني": "legal_entity_type",
+    "رأس مال الشركة": "company_capital",
+    "رقم الترخيص": "license_number",
+    "بتاريخ": "registration_date",
+    "رقم تحت بالسجل التجاري": "commercial_registry_number",
+    "عدد الانشطة": "activity_count",
+    "عدد الأنشطة": "activity_count",
+    "عدد الشركاء": "partner_count",
+    "حالة الترخيص الرئيسي": "license_status",
+    "حالة الشركة": "company_status",
+    "عدد المديرين": "managers_count",
+    "الرقم المدني": "civil_number",
+    "الرقم الالي للعنوان": "address_number",
+    "الرقم الآلي للعنوان": "address_number",
+    "المحافظة": "governorate",
+    "المنطقة": "area",
+    "القسيمة": "block",
+    "الشارع": "street",
+    "المبنى": "building",
+    "الدور": "floor",
+    "نوع الوحدة": "unit_type",
+    "رقم الوحدة": "unit_number",
+    "تاريخ الطباعة": "print_date",
+    "اسم الشركة": "company_name",
+}
+
 
+# OCR can emit RTL labels with their characters reversed, so both orders map to the same key.
+_ARABIC_LABEL_LOOKUP: dict[str, str] = {
+    **{label[::-1]: key for label, key in _ARABIC_LABEL_KEYS.items()},
+    **_ARABIC_LABEL_KEYS,
+}
 
+
+@lru_cache(maxsize=4096)
 def _normalize_label_key(label: str) -> str:
     raw = label.strip()
     if not raw:
         return ""
-    arabic_map = {
-        "الرقم المركزي": "central_number",
-        "الرقم المركزى": "central_number",
-        "شهادة مستخرج السجل التجاري": "document_title",
-        "في الكويت": "issue_location",
-        "العنوان التجاري": "company_address",
-        "الكيان القانوني": "legal_entity_type",
-        "رأس مال الشركة": "company_capital",
-        "رقم الترخيص": "license_number",
-        "بتاريخ": "registration_date",
-        "رقم تحت بالسجل التجاري": "commercial_registry_number",
-        "عدد الانشطة": "activity_count",
-        "عدد الأنشطة": "activity_count",
-        "عدد الشركاء": "partner_count",
-        "حالة الترخيص الرئيسي": "license_status",
-        "حالة الشركة": "company_status",
-        "عدد المديرين": "managers_count",
-        "الرقم المدني": "civil_number",
-        "الرقم الالي للعنوان": "address_number",
-        "الرقم الآلي للعنوان": "address_number",
-        "المحافظة": "governorate",
-        "المنطقة": "area",
-        "القسيمة": "block",
-        "الشارع": "street",
-        "المبنى": "building",
-        "الدور": "floor",
-        "نوع الوحدة": "unit_type",
-        "رقم الوحدة": "unit_number",
-        "تاريخ الطباعة": "print_date",
-        "اسم الشركة": "company_name",
-    }
-    candidates = [
-        raw,
-        raw.replace("_", " "),
-        raw[::-1],
-        raw[::-1].replace("_", " "),
-        " ".join(reversed(raw.split())),
-    ]
-    for candidate in candidates:
-        normalized = candidate.strip().lower()
-        if not normalized:
-            continue
-        if normalized in arabic_map:
-            return arabic_map[normalized]
-        if normalized.isascii():
-            return normalized.replace(" ", "_")
-    normalized = raw.strip().lower()
+    normalized = raw.lower()
+    if normalized.isascii():
+        return normalized.replace(" ", "_")
+    mapped = _ARABIC_LABEL_LOOKUP.get(normalized.replace("_", " ").strip())
+    if mapped is None:
+        # Word-order reversal is the remaining RTL artifact.
+        mapped = _ARABIC_LABEL_KEYS.get(" ".join(reversed(normalized.split())))
+    if mapped is not None:
+        return mapped
     return normalized.replace(" ", "_")
 
 
@@ -321,20 +359,15 @@ def _sanitize_schema(schema: dict, max_fields: int = 15) -> dict:
     properties = schema.get("properties", {})
     if not isinstance(properties, dict):
         properties = {}
-    scored: list[tuple[float, str, dict]] = []
+    scored: list[tuple[float, str, object]] = []
     for key, subschema in properties.items():
-        normalized_key = _normalize_label_key(str(key))
-        if not _is_valid_key(normalized_key):
-            continue
-        if not _is_reasonable_key(normalized_key):
-            continue
-        cleaned_subschema = _sanitize_subschema(normalized_key, subschema)
-        score = _field_relevance_score(normalized_key)
-        scored.append((score, normalized_key, cleaned_subschema))
+        accepted = _accepted_schema_key(str(key))
+        if accepted is not None:
+            scored.append((accepted[1], accepted[0], subschema))
     scored.sort(key=lambda item: (-item[0], item[1]))
     cleaned: dict[str, dict] = {}
     for _score, key, subschema in scored:
-        cleaned[key] = subschema
+        cleaned[key] = _sanitize_subschema(key, subschema)
         if len(cleaned) >= max_fields:
             break
     return {
@@ -345,6 +378,14 @@ def _sanitize_schema(schema: dict, max_fields: int = 15) -> dict:
     }
 
 
+@lru_cache(maxsize=2048)
+def _accepted_schema_key(key: str) -> tuple[str, float] | None:
+    normalized_key = _normalize_label_key(key)
+    if not _is_valid_key(normalized_key) or not _is_reasonable_key(normalized_key):
+        return None
+    return normalized_key, _field_relevance_score(normalized_key)
+
+
 def _sanitize_subschema(key: str, schema: object) -> dict:
     if isinstance(schema, dict):
         schema_type = schema.get("type")
@@ -365,17 +406,15 @@ def _sanitize_subschema(key: str, schema: object) -> dict:
     return {"type": "string"}
 
 
+_VALID_KEY_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_")
+
+
+@lru_cache(maxsize=2048)
 def _is_valid_key(key: str) -> bool:
-    if not key or len(key) > 40:
-        return False
-    if not key.isascii():
-        return False
-    for ch in key:
-        if not (ch.islower() or ch.isdigit() or ch == "_"):
-            return False
-    return True
+    return 0 < len(key) <= 40 and _VALID_KEY_CHARS.issuperset(key)
 
 
+@lru_cache(maxsize=2048)
 def _is_reasonable_key(key: str) -> bool:
     if not key or key.startswith("_") or key.endswith("_"):
         return False
@@ -399,6 +438,7 @@ def _is_reasonable_key(key: str) -> bool:
     return _field_relevance_score(key) >= 0
 
 
+@lru_cache(maxsize=2048)
 def _field_relevance_score(key: str) -> float:
     positive_terms = {
         "name",
@@ -470,14 +510,19 @@ def _field_relevance_score(key: str) -> float:
     return score
 
 
+def _is_grounded_schema(schema: dict, detected_fields: list[str]) -> bool:
+    # Refinement only prunes noise and fills descriptions; skip it when neither is needed.
+    properties = schema.get("properties", {})
+    if not properties or not set(properties).issubset(detected_fields):
+        return False
+    return all("description" in subschema for subschema in properties.values())
+
+
+@lru_cache(maxsize=2048)
 def _array_key_is_plural(key: str) -> bool:
     if "list" in key or "items" in key:
         return True
-    if key.endswith("s") and not key.endswith(("ss", "us", "is")):
-        return True
-    if "list" in key or "items" in key:
-        return True
-    return False
+    return key.endswith("s") and not key.endswith(("ss", "us", "is"))
 
 
 def _count_array_fields(schema: dict) -> int:
@@ -493,17 +538,27 @@ def _count_array_fields(schema: dict) -> int:
     return count
 
 
-def _extract_only_include_fields(guidance: str) -> list[str]:
-    if not guidance:
-        return []
-    patterns = [
+_ONLY_INCLUDE_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
         r"\bonly include\b(?P<fields>[^.;\n]+)",
         r"\binclude only\b(?P<fields>[^.;\n]+)",
         r"\blimit(?:\s+the\s+schema|\s+fields)?\s+to\b(?P<fields>[^.;\n]+)",
         r"\brestrict(?:\s+the\s+schema|\s+fields)?\s+to\b(?P<fields>[^.;\n]+)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, guidance, flags=re.IGNORECASE)
+    )
+)
+_AND_OR_RE = re.compile(r"\b(and|or)\b", re.IGNORECASE)
+_FIELD_SEPARATOR_RE = re.compile(r"[,/|]")
+_LEADING_ARTICLE_RE = re.compile(r"^(?:the|a|an)\s+", re.IGNORECASE)
+_TRAILING_FIELDS_RE = re.compile(r"\bfields?\b$", re.IGNORECASE)
+_LEADING_CONDITION_RE = re.compile(r"^(?:see\s+if|check\s+if|whether|if)\s+", re.IGNORECASE)
+
+
+def _extract_only_include_fields(guidance: str) -> list[str]:
+    if not guidance:
+        return []
+    for pattern in _ONLY_INCLUDE_RES:
+        match = pattern.search(guidance)
         if not match:
             continue
         return _parse_guidance_field_names(match.group("fields"))
@@ -512,20 +567,15 @@ def _extract_only_include_fields(guidance: str) -> list[str]:
 
 def _parse_guidance_field_names(value: str) -> list[str]:
     normalized_value = value.replace("\n", " ")
-    normalized_value = re.sub(r"\b(and|or)\b", ",", normalized_value, flags=re.IGNORECASE)
-    parts = re.split(r"[,/|]", normalized_value)
+    normalized_value = _AND_OR_RE.sub(",", normalized_value)
+    parts = _FIELD_SEPARATOR_RE.split(normalized_value)
     fields: list[str] = []
     seen: set[str] = set()
     for raw_part in parts:
         candidate = raw_part.strip(" .:;\"'`[](){}")
-        candidate = re.sub(r"^(?:the|a|an)\s+", "", candidate, flags=re.IGNORECASE)
-        candidate = re.sub(r"\bfields?\b$", "", candidate, flags=re.IGNORECASE)
-        candidate = re.sub(
-            r"^(?:see\s+if|check\s+if|whether|if)\s+",
-            "",
-            candidate,
-            flags=re.IGNORECASE,
-        )
+        candidate = _LEADING_ARTICLE_RE.sub("", candidate)
+        candidate = _TRAILING_FIELDS_RE.sub("", candidate)
+        candidate = _LEADING_CONDITION_RE.sub("", candidate)
         if not candidate:
             continue
         field_name = _normalize_label_key(candidate)
@@ -560,14 +610,14 @@ def _apply_allowed_fields_constraint(
     }
 
 
+_RESTRICTIVE_RE = re.compile(
+    r"\b(nothing else|anything else|no other fields?|and nothing else|only these fields?)\b",
+    re.IGNORECASE,
+)
+
+
 def _looks_restrictive(guidance: str) -> bool:
-    return bool(
-        re.search(
-            r"\b(nothing else|anything else|no other fields?|and nothing else|only these fields?)\b",
-            guidance,
-            flags=re.IGNORECASE,
-        )
-    )
+    return _RESTRICTIVE_RE.search(guidance) is not None
 
 
 def _canonicalize_guidance_key(field_name: str) -> str:
@@ -610,20 +660,20 @@ def _coerce_candidate_to_core_field(candidate: str, normalized: str) -> str:
     return normalized
 
 
+_ACTION_RES = tuple(
+    re.compile(rf"\b{verb}\b(?P<fields>[^.\n;]+)", re.IGNORECASE)
+    for verb in ("extract", "return", "output", "capture")
+)
+
+
 def _extract_guidance_fields(guidance: str) -> list[str]:
     if not guidance:
         return []
     explicit = _extract_only_include_fields(guidance)
     if explicit:
         return explicit
-    action_patterns = [
-        r"\bextract\b(?P<fields>[^.\n;]+)",
-        r"\breturn\b(?P<fields>[^.\n;]+)",
-        r"\boutput\b(?P<fields>[^.\n;]+)",
-        r"\bcapture\b(?P<fields>[^.\n;]+)",
-    ]
-    for pattern in action_patterns:
-        match = re.search(pattern, guidance, flags=re.IGNORECASE)
+    for pattern in _ACTION_RES:
+        match = pattern.search(guidance)
         if not match:
             continue
         parsed = _parse_guidance_field_names(match.group("fields"))
@@ -696,6 +746,9 @@ def _infer_guidance_field_schema(field_name: str, guidance: str) -> dict:
     return {"type": "string"}
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _build_ocr_schema_context(
     ocr_text: str, max_lines: int = 220, max_chars: int = 14000
 ) -> str:
@@ -705,7 +758,7 @@ def _build_ocr_schema_context(
     for line in lines:
         if not line:
             continue
-        normalized = re.sub(r"\s+", " ", line).strip()
+        normalized = _WHITESPACE_RE.sub(" ", line).strip()
         if not normalized or normalized in seen:
             continue
         if not _is_meaningful_ocr_line(normalized):
@@ -722,7 +775,7 @@ def _build_ocr_schema_context(
     if not selected:
         fallback: list[str] = []
         for line in lines:
-            normalized = re.sub(r"\s+", " ", line).strip()
+            normalized = _WHITESPACE_RE.sub(" ", line).strip()
             if not normalized:
                 continue
             if not _is_meaningful_ocr_line(normalized):
@@ -793,13 +846,10 @@ def _apply_instruction_guidance(
     return guidance_line
 
 
+_PATTERN_REQUEST_RE = re.compile(r"\b(detect|infer|use)\b.*\bpattern", re.IGNORECASE)
+
+
 def _guidance_requests_pattern_inference(user_guidance: str) -> bool:
     if not user_guidance:
         return False
-    return bool(
-        re.search(
-            r"\b(detect|infer|use)\b.*\bpattern",
-            user_guidance,
-            flags=re.IGNORECASE,
-        )
-    )
+    return _PATTERN_REQUEST_RE.search(user_guidance) is not None
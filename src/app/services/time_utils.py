@@ -4,7 +4,9 @@ from datetime import datetime
 
 
 def now_local_iso() -> str:
-    return datetime.now().astimezone().replace(microsecond=0).isoformat()
+    # The local zone is resolved per call on purpose: a tzinfo cached at import
+    # would keep a stale UTC offset across DST changes in a long-running app.
+    return datetime.now().astimezone().isoformat(timespec="seconds")
 
 
 def local_date_yyyy_mm_dd(dt_iso_or_datetime: datetime | str | None) -> str:
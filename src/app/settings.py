@@ -13,6 +13,15 @@ if psutil is not None:
 else:
     _cpu_count = os.cpu_count()
 OCR_WORKERS = _cpu_count if _cpu_count and _cpu_count > 0 else 1
+# Concurrent LLM requests per job (bounded to stay under provider rate limits)
+LLM_WORKERS = max(1, int(os.getenv("LLM_WORKERS", "8")))
+# Concurrent job-wide storage reads when building a report (1 = serial; raise for
+# remote stores, the local SQLite store opens one connection per read)
+REPORT_FETCH_WORKERS = max(1, int(os.getenv("REPORT_FETCH_WORKERS", "1")))
+# Files larger than this are flagged for review instead of sent to the LLM
+MAX_EXTRACT_BYTES = int(os.getenv("MAX_EXTRACT_BYTES", str(20 * 1024 * 1024)))
+# OCR text sent to the LLM label fallback is windowed to this many chars (0 = no cap)
+LLM_MAX_OCR_CHARS = max(0, int(os.getenv("LLM_MAX_OCR_CHARS", "4000")))
 EMBEDDINGS_ENABLED = os.getenv("EMBEDDINGS_ENABLED", "false").lower() == "true"
 # Embeddings switching: openai | local | sentence-transformers | bge-m3 | dummy
 EMBEDDINGS_PROVIDER = os.getenv("EMBEDDINGS_PROVIDER", "openai").lower()
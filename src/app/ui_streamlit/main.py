@@ -176,8 +176,8 @@ def _count_cached_file_states(storage: object, job_id: str, files: list) -> tupl
     classified_count = 0
     extracted_count = 0
     for file_ref in files:
-        ocr_result = storage.get_ocr_result(job_id, file_ref.file_id)
-        if ocr_result and ocr_result.text.strip():
+        ocr_meta = storage.get_ocr_text_meta(job_id, file_ref.file_id)
+        if ocr_meta and ocr_meta.has_text:
             ocr_ready_count += 1
         if storage.get_file_label_assignment(job_id, file_ref.file_id):
             classified_count += 1
@@ -1231,7 +1231,7 @@ def main() -> None:
                                     services = _get_services(token, sqlite_path)
                                     with st.spinner("Extracting fields..."):
                                         services["extraction_service"].extract_fields_for_file(
-                                            job_id, file_ref.file_id
+                                            job_id, file_ref.file_id, file_ref
                                         )
                                     st.success("Extraction completed.")
                                     _trigger_rerun()
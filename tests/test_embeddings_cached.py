@@ -0,0 +1,72 @@
+import pytest
+
+from app.adapters.embeddings_cached import CachedEmbeddingsAdapter
+from app.adapters.sqlite_storage import SQLiteStorage
+
+
+class CountingEmbeddings:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_cached_embeddings_only_embed_misses(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    inner = CountingEmbeddings()
+    adapter = CachedEmbeddingsAdapter(inner, storage, model="test-model")
+
+    assert adapter.embed_texts(["ab", "abc", "ab"]) == [[2.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+    assert adapter.embed_texts(["abc", "abcd"]) == [[3.0, 1.0], [4.0, 1.0]]
+    assert adapter.embed_text("ab") == [2.0, 1.0]
+
+    assert inner.calls == [["ab", "abc"], ["abcd"]]
+
+
+def test_cached_embeddings_are_scoped_by_model(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    inner = CountingEmbeddings()
+    CachedEmbeddingsAdapter(inner, storage, model="model-a").embed_text("ab")
+    CachedEmbeddingsAdapter(inner, storage, model="model-b").embed_text("ab")
+
+    assert inner.calls == [["ab"], ["ab"]]
+
+
+class FractionalEmbeddings:
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [[0.1, 1.0 / 3.0] for _ in texts]
+
+
+class ShortEmbeddings:
+    def embed_text(self, text: str) -> list[float]:
+        return []
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [[1.0]]
+
+
+def test_cached_embeddings_miss_matches_later_hit(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    adapter = CachedEmbeddingsAdapter(FractionalEmbeddings(), storage, model="test-model")
+
+    first = adapter.embed_text("ab")
+    second = adapter.embed_text("ab")
+
+    assert first == second
+    assert first != [0.1, 1.0 / 3.0]
+
+
+def test_cached_embeddings_reject_short_provider_response(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    adapter = CachedEmbeddingsAdapter(ShortEmbeddings(), storage, model="test-model")
+
+    with pytest.raises(RuntimeError, match="returned 1 embeddings for 2 inputs"):
+        adapter.embed_texts(["ab", "abc"])
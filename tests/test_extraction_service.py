@@ -127,3 +127,162 @@ def test_extraction_service_surfaces_llm_error_detail(tmp_path) -> None:
         warning.startswith("LLM_ERROR_DETAIL: OpenAI responses API error 400")
         for warning in warnings
     )
+
+
+def test_extraction_service_job_prefers_override_schema(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id,
+        [
+            FileRef(file_id="file-1", name="a", mime_type="image/png", sort_index=1),
+            FileRef(file_id="file-2", name="b", mime_type="image/png", sort_index=2),
+        ],
+    )
+    assigned = storage.create_label(
+        "Civil_ID",
+        json.dumps({"type": "object", "properties": {"civil_id": {"type": "string"}}}),
+        "",
+    )
+    overridden = storage.create_label(
+        "IBAN",
+        json.dumps({"type": "object", "properties": {"iban_number": {"type": "string"}}}),
+        "",
+    )
+    for file_id in ("file-1", "file-2"):
+        storage.upsert_file_label_assignment(
+            job.job_id, file_id, assigned.label_id, 1.0, MATCHED
+        )
+    storage.upsert_file_label_override(job.job_id, "file-2", overridden.label_id)
+    llm = DummyLLM()
+    service = ExtractionService(llm, storage, DummyDrive(payload=b"bytes"))
+
+    service.extract_fields_for_job(job.job_id)
+
+    schemas = sorted(list(call[0]["properties"].keys()) for call in llm.image_calls)
+    assert schemas == [["civil_id"], ["iban_number"]]
+    for file_id in ("file-1", "file-2"):
+        assert storage.get_extraction(job.job_id, file_id) is not None
+
+
+def test_extraction_service_file_uses_given_file_ref(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id,
+        [FileRef(file_id="file-1", name="a", mime_type="image/png", sort_index=1)],
+    )
+    llm = DummyLLM()
+    drive = DummyDrive(payload=b"fake-image-bytes")
+    service = ExtractionService(llm, storage, drive)
+    file_ref = FileRef(file_id="file-1", name="a", mime_type="image/jpeg", sort_index=1)
+    service.extract_fields_for_file(job.job_id, "file-1", file_ref)
+    assert llm.image_calls[0][2] == "image/jpeg"
+    assert storage.get_extraction(job.job_id, "file-1") is not None
+
+
+def test_extraction_service_skips_unsupported_mime(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id,
+        [
+            FileRef(
+                file_id="file-1",
+                name="a",
+                mime_type="application/vnd.google-apps.document",
+                sort_index=1,
+            )
+        ],
+    )
+    llm = DummyLLM()
+    drive = DummyDrive(payload=b"fake-image-bytes")
+    service = ExtractionService(llm, storage, drive)
+    service.extract_fields_for_job(job.job_id)
+    extraction = storage.get_extraction(job.job_id, "file-1")
+    assert extraction is not None
+    payload = json.loads(extraction.fields_json or "{}")
+    assert "UNSUPPORTED_MIME" in payload["warnings"]
+    assert payload["needs_review"] is True
+    assert drive.calls == []
+    assert llm.image_calls == []
+
+
+def test_extraction_service_flags_oversized_file(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("app.services.extraction_service.MAX_EXTRACT_BYTES", 4)
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id,
+        [FileRef(file_id="file-1", name="a", mime_type="image/png", sort_index=1)],
+    )
+    llm = DummyLLM()
+    drive = DummyDrive(payload=b"fake-image-bytes")
+    service = ExtractionService(llm, storage, drive)
+    service.extract_fields_for_job(job.job_id)
+    extraction = storage.get_extraction(job.job_id, "file-1")
+    assert extraction is not None
+    payload = json.loads(extraction.fields_json or "{}")
+    assert "FILE_TOO_LARGE" in payload["warnings"]
+    assert llm.image_calls == []
+
+
+def test_extraction_service_skips_download_for_listed_oversized_file(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.services.extraction_service.MAX_EXTRACT_BYTES", 4)
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id,
+        [
+            FileRef(
+                file_id="file-1",
+                name="a",
+                mime_type="image/png",
+                sort_index=1,
+                size_bytes=16,
+            )
+        ],
+    )
+    llm = DummyLLM()
+    drive = DummyDrive(payload=b"fake-image-bytes")
+    service = ExtractionService(llm, storage, drive)
+    service.extract_fields_for_job(job.job_id)
+    extraction = storage.get_extraction(job.job_id, "file-1")
+    assert extraction is not None
+    payload = json.loads(extraction.fields_json or "{}")
+    assert "FILE_TOO_LARGE" in payload["warnings"]
+    assert payload["needs_review"] is True
+    assert drive.calls == []
+    assert llm.image_calls == []
+
+
+def test_extraction_service_reparses_schema_after_label_update(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id,
+        [FileRef(file_id="file-1", name="a", mime_type="image/png", sort_index=1)],
+    )
+    label = storage.create_label(
+        "Civil_ID",
+        json.dumps({"type": "object", "properties": {"civil_id": {"type": "string"}}}),
+        "",
+    )
+    storage.upsert_file_label_assignment(
+        job.job_id, "file-1", label.label_id, 1.0, MATCHED
+    )
+    llm = DummyLLM()
+    service = ExtractionService(llm, storage, DummyDrive(payload=b"fake-image-bytes"))
+    service.extract_fields_for_job(job.job_id)
+    storage.update_label_extraction_schema(
+        label.label_id,
+        json.dumps({"type": "object", "properties": {"birth_date": {"type": "string"}}}),
+    )
+    service.extract_fields_for_job(job.job_id)
+
+    assert [list(call[0]["properties"]) for call in llm.image_calls] == [
+        ["civil_id"],
+        ["birth_date"],
+    ]
@@ -1,5 +1,5 @@
 from app.adapters.sqlite_storage import SQLiteStorage
-from app.domain.models import ExtractionRecord
+from app.domain.models import ExtractionRecord, FileTimingRecord, LabelAssignment
 
 
 def test_extraction_round_trip(tmp_path) -> None:
@@ -21,3 +21,75 @@ def test_extraction_round_trip(tmp_path) -> None:
         confidences_json='{"id":0.9}',
         updated_at="2024-01-01T00:00:00Z",
     )
+
+
+def test_bulk_save_extractions_and_timings(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    storage.upsert_file_timings("job-1", "file-1", 12, None, None, "2024-01-01T00:00:00Z")
+    records = [
+        ExtractionRecord(
+            job_id="job-1",
+            file_id=file_id,
+            schema_json="{}",
+            fields_json=f'{{"id":"{file_id}"}}',
+            confidences_json="{}",
+            updated_at="2024-01-02T00:00:00Z",
+        )
+        for file_id in ("file-1", "file-2")
+    ]
+    storage.bulk_save_extractions(records)
+    storage.bulk_upsert_file_timings(
+        [
+            FileTimingRecord("job-1", "file-1", None, None, 30, "2024-01-02T00:00:00Z"),
+            FileTimingRecord("job-1", "file-2", None, None, 40, "2024-01-02T00:00:00Z"),
+        ]
+    )
+
+    assert storage.get_extraction("job-1", "file-2") == records[1]
+    timings = storage.get_file_timings("job-1", "file-1")
+    assert timings is not None
+    assert timings.ocr_ms == 12
+    assert timings.extract_ms == 30
+
+
+def test_list_extractions_and_timings_scoped_to_job(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    record = ExtractionRecord(
+        job_id="job-1",
+        file_id="file-1",
+        schema_json="{}",
+        fields_json='{"id":"A"}',
+        confidences_json="{}",
+        updated_at="2024-01-02T00:00:00Z",
+    )
+    storage.bulk_save_extractions(
+        [record, ExtractionRecord("job-2", "file-1", "{}", "{}", "{}", "2024-01-02T00:00:00Z")]
+    )
+    storage.upsert_file_timings("job-1", "file-1", 5, 6, 7, "2024-01-02T00:00:00Z")
+    storage.upsert_file_timings("job-2", "file-9", 1, None, None, "2024-01-02T00:00:00Z")
+
+    assert storage.list_extractions("job-1") == {"file-1": record}
+    assert storage.list_file_timings("job-1") == {
+        "file-1": FileTimingRecord("job-1", "file-1", 5, 6, 7, "2024-01-02T00:00:00Z")
+    }
+    assert storage.list_extractions("missing") == {}
+
+
+def test_bulk_upsert_file_label_assignments(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.upsert_file_label_assignment(job.job_id, "file-1", None, 0.1, "NO_MATCH")
+
+    storage.bulk_upsert_file_label_assignments(
+        [
+            LabelAssignment(job.job_id, "file-1", "label-1", "MATCHED", 0.9),
+            LabelAssignment(job.job_id, "file-2", None, "NO_MATCH", 0.0),
+        ]
+    )
+
+    assignments = {
+        item.file_id: item for item in storage.list_file_label_assignments(job.job_id)
+    }
+    assert assignments["file-1"].label_id == "label-1"
+    assert assignments["file-1"].score == 0.9
+    assert assignments["file-2"].status == "NO_MATCH"
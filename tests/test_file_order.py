@@ -0,0 +1,28 @@
+from app.domain.file_order import order_job_files
+from app.domain.models import FileRef
+
+
+def test_order_job_files_uses_position_when_sort_index_missing() -> None:
+    files = [
+        FileRef(file_id="c", name="c.png", mime_type="image/png", sort_index=None),
+        FileRef(file_id="b", name="b.png", mime_type="image/png", sort_index=0),
+        FileRef(file_id="a", name="a.png", mime_type="image/png", sort_index=0),
+        FileRef(file_id="d", name="d.png", mime_type="image/png", sort_index=5),
+    ]
+
+    ordered = order_job_files(files)
+
+    assert [file_ref.file_id for file_ref in ordered] == ["a", "b", "c", "d"]
+
+
+def test_order_job_files_returns_sorted_input_unchanged() -> None:
+    files = [
+        FileRef(file_id="a", name="a.png", mime_type="image/png", sort_index=0),
+        FileRef(file_id="b", name="a.png", mime_type="image/png", sort_index=0),
+        FileRef(file_id="c", name="c.png", mime_type="image/png", sort_index=1),
+    ]
+
+    ordered = order_job_files(files)
+
+    assert ordered == files
+    assert ordered is not files
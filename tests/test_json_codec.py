@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from app.domain import json_codec
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_codec_round_trip(monkeypatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    payload = {"fields": {"name": "علي"}, "needs_review": False, "warnings": []}
+
+    assert json_codec.loads(json_codec.dumps(payload)) == payload
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads("{not json")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_codec_dumps_bytes_is_utf8_json(monkeypatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    payload = {"name": "علي", "pages": [1, 2]}
+
+    encoded = json_codec.dumps_bytes(payload)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded.decode("utf-8")) == payload
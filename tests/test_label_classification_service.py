@@ -1,6 +1,6 @@
 from unittest.mock import Mock
 
-from app.domain.models import FileRef, OCRResult
+from app.domain.models import FileLabelOverride, FileRef, OCRResult, OCRTextMeta
 from app.services.label_classification_service import LabelClassificationService
 
 
@@ -10,12 +10,16 @@ def test_classify_skips_when_override_exists() -> None:
         FileRef(file_id="file-1", name="a.jpg", mime_type="image/jpeg", sort_index=0)
     ]
     storage.list_labels.return_value = []
-    storage.get_file_label_override.return_value = "label-1"
+    storage.list_file_label_overrides.return_value = [
+        FileLabelOverride(job_id="job-1", file_id="file-1", label_id="label-1")
+    ]
     service = LabelClassificationService(embeddings=Mock(), storage=storage)
 
     service.classify_job_files("job-1")
 
     storage.upsert_file_label_assignment.assert_not_called()
+    storage.bulk_upsert_file_label_assignments.assert_called_once_with([])
+    storage.get_ocr_result.assert_not_called()
 
 
 def test_classify_missing_ocr_no_match() -> None:
@@ -24,13 +28,16 @@ def test_classify_missing_ocr_no_match() -> None:
         FileRef(file_id="file-1", name="a.jpg", mime_type="image/jpeg", sort_index=0)
     ]
     storage.list_labels.return_value = []
-    storage.get_file_label_override.return_value = None
-    storage.get_ocr_result.return_value = None
+    storage.list_file_label_overrides.return_value = []
+    storage.list_ocr_text_meta.return_value = {}
     service = LabelClassificationService(embeddings=Mock(), storage=storage)
 
     service.classify_job_files("job-1")
 
-    storage.upsert_file_label_assignment.assert_called_once()
+    storage.get_ocr_result.assert_not_called()
+
+    (records,) = storage.bulk_upsert_file_label_assignments.call_args.args
+    assert len(records) == 1
 
 
 def test_classify_embeddings_path() -> None:
@@ -40,16 +47,22 @@ def test_classify_embeddings_path() -> None:
     ]
     storage.list_labels.return_value = [Mock(label_id="label-1")]
     storage.list_label_examples.return_value = [Mock(example_id="ex-1")]
-    storage.get_file_label_override.return_value = None
+    storage.list_file_label_overrides.return_value = []
+    storage.list_ocr_text_meta.return_value = {
+        "file-1": OCRTextMeta(has_text=True, text_length=6),
+    }
     storage.get_ocr_result.return_value = OCRResult(text="sample", confidence=None)
-    storage.get_label_example_features.return_value = {"embedding": [1.0, 0.0], "ocr_text": ""}
+    storage.bulk_get_label_example_features.return_value = {
+        "ex-1": {"embedding": [1.0, 0.0], "ocr_text": ""}
+    }
     embeddings = Mock()
     embeddings.embed_text.return_value = [1.0, 0.0]
     service = LabelClassificationService(embeddings=embeddings, storage=storage)
 
     service.classify_job_files("job-1")
 
-    storage.upsert_file_label_assignment.assert_called_once()
+    (records,) = storage.bulk_upsert_file_label_assignments.call_args.args
+    assert len(records) == 1
 
 
 def test_classify_lexical_path() -> None:
@@ -59,13 +72,164 @@ def test_classify_lexical_path() -> None:
     ]
     storage.list_labels.return_value = [Mock(label_id="label-1")]
     storage.list_label_examples.return_value = [Mock(example_id="ex-1")]
-    storage.get_file_label_override.return_value = None
+    storage.list_file_label_overrides.return_value = []
+    storage.list_ocr_text_meta.return_value = {
+        "file-1": OCRTextMeta(has_text=True, text_length=6),
+    }
     storage.get_ocr_result.return_value = OCRResult(text="hello world", confidence=None)
-    storage.get_label_example_features.return_value = {"token_fingerprint": {"hello"}}
+    storage.bulk_get_label_example_features.return_value = {
+        "ex-1": {"token_fingerprint": {"hello"}}
+    }
     embeddings = Mock()
     embeddings.embed_text.side_effect = RuntimeError("Embeddings not configured")
     service = LabelClassificationService(embeddings=embeddings, storage=storage)
 
     service.classify_job_files("job-1")
 
-    storage.upsert_file_label_assignment.assert_called_once()
+    (records,) = storage.bulk_upsert_file_label_assignments.call_args.args
+    assert len(records) == 1
+
+
+def test_classify_job_batches_embeddings() -> None:
+    storage = Mock()
+    storage.get_job_files.return_value = [
+        FileRef(file_id="file-1", name="a.jpg", mime_type="image/jpeg", sort_index=0),
+        FileRef(file_id="file-2", name="b.jpg", mime_type="image/jpeg", sort_index=1),
+    ]
+    storage.list_labels.return_value = [Mock(label_id="label-1")]
+    storage.list_label_examples.return_value = [Mock(example_id="ex-1")]
+    storage.list_file_label_overrides.return_value = []
+    storage.list_ocr_text_meta.return_value = {
+        "file-1": OCRTextMeta(has_text=True, text_length=6),
+        "file-2": OCRTextMeta(has_text=True, text_length=6),
+    }
+    storage.get_ocr_result.return_value = OCRResult(text="sample", confidence=None)
+    storage.bulk_get_label_example_features.return_value = {
+        "ex-1": {"embedding": [1.0, 0.0], "ocr_text": ""}
+    }
+    embeddings = Mock()
+    embeddings.embed_texts.return_value = [[1.0, 0.0], [0.0, 1.0]]
+    service = LabelClassificationService(embeddings=embeddings, storage=storage)
+
+    service.classify_job_files("job-1")
+
+    embeddings.embed_texts.assert_called_once_with(["sample", "sample"])
+    embeddings.embed_text.assert_not_called()
+    (records,) = storage.bulk_upsert_file_label_assignments.call_args.args
+    assert sorted(record.file_id for record in records) == ["file-1", "file-2"]
+    (timings,) = storage.bulk_upsert_file_timings.call_args.args
+    assert len(timings) == 2
+    stamps = {record.updated_at for record in records + timings}
+    assert len(stamps) == 1 and None not in stamps
+    storage.upsert_file_label_assignment.assert_not_called()
+
+
+def test_classify_job_loads_examples_and_file_inputs_once() -> None:
+    storage = Mock()
+    storage.get_job_files.return_value = [
+        FileRef(file_id="file-1", name="a.jpg", mime_type="image/jpeg", sort_index=0),
+        FileRef(file_id="file-2", name="b.jpg", mime_type="image/jpeg", sort_index=1),
+    ]
+    storage.list_labels.return_value = [Mock(label_id="label-1")]
+    storage.list_label_examples.return_value = [Mock(example_id="ex-1")]
+    storage.list_file_label_overrides.return_value = []
+    storage.list_ocr_text_meta.return_value = {
+        "file-1": OCRTextMeta(has_text=True, text_length=6),
+        "file-2": OCRTextMeta(has_text=True, text_length=6),
+    }
+    storage.get_ocr_result.return_value = OCRResult(text="sample", confidence=None)
+    storage.bulk_get_label_example_features.return_value = {
+        "ex-1": {"embedding": [1.0, 0.0], "ocr_text": ""}
+    }
+    embeddings = Mock()
+    embeddings.embed_texts.return_value = [[1.0, 0.0], [1.0, 0.0]]
+    service = LabelClassificationService(embeddings=embeddings, storage=storage)
+
+    service.classify_job_files("job-1")
+
+    storage.bulk_get_label_example_features.assert_called_once_with(["ex-1"])
+    storage.get_label_example_features.assert_not_called()
+    assert storage.get_ocr_result.call_count == 2
+    storage.get_file_label_override.assert_not_called()
+    storage.get_ocr_text_meta.assert_not_called()
+    (records,) = storage.bulk_upsert_file_label_assignments.call_args.args
+    assert records[0].score == 1.0
+
+
+def test_classify_file_reports_best_and_second_score() -> None:
+    storage = Mock()
+    storage.list_labels.return_value = [
+        Mock(label_id="label-1"),
+        Mock(label_id="label-2"),
+        Mock(label_id="label-3"),
+    ]
+    storage.list_label_examples.side_effect = lambda label_id: [Mock(example_id=f"ex-{label_id}")]
+    storage.bulk_get_label_example_features.return_value = {
+        "ex-label-1": {"embedding": [0.995, 0.0]},
+        "ex-label-2": {"embedding": [1.0, 0.0]},
+        "ex-label-3": {"embedding": [0.0, 1.0]},
+    }
+    storage.get_file_label_override.return_value = None
+    storage.get_ocr_result.return_value = OCRResult(text="sample", confidence=None)
+    embeddings = Mock()
+    embeddings.embed_text.return_value = [1.0, 0.0]
+    service = LabelClassificationService(embeddings=embeddings, storage=storage)
+
+    result = service.classify_file("job-1", "file-1")
+
+    assert result["status"] == "AMBIGUOUS"
+    assert result["score"] == 1.0
+    assert [label_id for label_id, _ in result["candidates"]] == [
+        "label-2",
+        "label-1",
+        "label-3",
+    ]
+    assert "second=0.9950" in result["rationale"]
+
+
+def test_classify_job_runs_llm_fallback_after_assignments_saved() -> None:
+    storage = Mock()
+    storage.get_job_files.return_value = [
+        FileRef(file_id="file-1", name="a.jpg", mime_type="image/jpeg", sort_index=0)
+    ]
+    storage.list_labels.return_value = [Mock(label_id="label-1")]
+    storage.list_label_examples.return_value = [Mock(example_id="ex-1")]
+    storage.list_file_label_overrides.return_value = []
+    storage.list_ocr_text_meta.return_value = {
+        "file-1": OCRTextMeta(has_text=True, text_length=6),
+    }
+    storage.get_ocr_result.return_value = OCRResult(text="sample", confidence=None)
+    storage.bulk_get_label_example_features.return_value = {
+        "ex-1": {"embedding": [0.0, 1.0], "ocr_text": ""}
+    }
+    embeddings = Mock()
+    embeddings.embed_texts.return_value = [[1.0, 0.0]]
+    saved_before_fallback = []
+    fallback = Mock()
+    fallback.classify_file.side_effect = lambda *_: saved_before_fallback.append(
+        storage.bulk_upsert_file_label_assignments.called
+    )
+    service = LabelClassificationService(
+        embeddings=embeddings, storage=storage, llm_fallback=fallback
+    )
+
+    service.classify_job_files("job-1")
+
+    fallback.classify_file.assert_called_once_with("job-1", "file-1")
+    assert saved_before_fallback == [True]
+    storage.bulk_upsert_file_timings.assert_called_once()
+
+
+def test_lexical_scores_skip_labels_that_cannot_reach_runner_up() -> None:
+    groups = [
+        ("label-1", [frozenset({"a", "b", "c", "d"})]),
+        ("label-2", [frozenset({"a", "b", "c", "x"})]),
+        ("label-3", [frozenset({"a"})]),
+    ]
+    query = {"a", "b", "c", "d"}
+
+    pruned = LabelClassificationService._lexical_label_scores(query, groups, prune=True)
+    full = LabelClassificationService._lexical_label_scores(query, groups, prune=False)
+
+    assert pruned == {"label-1": 1.0, "label-2": 0.6}
+    assert full == {"label-1": 1.0, "label-2": 0.6, "label-3": 0.25}
@@ -0,0 +1,50 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.adapters.sqlite_storage import SQLiteStorage
+
+
+def test_label_example_embedding_is_stored_unit_length(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+
+    storage.save_label_example_features("example-1", "text", [3.0, 4.0], {"ab"})
+    features = storage.get_label_example_features("example-1")
+
+    assert features is not None
+    assert list(features["embedding"]) == pytest.approx([0.6, 0.8])
+    assert features["token_fingerprint"] == {"ab"}
+
+
+def test_label_example_legacy_json_embedding_is_normalized(tmp_path) -> None:
+    db_path = tmp_path / "test.db"
+    storage = SQLiteStorage(str(db_path))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO label_example_features(
+                example_id, ocr_text, embedding_json, token_fingerprint, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            ("example-1", "text", json.dumps([0.0, 2.0]), None, "2024-01-01T00:00:00"),
+        )
+
+    features = storage.get_label_example_features("example-1")
+
+    assert features is not None
+    assert list(features["embedding"]) == pytest.approx([0.0, 1.0])
+
+
+def test_bulk_get_label_example_features(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    storage.save_label_example_features("example-1", "one", [1.0, 0.0], None)
+    storage.save_label_example_features("example-2", "two", None, {"two"})
+
+    features = storage.bulk_get_label_example_features(["example-1", "example-2", "missing"])
+
+    assert set(features) == {"example-1", "example-2"}
+    assert list(features["example-1"]["embedding"]) == [1.0, 0.0]
+    assert features["example-2"]["embedding"] is None
+    assert features["example-2"]["token_fingerprint"] == {"two"}
@@ -3,6 +3,7 @@ from unittest.mock import Mock
 import pytest
 
 from app.domain.labels import Label, LabelExample
+from app.domain.models import OCRResult
 from app.services.label_service import LabelService
 
 
@@ -78,12 +79,63 @@ def test_process_examples_embeddings_fallback_to_tokens() -> None:
     ocr = Mock()
     ocr.extract_text.return_value = Mock(text="hello world")
     embeddings = Mock()
+    embeddings.embed_texts.side_effect = RuntimeError("Embeddings not configured")
     embeddings.embed_text.side_effect = RuntimeError("Embeddings not configured")
     service = LabelService(drive=drive, ocr=ocr, embeddings=embeddings, storage=storage)
 
     service.process_examples(None)
 
-    storage.save_label_example_features.assert_called_once()
+    storage.save_label_example_features.assert_called_once_with(
+        "ex-1", "hello world", None, {"hello", "world"}
+    )
+
+
+def test_process_examples_retries_each_example_after_batch_failure() -> None:
+    storage = Mock()
+    storage.list_labels.return_value = [
+        Label(
+            label_id="label-1",
+            name="Test",
+            is_active=True,
+            created_at=None,
+            extraction_schema_json="{}",
+            naming_template="",
+            llm="",
+        )
+    ]
+    storage.list_label_examples.return_value = [
+        LabelExample(
+            example_id=f"ex-{index}",
+            label_id="label-1",
+            file_id=f"file-{index}",
+            filename=f"file-{index}",
+            created_at=None,
+        )
+        for index in (1, 2)
+    ]
+    storage.get_ocr_result.side_effect = lambda _job_id, file_id: OCRResult(
+        text=f"text {file_id}", confidence=None
+    )
+
+    def embed_text(text: str) -> list[float]:
+        if text == "text file-2":
+            raise RuntimeError("input rejected")
+        return [1.0, 0.0]
+
+    embeddings = Mock()
+    embeddings.embed_texts.side_effect = RuntimeError("input rejected")
+    embeddings.embed_text.side_effect = embed_text
+    service = LabelService(drive=Mock(), ocr=Mock(), embeddings=embeddings, storage=storage)
+
+    service.process_examples(None, job_id="job-1")
+
+    saved = {
+        call.args[0]: (call.args[2], call.args[3])
+        for call in storage.save_label_example_features.call_args_list
+    }
+    assert saved["ex-1"] == ([1.0, 0.0], None)
+    assert saved["ex-2"][0] is None
+    assert saved["ex-2"][1] == {"text", "file"}
 
 
 def test_process_examples_reuses_job_ocr_text() -> None:
@@ -112,7 +164,7 @@ def test_process_examples_reuses_job_ocr_text() -> None:
     drive = Mock()
     ocr = Mock()
     embeddings = Mock()
-    embeddings.embed_text.return_value = []
+    embeddings.embed_texts.return_value = [[]]
     service = LabelService(drive=drive, ocr=ocr, embeddings=embeddings, storage=storage)
 
     service.process_examples(None, job_id="job-1")
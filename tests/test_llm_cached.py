@@ -0,0 +1,44 @@
+from app.adapters.llm_cached import CachedLLMAdapter
+from app.adapters.sqlite_storage import SQLiteStorage
+from app.domain.label_fallback import LabelFallbackCandidate, LabelFallbackClassification
+
+
+class CountingLLM:
+    def __init__(self, signals: list[str]) -> None:
+        self.calls: list[str] = []
+        self._signals = signals
+
+    def classify_label(
+        self, ocr_text: str, candidates: list[LabelFallbackCandidate]
+    ) -> LabelFallbackClassification:
+        self.calls.append(ocr_text)
+        return LabelFallbackClassification(
+            label_name=candidates[0].name, confidence=0.9, signals=list(self._signals)
+        )
+
+
+def test_cached_llm_reuses_classification_for_same_prompt(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    inner = CountingLLM(signals=["OK"])
+    adapter = CachedLLMAdapter(inner, storage, model="test-model")
+    invoice = [LabelFallbackCandidate(name="INVOICE", instructions="Find invoices.")]
+    receipt = [LabelFallbackCandidate(name="RECEIPT", instructions="Find receipts.")]
+
+    first = adapter.classify_label("text", invoice)
+    again = adapter.classify_label("text", invoice)
+    adapter.classify_label("text", receipt)
+
+    assert first == again == LabelFallbackClassification("INVOICE", 0.9, ["OK"])
+    assert inner.calls == ["text", "text"]
+
+
+def test_cached_llm_does_not_cache_request_failures(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    inner = CountingLLM(signals=["LLM_REQUEST_FAILED"])
+    adapter = CachedLLMAdapter(inner, storage, model="test-model")
+    candidates = [LabelFallbackCandidate(name="INVOICE", instructions="Find invoices.")]
+
+    adapter.classify_label("text", candidates)
+    adapter.classify_label("text", candidates)
+
+    assert inner.calls == ["text", "text"]
@@ -151,6 +151,99 @@ def test_fallback_service_requires_llm_config(tmp_path, monkeypatch) -> None:
         service.classify_unlabeled_files(job_id)
 
 
+@pytest.mark.parametrize("workers", [1, 4])
+def test_fallback_service_stores_every_file_serial_or_parallel(
+    tmp_path, monkeypatch, workers: int
+) -> None:
+    import app.services.llm_fallback_label_service as service_module
+
+    storage = _storage(tmp_path)
+    _seed_labels(storage, [{"name": "INVOICE", "llm": "Find invoices."}])
+    job_id = _setup_job(storage)
+    llm = _RecordingLLM(label_name="INVOICE", confidence=0.9, signals=["OK"])
+    service = LLMFallbackLabelService(storage, llm)
+    _set_llm_config(monkeypatch, provider="openai", api_key="key")
+    monkeypatch.setattr(service_module, "LLM_WORKERS", workers)
+
+    service.classify_unlabeled_files(job_id)
+
+    stored = storage.list_llm_label_classifications(job_id)
+    assert sorted(stored) == ["file-1", "file-2"]
+    assert sorted(call.text for call in llm.calls) == ["id text", "invoice text"]
+
+
+def test_fallback_classify_file_caches_job_context_until_reset(
+    tmp_path, monkeypatch
+) -> None:
+    storage = _storage(tmp_path)
+    _seed_labels(storage, [{"name": "INVOICE", "llm": "Find invoices."}])
+    job_id = _setup_job(storage)
+    llm = _RecordingLLM(label_name="INVOICE", confidence=0.9, signals=[])
+    service = LLMFallbackLabelService(storage, llm)
+    _set_llm_config(monkeypatch, provider="openai", api_key="key")
+    list_assignments = storage.list_file_label_assignments
+    assignment_loads = []
+
+    def counting_list_assignments(job_id_arg: str):
+        assignment_loads.append(job_id_arg)
+        return list_assignments(job_id_arg)
+
+    monkeypatch.setattr(storage, "list_file_label_assignments", counting_list_assignments)
+
+    service.classify_file(job_id, "file-1")
+    service.classify_file(job_id, "file-2")
+    assert assignment_loads == [job_id]
+    assert len(llm.calls) == 2
+
+    storage.upsert_file_label_assignment(job_id, "file-1", "label-1", 0.9, "MATCHED")
+    service.reset_cache(job_id)
+    service.classify_file(job_id, "file-1")
+    assert assignment_loads == [job_id, job_id]
+    assert len(llm.calls) == 2
+
+
+def test_fallback_candidates_reused_until_labels_change(tmp_path, monkeypatch) -> None:
+    import app.services.llm_fallback_label_service as service_module
+
+    storage = _storage(tmp_path)
+    _seed_labels(storage, [{"name": "INVOICE", "llm": "Find invoices."}])
+    service = LLMFallbackLabelService(storage, _RecordingLLM(None, 0.0, []))
+    builds = []
+    build_candidates = service_module.list_fallback_candidates
+
+    def counting_build(labels: list[dict]):
+        builds.append(len(labels))
+        return build_candidates(labels)
+
+    monkeypatch.setattr(service_module, "list_fallback_candidates", counting_build)
+
+    first = service._load_fallback_candidates()
+    second = service._load_fallback_candidates()
+    assert builds == [1]
+    assert first == second == [
+        LabelFallbackCandidate(name="INVOICE", instructions="Find invoices.")
+    ]
+
+    _seed_labels(storage, [{"name": "ID", "llm": "Find IDs."}])
+    assert [item.name for item in service._load_fallback_candidates()] == ["INVOICE", "ID"]
+    assert builds == [1, 2]
+
+
+def test_window_ocr_text_keeps_head_tail_and_numeric_tokens() -> None:
+    from app.services.llm_fallback_label_service import _window_ocr_text
+
+    text = "RAW_OCR\n" + "a" * 200 + "\n\nNUMERIC_TOKENS\n287012345678\n\nRAW_OCR_END" + "z" * 200
+
+    windowed = _window_ocr_text(text, 120)
+
+    assert len(windowed) <= 120
+    assert windowed.startswith("RAW_OCR\naaa")
+    assert windowed.endswith("\n\nNUMERIC_TOKENS\n287012345678")
+    assert "zzz\n\nNUMERIC" in windowed
+    assert _window_ocr_text("short", 120) == "short"
+    assert _window_ocr_text(text, 0) == text
+
+
 def _storage(tmp_path):
     from app.adapters.sqlite_storage import SQLiteStorage
 
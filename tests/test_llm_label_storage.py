@@ -76,3 +76,16 @@ def test_llm_label_overrides_round_trip(tmp_path) -> None:
     assert results == {"file-1": "INVOICE"}
     storage.clear_llm_label_override("job-1", "file-1")
     assert storage.get_llm_label_override("job-1", "file-1") is None
+
+
+def test_cached_llm_response_round_trip(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    assert storage.get_cached_llm_response("key-1") is None
+
+    storage.save_cached_llm_response("key-1", {"schema": {"type": "object"}, "instructions": ""})
+    storage.save_cached_llm_response("key-1", {"schema": {"type": "object"}, "instructions": "x"})
+
+    assert storage.get_cached_llm_response("key-1") == {
+        "schema": {"type": "object"},
+        "instructions": "x",
+    }
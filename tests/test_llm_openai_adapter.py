@@ -193,3 +193,37 @@ def test_openai_adapter_image_page_cap_is_applied(monkeypatch) -> None:
 
     images = adapter._images_from_file_bytes(b"pdf", "application/pdf")
     assert len(images) == 2
+
+
+def test_openai_adapter_posts_pre_encoded_json_body(monkeypatch) -> None:
+    import app.adapters.llm_openai as adapter_module
+
+    adapter = _adapter()
+    sent: dict = {}
+
+    class _FakeResponse:
+        status_code = 200
+        text = ""
+
+        @staticmethod
+        def json() -> dict:
+            return {"output_text": "{}"}
+
+    def _fake_post(url, headers, data, timeout):
+        sent.update(url=url, data=data)
+        return _FakeResponse()
+
+    monkeypatch.setattr(adapter_module.requests, "post", _fake_post)
+
+    adapter._post_response(
+        [{"role": "user", "content": "hi"}],
+        response_format={"type": "json_object"},
+        max_tokens=10,
+        model="mock",
+    )
+
+    assert isinstance(sent["data"], bytes)
+    body = json.loads(sent["data"])
+    assert body["model"] == "mock"
+    assert body["max_output_tokens"] == 10
+    assert body["text"] == {"format": {"type": "json_object"}}
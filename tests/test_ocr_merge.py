@@ -0,0 +1,50 @@
+from app.services.ocr_merge import merge_ocr_text, normalize_ocr_text
+
+
+def test_merge_ocr_text_extracts_numeric_tokens_and_lines() -> None:
+    raw = "Civil ID: 2870-1234 5678\nName: Ali\nRef 12345"
+    merged = merge_ocr_text(raw, "civil id 287012345678")
+
+    assert "NUMERIC_TOKENS\n287012345678" in merged
+    assert "RAW_NUMERIC_LINES\nCivil ID: 2870-1234 5678" in merged
+    assert "Ref 12345" not in merged.split("RAW_NUMERIC_LINES")[1]
+
+
+def test_merge_ocr_text_without_numbers_has_no_numeric_sections() -> None:
+    merged = merge_ocr_text("hello world", "")
+
+    assert merged == "RAW_OCR\nhello world"
+
+
+def test_normalize_ocr_text_folds_forms_and_spacing() -> None:
+    text = "\ufefb  Name:\t Ali \nＩＤ   ١٢٣"
+
+    assert normalize_ocr_text(text) == "\u0644\u0627 Name: Ali\nID ١٢٣"
+    assert normalize_ocr_text(None) == ""
+
+
+def test_merge_ocr_text_dedupes_tokens_across_raw_and_preprocessed() -> None:
+    raw = "ID 123456\nPhone 99-88-77-66"
+    merged = merge_ocr_text(raw, "123456 and 555 444 333")
+
+    assert "NUMERIC_TOKENS\n123456 99887766 555444333\n" in merged
+    assert "RAW_NUMERIC_LINES\nID 123456\nPhone 99-88-77-66" in merged
+
+
+def test_merge_ocr_text_compacts_tab_and_hyphen_separated_runs() -> None:
+    merged = merge_ocr_text("No.\t12\t34-56  78", "")
+
+    assert "NUMERIC_TOKENS\n12345678" in merged
+
+
+def test_normalize_ocr_text_keeps_superscripts_and_fractions() -> None:
+    text = "Area 12345² m\nShare ½ ¾ ①②③④⑤⑥"
+
+    assert normalize_ocr_text(text) == text
+
+
+def test_merge_ocr_text_does_not_read_digit_forms_as_digits() -> None:
+    merged = merge_ocr_text("Ref 12345²\nShare 1234½\nNo. ①②③④⑤⑥", "")
+
+    assert "NUMERIC_TOKENS" not in merged
+    assert "RAW_NUMERIC_LINES" not in merged
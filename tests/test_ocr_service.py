@@ -1,10 +1,13 @@
 from unittest.mock import Mock
 
-from app.domain.models import FileRef, OCRResult
+import pytest
+
+from app.domain.models import FileRef, OCRResult, OCRTextMeta
 from app.services.ocr_service import OCRService
 
 
-def test_run_ocr_processes_files_in_order() -> None:
+def test_run_ocr_processes_files_in_order(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.ocr_service.OCR_WORKERS", 2)
     job_files = [
         FileRef(file_id="f2", name="b.png", mime_type="image/png"),
         FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg"),
@@ -12,21 +15,35 @@ def test_run_ocr_processes_files_in_order() -> None:
     storage = Mock()
     storage.get_job_files.return_value = job_files
     drive = Mock()
-    drive.download_file_bytes.side_effect = [b"b", b"a"]
+    drive.download_file_bytes.side_effect = {"f2": b"b", "f1": b"a"}.__getitem__
     ocr = Mock()
-    ocr.extract_text.side_effect = [
-        OCRResult(text="text-b", confidence=0.1),
-        OCRResult(text="text-a", confidence=0.2),
-    ]
+    ocr.extract_text.side_effect = {
+        b"b": OCRResult(text="text-b", confidence=0.1),
+        b"a": OCRResult(text="text-a", confidence=0.2),
+    }.__getitem__
+
+    events: list[dict] = []
 
     service = OCRService(drive=drive, ocr=ocr, storage=storage)
-    service.run_ocr("job-1")
+    service.run_ocr("job-1", progress_callback=events.append)
 
-    assert drive.download_file_bytes.call_args_list == [(("f2",),), (("f1",),)]
-    assert ocr.extract_text.call_args_list == [((b"b",),), ((b"a",),)]
-    assert storage.save_ocr_result.call_args_list == [
-        (("job-1", "f2", OCRResult(text="text-b", confidence=0.1)),),
-        (("job-1", "f1", OCRResult(text="text-a", confidence=0.2)),),
+    # Downloads and OCR run concurrently; results are saved in one batch afterwards.
+    assert sorted(drive.download_file_bytes.call_args_list) == [(("f1",),), (("f2",),)]
+    storage.save_ocr_result.assert_not_called()
+    storage.bulk_save_ocr_results.assert_called_once_with(
+        "job-1",
+        {
+            "f2": OCRResult(text="text-b", confidence=0.1),
+            "f1": OCRResult(text="text-a", confidence=0.2),
+        },
+    )
+    timings = storage.bulk_upsert_file_timings.call_args.args[0]
+    assert sorted(record.file_id for record in timings) == ["f1", "f2"]
+    assert len({record.updated_at for record in timings}) == 1
+    # Start events are still emitted in job order.
+    assert [event["file_id"] for event in events if event["stage"] == "download_started"] == [
+        "f2",
+        "f1",
     ]
 
 
@@ -152,10 +169,9 @@ def test_run_ocr_skip_cached_emits_counts(monkeypatch) -> None:
     ]
     storage = Mock()
     storage.get_job_files.return_value = job_files
-    storage.get_ocr_result.side_effect = [
-        OCRResult(text="already there", confidence=None),
-        None,
-    ]
+    storage.list_ocr_text_meta.return_value = {
+        "cached": OCRTextMeta(has_text=True, text_length=13)
+    }
     drive = Mock()
     drive.download_file_bytes.return_value = b"a"
     ocr = Mock()
@@ -174,3 +190,95 @@ def test_run_ocr_skip_cached_emits_counts(monkeypatch) -> None:
     assert events[-1]["stage"] == "complete"
     assert events[-1]["processed"] == 1
     assert events[-1]["skipped_cached"] == 1
+    storage.list_ocr_text_meta.assert_called_once_with("job-1")
+    storage.get_ocr_result.assert_not_called()
+
+
+def test_run_ocr_parallel_downloads_inside_workers(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.ocr_service.OCR_WORKERS", 2)
+    job_files = [
+        FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg"),
+        FileRef(file_id="f2", name="b.jpg", mime_type="image/jpeg"),
+    ]
+    storage = Mock()
+    storage.get_job_files.return_value = job_files
+    storage.list_ocr_text_meta.return_value = {}
+    drive = Mock()
+    drive.download_file_bytes.side_effect = lambda file_id: file_id.encode()
+    ocr = Mock()
+    ocr.extract_text.side_effect = lambda data: OCRResult(text=data.decode(), confidence=None)
+    events: list[dict] = []
+
+    service = OCRService(drive=drive, ocr=ocr, storage=storage)
+    service.run_ocr("job-1", progress_callback=events.append)
+
+    assert events[0]["stage"] == "start"
+    assert events[0]["mode"] == "parallel"
+    done = {event["file_id"]: event for event in events if event["stage"] == "download_done"}
+    assert {file_id: event["bytes_len"] for file_id, event in done.items()} == {
+        "f1": 2,
+        "f2": 2,
+    }
+    assert sorted(storage.bulk_save_ocr_results.call_args.args[1]) == ["f1", "f2"]
+    assert events[-1]["stage"] == "complete"
+    assert events[-1]["processed"] == 2
+
+
+def test_run_ocr_parallel_saves_successes_before_raising(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.ocr_service.OCR_WORKERS", 2)
+    job_files = [
+        FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg"),
+        FileRef(file_id="bad", name="b.jpg", mime_type="image/jpeg"),
+    ]
+    storage = Mock()
+    storage.get_job_files.return_value = job_files
+    storage.list_ocr_text_meta.return_value = {}
+    drive = Mock()
+    drive.download_file_bytes.side_effect = lambda file_id: file_id.encode()
+
+    def extract(data: bytes) -> OCRResult:
+        if data == b"bad":
+            raise ValueError("unreadable")
+        return OCRResult(text="ok", confidence=None)
+
+    ocr = Mock()
+    ocr.extract_text.side_effect = extract
+
+    service = OCRService(drive=drive, ocr=ocr, storage=storage)
+    with pytest.raises(RuntimeError, match="OCR failed for file bad"):
+        service.run_ocr("job-1")
+
+    storage.bulk_save_ocr_results.assert_called_once_with(
+        "job-1", {"f1": OCRResult(text="ok", confidence=None)}
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_ocr_emits_same_per_file_stages_in_both_modes(monkeypatch, workers) -> None:
+    monkeypatch.setattr("app.services.ocr_service.OCR_WORKERS", workers)
+    job_files = [
+        FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg"),
+        FileRef(file_id="f2", name="b.jpg", mime_type="image/jpeg"),
+    ]
+    storage = Mock()
+    storage.get_job_files.return_value = job_files
+    storage.list_ocr_text_meta.return_value = {}
+    drive = Mock()
+    drive.download_file_bytes.side_effect = lambda file_id: file_id.encode()
+    ocr = Mock()
+    ocr.extract_text.side_effect = lambda data: OCRResult(text=data.decode(), confidence=None)
+    events: list[dict] = []
+
+    service = OCRService(drive=drive, ocr=ocr, storage=storage)
+    service.run_ocr("job-1", progress_callback=events.append)
+
+    assert events[0]["mode"] == ("serial" if workers == 1 else "parallel")
+    for file_id in ("f1", "f2"):
+        assert [event["stage"] for event in events if event.get("file_id") == file_id] == [
+            "download_started",
+            "download_done",
+            "ocr_started",
+            "ocr_done",
+            "save_started",
+            "save_done",
+        ]
@@ -1,5 +1,7 @@
+import sqlite3
+
 from app.adapters.sqlite_storage import SQLiteStorage
-from app.domain.models import OCRResult
+from app.domain.models import FileRef, OCRResult, OCRTextMeta
 
 
 def test_save_and_get_ocr_result_overwrites(tmp_path) -> None:
@@ -32,3 +34,71 @@ def test_save_and_get_ocr_result_with_null_confidence(tmp_path) -> None:
     fetched = storage.get_ocr_result(job_id, file_id)
 
     assert fetched == result
+
+
+def test_bulk_save_ocr_results_upserts_rows_and_meta(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    storage.save_ocr_result("job-1", "file-1", OCRResult(text="old", confidence=0.1))
+
+    storage.bulk_save_ocr_results(
+        "job-1",
+        {
+            "file-1": OCRResult(text="new", confidence=0.8),
+            "file-2": OCRResult(text="  ", confidence=None),
+        },
+    )
+    storage.bulk_save_ocr_results("job-1", {})
+
+    assert storage.get_ocr_result("job-1", "file-1") == OCRResult(text="new", confidence=0.8)
+    assert storage.get_ocr_text_meta("job-1", "file-2") == OCRTextMeta(
+        has_text=False, text_length=2
+    )
+
+
+def test_ocr_text_meta_flags_blank_text(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+
+    storage.save_ocr_result("job-1", "file-1", OCRResult(text=" \n\t", confidence=None))
+    storage.save_ocr_result("job-1", "file-2", OCRResult(text="hello", confidence=None))
+
+    assert storage.get_ocr_text_meta("job-1", "file-1") == OCRTextMeta(False, 3)
+    assert storage.get_ocr_text_meta("job-1", "file-2") == OCRTextMeta(True, 5)
+    assert storage.get_ocr_text_meta("job-1", "missing") is None
+
+
+def test_ocr_text_meta_backfilled_for_legacy_rows(tmp_path) -> None:
+    db_path = tmp_path / "test.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE ocr_results(
+                file_id TEXT PRIMARY KEY,
+                ocr_text TEXT,
+                ocr_confidence REAL,
+                updated_at TEXT
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO ocr_results VALUES ('file-1', 'legacy text', NULL, '2025-01-01')"
+        )
+
+    storage = SQLiteStorage(str(db_path))
+
+    assert storage.get_ocr_text_meta("job-1", "file-1") == OCRTextMeta(True, 11)
+
+
+def test_list_ocr_results_returns_job_files_only(tmp_path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "test.db"))
+    job = storage.create_job("folder-1")
+    storage.save_job_files(
+        job.job_id, [FileRef(file_id="file-1", name="a.jpg", mime_type="image/jpeg")]
+    )
+    storage.save_ocr_result(job.job_id, "file-1", OCRResult(text="one", confidence=0.5))
+    storage.save_ocr_result("other-job", "file-2", OCRResult(text="two", confidence=None))
+
+    assert storage.list_ocr_results(job.job_id) == {
+        "file-1": OCRResult(text="one", confidence=0.5)
+    }
+    storage.save_ocr_result(job.job_id, "file-1", OCRResult(text="  ", confidence=None))
+    assert storage.list_ocr_text_meta(job.job_id) == {"file-1": OCRTextMeta(False, 2)}
@@ -5,7 +5,18 @@ class DummyEmbeddings:
     def embed_text(self, text: str) -> list[float]:
         return [1.0]
 
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [[1.0] for _ in texts]
+
 
 def test_embeddings_port_runtime_checkable() -> None:
     dummy = DummyEmbeddings()
     assert isinstance(dummy, EmbeddingsPort)
+
+
+def test_embeddings_port_embed_texts_defaults_to_per_text_calls() -> None:
+    class Adapter(EmbeddingsPort):
+        def embed_text(self, text: str) -> list[float]:
+            return [float(len(text))]
+
+    assert Adapter().embed_texts(["a", "abc"]) == [[1.0], [3.0]]
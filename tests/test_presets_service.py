@@ -28,6 +28,18 @@ def test_seed_if_empty_loads_presets(tmp_path, monkeypatch) -> None:
     storage.bulk_insert_label_presets.assert_called_once()
 
 
+def test_seed_if_empty_rejects_invalid_json(tmp_path, monkeypatch) -> None:
+    storage = Mock()
+    storage.count_labels.return_value = 0
+    presets_path = tmp_path / "presets.json"
+    presets_path.write_bytes(b"[{not json")
+    service = PresetsService(storage)
+    monkeypatch.setattr(service, "_presets_path", lambda: presets_path)
+
+    with pytest.raises(RuntimeError, match="Failed to load presets.json"):
+        service.seed_if_empty()
+
+
 def test_export_presets_writes_file(tmp_path, monkeypatch) -> None:
     storage = Mock()
     storage.export_labels_for_presets.return_value = [{"label_id": "l1"}]
@@ -77,3 +77,39 @@ def test_rendering_falls_back_for_blank_extracted_text() -> None:
         files=files,
     )
     assert "EXTRACTED_TEXT:\n<<<PENDING_EXTRACTION>>>" in output
+
+
+def test_rendering_accepts_file_ref_objects() -> None:
+    from app.domain.models import FileRef
+
+    files = [
+        FileRef(file_id="f2", name="b.png", mime_type="image/png", sort_index=1),
+        FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg", sort_index=0),
+    ]
+    output = render_increment2_report(
+        job_id="job-123",
+        folder_id="folder-abc",
+        generated_at_local_iso="2025-01-01T12:00:00",
+        files=files,
+    )
+
+    assert "INDEX: 1\nFILE_NAME: a.jpg\nFILE_ID: f1\nMIME_TYPE: image/jpeg" in output
+    assert "EXTRACTED_TEXT:\n<<<PENDING_EXTRACTION>>>" in output
+
+
+def test_rendering_accepts_mixed_dicts_and_file_ref_objects() -> None:
+    from app.domain.models import FileRef
+
+    files = [
+        FileRef(file_id="f2", name="b.png", mime_type="image/png", sort_index=1),
+        {"sort_index": 0, "name": "a.jpg", "file_id": "f1", "mime_type": "image/jpeg"},
+    ]
+    output = render_increment2_report(
+        job_id="job-123",
+        folder_id="folder-abc",
+        generated_at_local_iso="2025-01-01T12:00:00",
+        files=files,
+    )
+
+    assert "INDEX: 1\nFILE_NAME: a.jpg\nFILE_ID: f1\nMIME_TYPE: image/jpeg" in output
+    assert "INDEX: 2\nFILE_NAME: b.png\nFILE_ID: f2\nMIME_TYPE: image/png" in output
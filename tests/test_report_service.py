@@ -1,12 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from unittest.mock import Mock, patch
 
+import pytest
+
 from app.domain.labels import Label
 from app.domain.models import (
     AppliedRename,
     ExtractionRecord,
+    FileLabelOverride,
     FileRef,
+    FileTimingRecord,
     Job,
     LabelAssignment,
     LLMLabelClassification,
@@ -25,6 +29,7 @@ class FakeStorage:
     llm_overrides: dict[str, str]
     llm_classifications: dict[str, LLMLabelClassification]
     extractions: dict[str, ExtractionRecord]
+    label_queries: list[list[str]] = field(default_factory=list)
 
     def get_job(self, job_id: str) -> Job | None:
         if job_id != self.job.job_id:
@@ -53,40 +58,42 @@ class FakeStorage:
             for file_id, new_name in self.applied_renames.items()
         ]
 
-    def get_file_timings(self, job_id: str, file_id: str):
-        return None
+    def list_file_timings(self, job_id: str) -> dict[str, FileTimingRecord]:
+        return {}
 
-    def get_extraction(self, job_id: str, file_id: str) -> ExtractionRecord | None:
+    def list_extractions(self, job_id: str) -> dict[str, ExtractionRecord]:
         if job_id != self.job.job_id:
-            return None
-        return self.extractions.get(file_id)
+            return {}
+        return dict(self.extractions)
 
-    def get_file_label_override(self, job_id: str, file_id: str) -> str | None:
+    def list_file_label_overrides(self, job_id: str) -> list[FileLabelOverride]:
         if job_id != self.job.job_id:
-            return None
-        return self.label_overrides.get(file_id)
+            return []
+        return [
+            FileLabelOverride(job_id=job_id, file_id=file_id, label_id=label_id)
+            for file_id, label_id in self.label_overrides.items()
+        ]
 
-    def get_file_label_assignment(
-        self, job_id: str, file_id: str
-    ) -> LabelAssignment | None:
+    def list_file_label_assignments(self, job_id: str) -> list[LabelAssignment]:
         if job_id != self.job.job_id:
-            return None
-        return self.label_assignments.get(file_id)
+            return []
+        return list(self.label_assignments.values())
 
-    def get_label(self, label_id: str) -> Label | None:
-        return self.labels.get(label_id)
+    def list_labels_by_ids(self, label_ids: list[str]) -> list[Label]:
+        self.label_queries.append(list(label_ids))
+        return [self.labels[label_id] for label_id in label_ids if label_id in self.labels]
 
-    def get_llm_label_override(self, job_id: str, file_id: str) -> str | None:
+    def list_llm_label_overrides(self, job_id: str) -> dict[str, str]:
         if job_id != self.job.job_id:
-            return None
-        return self.llm_overrides.get(file_id)
+            return {}
+        return dict(self.llm_overrides)
 
-    def get_llm_label_classification(
-        self, job_id: str, file_id: str
-    ) -> LLMLabelClassification | None:
+    def list_llm_label_classifications(
+        self, job_id: str
+    ) -> dict[str, LLMLabelClassification]:
         if job_id != self.job.job_id:
-            return None
-        return self.llm_classifications.get(file_id)
+            return {}
+        return dict(self.llm_classifications)
 
 
 def test_preview_and_write_report() -> None:
@@ -258,3 +265,303 @@ def test_preview_report_parses_wrapped_fields_payload_and_json_schema() -> None:
     assert "EXTRACTED_FIELDS:\ncivil_id: 123456789012\nbirth_date: 1995-08-07" in report_text
     assert "type: UNKNOWN" not in report_text
     assert "properties: UNKNOWN" not in report_text
+
+
+def test_final_report_summary_uses_label_precedence() -> None:
+    job = Job(
+        job_id="job-123",
+        folder_id="folder-abc",
+        created_at=datetime(2025, 1, 1, 12, 0, 0),
+        status="CREATED",
+    )
+    job_files = [
+        FileRef(file_id=file_id, name=f"{file_id}.jpg", mime_type="image/jpeg")
+        for file_id in ("f1", "f2", "f3", "f4")
+    ]
+    complete = ExtractionRecord(
+        job_id=job.job_id, file_id="", schema_json='{"id": "string"}', fields_json='{"id": "1"}'
+    )
+    storage = FakeStorage(
+        job=job,
+        job_files=job_files,
+        applied_renames={"f1": "one.jpg", "f2": "two.jpg"},
+        label_overrides={"f1": "label-1"},
+        label_assignments={
+            "f2": LabelAssignment(
+                job_id=job.job_id, file_id="f2", label_id=None, status="AMBIGUOUS", score=0.5
+            )
+        },
+        labels={
+            "label-1": Label(
+                label_id="label-1",
+                name="Invoice",
+                is_active=True,
+                created_at=job.created_at,
+                extraction_schema_json="{}",
+                naming_template="",
+                llm="",
+            )
+        },
+        llm_overrides={"f3": "Receipt"},
+        llm_classifications={
+            "f4": LLMLabelClassification(
+                job_id=job.job_id,
+                file_id="f4",
+                label_name=None,
+                confidence=0.0,
+                signals=[],
+                updated_at="2025-01-01T12:00:00+00:00",
+            )
+        },
+        extractions={"f1": complete, "f2": complete, "f3": complete, "f4": complete},
+    )
+
+    summary = ReportService(drive=Mock(), storage=storage).get_final_report_summary(job.job_id)
+
+    # f2 is ambiguous and f4 resolves to UNLABELED; f1 and f3 are complete.
+    assert summary == {"renamed": 2, "skipped": 2, "needs_review": 2, "total": 4}
+    assert storage.label_queries == [["label-1"]]
+
+
+def test_extraction_payload_parsed_once_per_lookups() -> None:
+    from app.services.report_service import _ReportLookups
+
+    lookups = _ReportLookups(
+        extractions={
+            "f1": ExtractionRecord(
+                job_id="job-1",
+                file_id="f1",
+                schema_json='{"id": "string"}',
+                fields_json='{"id": "7"}',
+            )
+        },
+        timings={},
+        label_overrides={},
+        assignments={},
+        llm_overrides={},
+        llm_classifications={},
+    )
+    service = ReportService(drive=Mock(), storage=Mock())
+
+    with patch.object(
+        ReportService, "_load_json_dict", wraps=ReportService._load_json_dict
+    ) as load_json:
+        first = service._get_extraction_payload("f1", lookups)
+        second = service._get_extraction_payload("f1", lookups)
+
+    assert first == second == ({"id": "7"}, {"id": "string"})
+    assert load_json.call_count == 2
+
+
+def test_load_json_dict_reuses_parse_for_identical_text() -> None:
+    text = '{"id": "reuse-me"}'
+
+    first = ReportService._load_json_dict(text)
+    second = ReportService._load_json_dict(text)
+
+    assert first == {"id": "reuse-me"}
+    assert second is first
+    assert ReportService._load_json_dict("[1, 2]") is None
+    assert ReportService._load_json_dict("{bad") is None
+
+
+def test_preview_report_resolves_shared_labels_with_one_query() -> None:
+    job = Job(
+        job_id="job-123",
+        folder_id="folder-abc",
+        created_at=datetime(2025, 1, 1, 12, 0, 0),
+        status="CREATED",
+    )
+    job_files = [
+        FileRef(file_id=file_id, name=f"{file_id}.jpg", mime_type="image/jpeg")
+        for file_id in ("f1", "f2", "f3")
+    ]
+    storage = FakeStorage(
+        job=job,
+        job_files=job_files,
+        applied_renames={},
+        label_overrides={"f3": "deleted-label"},
+        label_assignments={
+            file_id: LabelAssignment(
+                job_id=job.job_id, file_id=file_id, label_id="label-1", status="MATCHED", score=0.9
+            )
+            for file_id in ("f1", "f2", "f3")
+        },
+        labels={
+            "label-1": Label(
+                label_id="label-1",
+                name="Invoice",
+                is_active=True,
+                created_at=job.created_at,
+                extraction_schema_json="{}",
+                naming_template="",
+                llm="",
+            )
+        },
+        llm_overrides={},
+        llm_classifications={},
+        extractions={},
+    )
+
+    report_text = ReportService(drive=Mock(), storage=storage).preview_report(job.job_id)
+
+    # A dangling override falls back to the assignment's label.
+    assert report_text.count("FINAL_LABEL: Invoice") == 3
+    assert storage.label_queries == [["deleted-label", "label-1"]]
+
+
+def test_fields_have_unknown_flags_blank_values() -> None:
+    assert not ReportService._fields_have_unknown({"id": "1", "tags": ["a"]})
+    assert ReportService._fields_have_unknown({"id": "1", "tags": [" "]})
+    assert ReportService._fields_have_unknown({"id": " "})
+    assert ReportService._fields_have_unknown({"id": None})
+    assert ReportService._fields_have_unknown({"id": {}})
+    assert ReportService._fields_have_unknown({})
+    assert ReportService._fields_have_unknown(None)
+
+
+def test_preview_report_orders_by_sort_index_then_final_name() -> None:
+    job = Job(
+        job_id="job-123",
+        folder_id="folder-abc",
+        created_at=datetime(2025, 1, 1, 12, 0, 0),
+        status="CREATED",
+    )
+    storage = FakeStorage(
+        job=job,
+        job_files=[
+            FileRef(file_id="f1", name="z.jpg", mime_type="image/jpeg", sort_index=1),
+            FileRef(file_id="f2", name="b.jpg", mime_type="image/jpeg", sort_index=1),
+            FileRef(file_id="f3", name="c.jpg", mime_type="image/jpeg", sort_index=0),
+        ],
+        applied_renames={"f1": "a.jpg"},
+        label_overrides={},
+        label_assignments={},
+        labels={},
+        llm_overrides={},
+        llm_classifications={},
+        extractions={},
+    )
+
+    report_text = ReportService(drive=Mock(), storage=storage).preview_report(job.job_id)
+
+    file_ids = [line for line in report_text.splitlines() if line.startswith("FILE_ID: ")]
+    assert file_ids == ["FILE_ID: f3", "FILE_ID: f1", "FILE_ID: f2"]
+    assert "INDEX: 1\nFINAL_NAME: c.jpg" in report_text
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_final_report_summary_same_for_serial_and_parallel_fetch(monkeypatch, workers) -> None:
+    monkeypatch.setattr("app.services.report_service.REPORT_FETCH_WORKERS", workers)
+    job = Job(
+        job_id="job-123",
+        folder_id="folder-abc",
+        created_at=datetime(2025, 1, 1, 12, 0, 0),
+        status="CREATED",
+    )
+    storage = FakeStorage(
+        job=job,
+        job_files=[
+            FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg"),
+            FileRef(file_id="f2", name="b.jpg", mime_type="image/jpeg"),
+        ],
+        applied_renames={"f1": "renamed.jpg"},
+        label_overrides={},
+        label_assignments={},
+        labels={},
+        llm_overrides={"f1": "Receipt"},
+        llm_classifications={},
+        extractions={},
+    )
+
+    summary = ReportService(drive=Mock(), storage=storage).get_final_report_summary(job.job_id)
+
+    assert summary == {"renamed": 1, "skipped": 1, "needs_review": 2, "total": 2}
+
+
+def test_final_report_summary_skips_extraction_parse_for_unlabeled_files() -> None:
+    job = Job(
+        job_id="job-123",
+        folder_id="folder-abc",
+        created_at=datetime(2025, 1, 1, 12, 0, 0),
+        status="CREATED",
+    )
+    storage = FakeStorage(
+        job=job,
+        job_files=[FileRef(file_id="f1", name="a.jpg", mime_type="image/jpeg")],
+        applied_renames={},
+        label_overrides={},
+        label_assignments={},
+        labels={},
+        llm_overrides={},
+        llm_classifications={},
+        extractions={},
+    )
+    service = ReportService(drive=Mock(), storage=storage)
+
+    with patch.object(ReportService, "_get_extraction_payload") as payload:
+        summary = service.get_final_report_summary(job.job_id)
+
+    payload.assert_not_called()
+    assert summary["needs_review"] == 1
+
+
+def test_resolve_final_labels_applies_precedence_layers() -> None:
+    from app.services.report_service import _ReportLookups
+
+    def classification(file_id: str, label_name: str | None) -> LLMLabelClassification:
+        return LLMLabelClassification(
+            job_id="job-1", file_id=file_id, label_name=label_name, confidence=0.9, signals=[]
+        )
+
+    lookups = _ReportLookups(
+        extractions={},
+        timings={},
+        label_overrides={"f1": "label-a"},
+        assignments={
+            file_id: LabelAssignment(
+                job_id="job-1", file_id=file_id, label_id="label-b", status="MATCHED", score=0.9
+            )
+            for file_id in ("f1", "f2")
+        },
+        llm_overrides={"f1": "LLM-OVERRIDE", "f2": "LLM-OVERRIDE", "f3": "LLM-OVERRIDE"},
+        llm_classifications={
+            file_id: classification(file_id, "LLM-GUESS") for file_id in ("f1", "f2", "f3", "f4")
+        },
+    )
+    storage = Mock()
+    storage.list_labels_by_ids.return_value = [
+        Label(
+            label_id=label_id,
+            name=name,
+            is_active=True,
+            created_at=datetime(2025, 1, 1),
+            extraction_schema_json="{}",
+            naming_template="",
+            llm="",
+        )
+        for label_id, name in (("label-a", "Override"), ("label-b", "Assigned"))
+    ]
+
+    final_labels = ReportService(drive=Mock(), storage=storage)._resolve_final_labels(
+        ["f1", "f2", "f3", "f4", "f5"], lookups
+    )
+
+    assert final_labels == {
+        "f1": "Override",
+        "f2": "Assigned",
+        "f3": "LLM-OVERRIDE",
+        "f4": "LLM-GUESS",
+        "f5": "UNLABELED",
+    }
+
+
+def test_schema_keys_follow_properties_then_top_level_keys() -> None:
+    from app.services.report_service import _schema_keys
+
+    with_properties = '{"type": "object", "properties": {"id": {}, "date": {}}}'
+
+    assert _schema_keys(with_properties) == ("id", "date")
+    assert _schema_keys(with_properties) is _schema_keys(with_properties)
+    assert _schema_keys('{"properties": {}, "name": "string"}') == ("properties", "name")
+    assert _schema_keys("not json") == ()
@@ -237,3 +237,117 @@ def test_build_from_ocr_filters_noisy_keys_and_keeps_relevant_fields() -> None:
     assert "j_vey" not in properties
     assert "i" not in properties
     assert "subnet_fol_ee_braer_32" not in properties
+
+
+class _CachingStorage(_RecordingStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.responses: dict[str, dict] = {}
+
+    def get_cached_llm_response(self, cache_key: str) -> dict | None:
+        return self.responses.get(cache_key)
+
+    def save_cached_llm_response(self, cache_key: str, response: dict) -> None:
+        self.responses[cache_key] = response
+
+
+def test_build_from_ocr_reuses_cached_llm_schema() -> None:
+    storage = _CachingStorage()
+    llm = _RecordingLLM()
+    service = SchemaBuilderService(storage=storage, llm=llm, cache_namespace="test-model")
+    ocr_text = "Document Number: 12345"
+
+    first, _ = service.build_from_ocr("label-1", ocr_text, guidance_override="")
+    first_calls = len(llm.calls)
+    second, _ = service.build_from_ocr("label-2", ocr_text, guidance_override="")
+
+    assert first_calls > 0
+    assert len(llm.calls) == first_calls
+    assert len(storage.responses) == first_calls
+    assert second == first
+
+    service.build_from_ocr("label-3", "Document Number: 67890", guidance_override="")
+    assert len(llm.calls) > first_calls
+
+
+def test_ocr_text_to_example_reads_inline_and_trailing_labels() -> None:
+    ocr_text = "  Name :  Jane Doe \n\n12345\n  : Civil Number\nnoise line\r\nAddress:\n"
+
+    example = SchemaBuilderService._ocr_text_to_example(ocr_text)
+
+    assert example["name"] == "Jane Doe"
+    assert example["civil_number"] == "12345"
+    assert example["address"] == ""
+
+
+def test_normalize_label_key_maps_arabic_labels_in_either_order() -> None:
+    from app.services.schema_builder_service import _normalize_label_key
+
+    assert _normalize_label_key(" Civil Number ") == "civil_number"
+    assert _normalize_label_key("الرقم المدني") == "civil_number"
+    assert _normalize_label_key("المدني الرقم") == "civil_number"
+    assert _normalize_label_key("الرقم المدني"[::-1]) == "civil_number"
+
+
+def test_is_valid_key_accepts_only_short_ascii_snake_case() -> None:
+    from app.services.schema_builder_service import _is_valid_key
+
+    assert _is_valid_key("civil_number_2")
+    assert not _is_valid_key("")
+    assert not _is_valid_key("Civil_number")
+    assert not _is_valid_key("civil-number")
+    assert not _is_valid_key("رقم")
+    assert not _is_valid_key("x" * 41)
+
+
+class _DescribedLLM:
+    def __init__(self) -> None:
+        self.calls: list[tuple[dict, str, str | None]] = []
+
+    def extract_fields(
+        self, schema: dict, ocr_text: str, instructions: str | None = None
+    ) -> dict:
+        self.calls.append((schema, ocr_text, instructions))
+        return {
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "document_number": {"type": "string", "description": "Document number"},
+                },
+                "required": ["document_number"],
+                "additionalProperties": False,
+            },
+            "instructions": "ignored",
+        }
+
+
+def test_build_from_ocr_skips_refinement_for_grounded_described_schema() -> None:
+    storage = _RecordingStorage()
+    llm = _DescribedLLM()
+    service = SchemaBuilderService(storage=storage, llm=llm)
+
+    schema, _ = service.build_from_ocr(
+        "label-1", "Document Number: 12345", guidance_override=""
+    )
+
+    assert len(llm.calls) == 1
+    assert set(schema["properties"]) == {"document_number"}
+
+
+def test_build_from_ocr_refines_schema_without_descriptions() -> None:
+    storage = _RecordingStorage()
+    llm = _RecordingLLM()
+    service = SchemaBuilderService(storage=storage, llm=llm)
+
+    service.build_from_ocr("label-1", "Document Number: 12345", guidance_override="")
+
+    assert len(llm.calls) == 2
+    assert "Proposed schema JSON" in llm.calls[1][1]
+
+
+def test_ocr_text_to_example_collects_repeated_labels_into_lists() -> None:
+    ocr_text = "Partner: Ali\nName: Jane Doe\nPartner: Sara\nPartner: Omar"
+
+    example = SchemaBuilderService._ocr_text_to_example(ocr_text)
+
+    assert example == {"partner": ["Ali", "Sara", "Omar"], "name": "Jane Doe"}
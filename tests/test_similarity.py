@@ -1,4 +1,14 @@
-from app.domain.similarity import cosine_similarity, jaccard_similarity, normalize_text_to_tokens
+import pytest
+
+from app.domain.similarity import (
+    cosine_similarity,
+    dot_product,
+    jaccard_batch,
+    jaccard_similarity,
+    jaccard_upper_bound,
+    normalize_text_to_tokens,
+    normalize_vector,
+)
 
 
 def test_normalize_text_to_tokens_basic() -> None:
@@ -12,8 +22,34 @@ def test_jaccard_similarity() -> None:
     assert jaccard_similarity(set(), {"a"}) == 0.0
 
 
+def test_jaccard_batch_matches_pairwise() -> None:
+    query = {"a", "b", "c"}
+    candidates = [{"b", "c", "d"}, set(), {"x"}, {"a", "b", "c"}]
+    assert jaccard_batch(query, candidates) == [
+        jaccard_similarity(query, candidate) for candidate in candidates
+    ]
+    assert jaccard_batch(set(), candidates) == [0.0] * 4
+
+
+def test_jaccard_upper_bound_bounds_score() -> None:
+    query = {"a", "b", "c", "d"}
+    for candidate in [{"a"}, {"a", "x"}, {"a", "b", "c", "d", "e", "f"}]:
+        bound = jaccard_upper_bound(len(query), len(candidate))
+        assert jaccard_similarity(query, candidate) <= bound
+    assert jaccard_upper_bound(4, 2) == 0.5
+    assert jaccard_upper_bound(0, 3) == 0.0
+
+
 def test_cosine_similarity() -> None:
     assert cosine_similarity([1.0, 0.0], [1.0, 0.0]) == 1.0
     assert cosine_similarity([1.0, 0.0], [0.0, 1.0]) == 0.0
     assert cosine_similarity([1.0], [1.0, 2.0]) == 0.0
     assert cosine_similarity([0.0, 0.0], [1.0, 1.0]) == 0.0
+
+
+def test_normalize_vector_and_dot_product() -> None:
+    unit = normalize_vector([3.0, 4.0])
+    assert unit == [0.6, 0.8]
+    assert dot_product(unit, unit) == pytest.approx(1.0)
+    assert dot_product([1.0], [1.0, 0.0]) == 0.0
+    assert normalize_vector([0.0, 0.0]) == [0.0, 0.0]